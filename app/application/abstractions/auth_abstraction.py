@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict
 
+from app.application.dtos.auth_dto import DTOTokenPair
 from app.domain.entities.user.user_entity import (
     NewUserEmailInput,
     LoginUserEmailInput,
@@ -26,5 +27,5 @@ class IAuthService(ABC):
         pass
 
     @abstractmethod
-    def refresh_access_token(self, refresh_token: str) -> Dict:
+    def refresh_access_token(self, refresh_token: str) -> DTOTokenPair:
         pass
@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from app.application.grading_engine import AnswerKey
+from app.application.similarity_index import TermSimilarityIndex
+
+
+class IPayloadCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Tuple[Optional[bytes], int]:
+        """
+        Trả về (payload đã serialize hoặc None, version hiện tại của key).
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, payload: bytes, version: int):
+        """
+        Chỉ lưu nếu version vẫn là version đã đọc lúc get (chưa bị invalidate).
+        """
+        pass
+
+    @abstractmethod
+    def version(self, key: str) -> int:
+        """
+        Version hiện tại của key, tăng sau mỗi invalidate.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate(self, key: str):
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        pass
+
+
+class ITermIndexCache(ABC):
+    @abstractmethod
+    def get(
+        self, key: str, version: str, ids: Sequence, texts: Sequence[str]
+    ) -> TermSimilarityIndex:
+        """
+        Trả về index gần nghĩa của học phần `key` ứng với `version`; đổi version
+        thì index cũ được cập nhật (hoặc dựng lại) từ ids / texts mới.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        pass
+
+
+class IAnswerKeyCache(ABC):
+    @abstractmethod
+    def get(self, practice_test_id: str, load: Callable[[], AnswerKey]) -> AnswerKey:
+        """
+        Trả về đáp án của bài kiểm tra ở version hiện tại, gọi load() khi chưa có
+        trong cache hoặc bài kiểm tra đã bị sửa.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import List, Optional, TypedDict
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple, TypedDict
 
 from app.domain.entities.course.course_entity import (
     CourseOutput,
@@ -13,20 +14,30 @@ from app.domain.entities.course.course_detail_entity import (
     UpdateCourseDetailInput,
 )
 
+from app.application.pagination import Page, PageRequest
+
 
 class CourseWithDetailsResponse(TypedDict):
     course: CourseOutput
     course_detail: List[CourseDetailOutput]
+    updated_at: datetime
+
+
+class CourseHeaderResponse(TypedDict):
+    course: CourseOutput
+    updated_at: datetime
 
 
 class ICourseRepository(ABC):
     @abstractmethod
-    def get_courses_by_user_id(self, user_id: UUID) -> List[CourseOutput]:
+    def get_courses_by_user_id(
+        self, user_id: UUID, page: PageRequest = PageRequest()
+    ) -> Page[CourseOutput]:
         pass
 
     @abstractmethod
     def get_courses_by_keyword(
-        self, keyword: str, cursor_id: Optional[str] = None
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
     ) -> List[CourseOutput]:
         pass
 
@@ -50,6 +61,37 @@ class ICourseRepository(ABC):
     ) -> bool:
         pass
 
+    @abstractmethod
+    def import_course(
+        self,
+        course_in: CreateNewCourseInput,
+        detail_in: Iterable[CreateNewCourseDetailInput],
+    ) -> Tuple[UUID, int]:
+        """
+        Tạo học phần từ một luồng thuật ngữ (đọc dần), trả về (course_id, số thuật ngữ).
+        Toàn bộ được ghi trong một transaction.
+        """
+        pass
+
+    @abstractmethod
+    def get_course_header(self, course_id: UUID) -> CourseHeaderResponse:
+        pass
+
+    @abstractmethod
+    def iter_course_details(self, course_id: UUID) -> Iterator[CourseDetailOutput]:
+        """
+        Duyệt thuật ngữ của học phần mà không nạp hết vào bộ nhớ.
+        """
+        pass
+
+    @abstractmethod
+    def sync_search_index(self, course_id: UUID):
+        """
+        Đọc lại học phần và cập nhật index tìm kiếm (nếu có). create_new_course_detail,
+        update_course_detail và update_course không tự gọi: gọi một lần sau cả loạt.
+        """
+        pass
+
     @abstractmethod
     def create_new_course_detail(
         self, course_id: UUID, detail_in: CreateNewCourseDetailInput
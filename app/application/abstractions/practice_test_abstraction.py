@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypedDict
+from typing import Iterator, List, Optional, TypedDict
 from uuid import UUID
 
 from app.domain.entities.practice_test.practice_test_entity import (
@@ -26,14 +26,17 @@ from app.domain.entities.practice_test.practice_test_results_entity import (
 )
 from app.domain.entities.practice_test.practice_test_histories import HistoryInput
 
+from app.application.pagination import Page, PageRequest
+from app.application.grading_engine import AnswerKey
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class QuestionDetailOutput:
     question: QuestionOutput
     options: List[AnswerOptionOutput]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PraceticeTestWithDetailsResponse:
     base_info: PracticeTestOutput
     questions: List[QuestionDetailOutput]
@@ -57,12 +60,14 @@ class UpdateQuestionInput:
 
 class IPracticeTestRepository(ABC):
     @abstractmethod
-    def get_practice_tests_by_user_id(self, user_id: UUID) -> List[PracticeTestOutput]:
+    def get_practice_tests_by_user_id(
+        self, user_id: UUID, page: PageRequest = PageRequest()
+    ) -> Page[PracticeTestOutput]:
         pass
 
     @abstractmethod
     def get_practice_tests_by_keyword(
-        self, keyword: str, cursor_id: Optional[str] = None
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
     ) -> List[PracticeTestOutput]:
         pass
 
@@ -80,6 +85,19 @@ class IPracticeTestRepository(ABC):
     ) -> PraceticeTestWithDetailsResponse:
         pass
 
+    @abstractmethod
+    def get_practice_test_base_info(self, practice_test_id: UUID) -> PracticeTestOutput:
+        pass
+
+    @abstractmethod
+    def iter_practice_test_questions(
+        self, practice_test_id: UUID
+    ) -> Iterator[QuestionDetailOutput]:
+        """
+        Duyệt từng câu hỏi (kèm đáp án) mà không nạp cả bài kiểm tra vào bộ nhớ.
+        """
+        pass
+
     @abstractmethod
     def get_practice_test_random_detail_by_id(
         self, practice_test_id: str, count: int | None
@@ -87,7 +105,9 @@ class IPracticeTestRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all_histories(self, user_id: UUID) -> List[ResultWithPracticeTest]:
+    def get_all_histories(
+        self, user_id: UUID, page: PageRequest = PageRequest()
+    ) -> Page[ResultWithPracticeTest]:
         pass
 
     @abstractmethod
@@ -100,6 +120,10 @@ class IPracticeTestRepository(ABC):
     def create_new_practice_test(self, payload: NewPracticeTestInput) -> bool:
         pass
 
+    @abstractmethod
+    def get_answer_key(self, practice_test_id: UUID) -> AnswerKey:
+        pass
+
     @abstractmethod
     def submit_test(
         self, user_id: UUID, result: ResultInput, histories: List[HistoryInput]
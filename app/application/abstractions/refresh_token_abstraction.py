@@ -19,6 +19,21 @@ class IRefreshTokenRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def rotate_refresh_token(self, jti: UUID, new_token: RefreshToken) -> bool:
+        """
+        Thay token jti bằng new_token (cùng họ) trong một câu lệnh.
+        False nếu jti không còn hiệu lực (đã xoay vòng, đăng xuất hoặc hết hạn).
+        """
+        pass
+
+    @abstractmethod
+    def revoke_token_family(self, family_id: UUID) -> bool:
+        """
+        Thu hồi toàn bộ token của một họ (phát hiện refresh token bị dùng lại).
+        """
+        pass
+
     @abstractmethod
     def revoke_refresh_token(self, jti: UUID) -> bool:
         """
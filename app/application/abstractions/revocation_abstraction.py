@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+
+class IRevocationStore(ABC):
+    # False: thu hồi chỉ có hiệu lực trong process này (nhiều worker, backend memory)
+    shared: bool = True
+
+    @abstractmethod
+    def revoke_user(self, user_id: UUID):
+        """
+        Vô hiệu hoá mọi access token của người dùng được cấp tới thời điểm này
+        (khoá / mở khoá tài khoản, đổi quyền).
+        """
+        pass
+
+    @abstractmethod
+    def is_revoked(self, user_id: UUID, issued_at: int) -> bool:
+        pass
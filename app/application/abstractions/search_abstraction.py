@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.practice_test.practice_test_entity import PracticeTestOutput
+
+
+class ISearchEngine(ABC):
+    """
+    Tìm kiếm học phần / bài kiểm tra theo từ khoá, kết quả sắp xếp theo độ liên quan.
+    cursor_id là id của phần tử cuối cùng ở trang trước.
+    """
+
+    @abstractmethod
+    def search_courses(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[CourseOutput]:
+        pass
+
+    @abstractmethod
+    def search_practice_tests(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[PracticeTestOutput]:
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 
 class ISecurityService(ABC):
@@ -11,6 +11,15 @@ class ISecurityService(ABC):
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         pass
 
+    @abstractmethod
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Trả về (mật khẩu đúng?, hash mới nếu hash cũ cần băm lại theo cấu hình hiện tại).
+        """
+        pass
+
     @abstractmethod
     def create_access_token(self, payload: Dict[str, Any]) -> str:
         pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
 
 from app.domain.entities.user.user_entity import (
@@ -9,10 +9,12 @@ from app.domain.entities.user.user_entity import (
 )
 from app.domain.entities.user.user_email_entity import UserEmailOutput
 
+from app.application.pagination import Page, PageRequest
+
 
 class IUserRepository(ABC):
     @abstractmethod
-    def get_all_users(self) -> List[UserOutput]:
+    def get_all_users(self, page: PageRequest = PageRequest()) -> Page[UserOutput]:
         pass
 
     @abstractmethod
@@ -27,6 +29,10 @@ class IUserRepository(ABC):
     def check_user_email_existed(self, email: str):
         pass
 
+    @abstractmethod
+    def update_password_hash(self, user_id: UUID, hashed_password: str) -> bool:
+        pass
+
     @abstractmethod
     def get_user_by_id(self, id: str) -> UserOutput:
         pass
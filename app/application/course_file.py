@@ -0,0 +1,106 @@
+import csv
+import io
+import os
+from typing import Iterable, Iterator, Optional, Tuple
+
+from app.application.exceptions import InvalidCourseFileError
+
+# Mỗi dòng một cặp thuật ngữ / định nghĩa. TSV cũng là định dạng Quizlet xuất ra
+COURSE_FILE_DELIMITERS = {"csv": ",", "tsv": "\t"}
+COURSE_FILE_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "tsv": "text/tab-separated-values; charset=utf-8",
+}
+HEADER = ("term", "definition")
+MAX_IMPORT_ROWS = 100_000
+# Khớp độ dài cột courses.course_name / course_details.term
+MAX_COURSE_NAME_LENGTH = 255
+MAX_TERM_LENGTH = 255
+EXPORT_BATCH_ROWS = 500
+
+
+def course_file_format(requested: Optional[str], filename: Optional[str]) -> str:
+    # Ưu tiên định dạng được chỉ định, sau đó đến đuôi file; mặc định TSV
+    file_format = requested
+    if not file_format and filename:
+        file_format = os.path.splitext(filename)[1].lstrip(".")
+    file_format = (file_format or "tsv").lower()
+    if file_format == "txt":
+        return "tsv"
+    if file_format not in COURSE_FILE_DELIMITERS:
+        raise InvalidCourseFileError(f"Không hỗ trợ định dạng file: {file_format}")
+    return file_format
+
+
+def _dialect(file_format: str) -> dict:
+    # TSV kiểu Quizlet là văn bản thuần, không có dấu ngoặc kép bao trường: dấu "
+    # trong thuật ngữ được giữ nguyên
+    if file_format == "tsv":
+        return {"delimiter": "\t", "quoting": csv.QUOTE_NONE, "quotechar": None}
+    return {"delimiter": COURSE_FILE_DELIMITERS[file_format]}
+
+
+def _tsv_cell(cell: str) -> str:
+    # TSV không bao trường được: tab / xuống dòng trong nội dung thành dấu cách
+    return " ".join(cell.replace("\t", " ").splitlines())
+
+
+def check_course_name(course_name: str):
+    if len(course_name) > MAX_COURSE_NAME_LENGTH:
+        raise InvalidCourseFileError(
+            f"Tên học phần dài quá {MAX_COURSE_NAME_LENGTH} ký tự"
+        )
+
+
+def parse_course_file(
+    lines: Iterable[str], file_format: str, max_rows: int = MAX_IMPORT_ROWS
+) -> Iterator[Tuple[str, str]]:
+    """
+    Đọc dần từng dòng (không nạp cả file), bỏ dòng trống và dòng tiêu đề
+    "term, definition"; cột thứ ba trở đi bị bỏ qua.
+    """
+    reader = csv.reader(lines, **_dialect(file_format))
+    count = 0
+    for row in reader:
+        cells = [cell.strip() for cell in row[:2]]
+        if not any(cells):
+            continue
+        if count == 0 and tuple(cell.lower() for cell in cells) == HEADER:
+            continue
+        if len(cells) < 2 or not cells[0] or not cells[1]:
+            raise InvalidCourseFileError(
+                f"Dòng {reader.line_num}: cần có thuật ngữ và định nghĩa"
+            )
+        if len(cells[0]) > MAX_TERM_LENGTH:
+            raise InvalidCourseFileError(
+                f"Dòng {reader.line_num}: thuật ngữ dài quá {MAX_TERM_LENGTH} ký tự"
+            )
+        count += 1
+        if count > max_rows:
+            raise InvalidCourseFileError(f"File có nhiều hơn {max_rows} thuật ngữ")
+        yield cells[0], cells[1]
+    if count == 0:
+        raise InvalidCourseFileError("File không có thuật ngữ nào")
+
+
+def format_course_file(
+    rows: Iterable[Tuple[str, str]],
+    file_format: str,
+    batch_size: int = EXPORT_BATCH_ROWS,
+) -> Iterator[bytes]:
+    # Gom batch_size dòng thành một khối bytes cho response streaming
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n", **_dialect(file_format))
+    pending = 0
+    for row in rows:
+        if file_format == "tsv":
+            row = [_tsv_cell(cell) for cell in row]
+        writer.writerow(row)
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
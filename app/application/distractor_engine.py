@@ -0,0 +1,60 @@
+import random
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy không bắt buộc: thiếu thì dùng bản Python thuần
+    np = None
+
+NUM_DISTRACTORS = 3
+
+
+def sample_distractors(
+    n: int,
+    k: int = NUM_DISTRACTORS,
+    seed: Optional[int] = None,
+    use_numpy: Optional[bool] = None,
+    rows: Optional[Sequence[int]] = None,
+) -> List[List[int]]:
+    """
+    Với mỗi chỉ số i trong rows (mặc định [0, n)), chọn min(k, n - 1) chỉ số khác
+    i và khác nhau trong [0, n) làm đáp án nhiễu; chi phí O(len(rows) * k) thay vì
+    dựng lại pool cho từng câu. Cùng seed (và cùng backend) cho cùng kết quả.
+    use_numpy=None: dùng numpy nếu đã cài.
+    """
+    if rows is None:
+        rows = range(n)
+    k = max(0, min(k, n - 1))
+    if k == 0:
+        return [[] for _ in rows]
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        return _sample_numpy(n, k, seed, rows)
+    return _sample_python(n, k, seed, rows)
+
+
+def _sample_python(
+    n: int, k: int, seed: Optional[int], rows: Sequence[int]
+) -> List[List[int]]:
+    rng = random.Random(seed)
+    candidates = range(n - 1)
+    # Bốc trong [0, n - 1) rồi dời các số >= i lên 1 để bỏ qua chính câu i
+    return [[pick + (pick >= i) for pick in rng.sample(candidates, k)] for i in rows]
+
+
+def _sample_numpy(
+    n: int, k: int, seed: Optional[int], rows: Sequence[int]
+) -> List[List[int]]:
+    rng = np.random.default_rng(seed)
+    rows = np.asarray(rows, dtype=np.int64)
+    picks = rng.integers(0, n - 1, size=(len(rows), k))
+    # Lấy mẫu loại bỏ: hàng nào có số trùng thì bốc lại cả hàng. Với n lớn gần như
+    # không hàng nào phải bốc lại; n nhỏ nhất (k = n - 1) vẫn hội tụ sau vài vòng
+    pending = np.arange(len(rows))
+    while len(pending):
+        sorted_picks = np.sort(picks[pending], axis=1)
+        pending = pending[(sorted_picks[:, 1:] == sorted_picks[:, :-1]).any(axis=1)]
+        picks[pending] = rng.integers(0, n - 1, size=(len(pending), k))
+    picks += picks >= rows[:, None]
+    return picks.tolist()
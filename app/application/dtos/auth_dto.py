@@ -37,7 +37,17 @@ class DTOUserOutput(BaseModel):
     login_method: str
 
 
+class DTOCurrentUser(BaseModel):
+    user_id: UUID
+    role: UserRole
+
+
 class DTOLoginSuccessResponse(BaseModel):
     user: DTOUserOutput
     access_token: str
     refresh_token: str
+
+
+class DTOTokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
@@ -1,29 +1,6 @@
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
-from typing import List, TypedDict, Optional
-
-
-class DTOCourseOutput(BaseModel):
-    course_id: UUID
-    course_name: str
-    author_avatar_url: str
-    author_username: str
-    author_role: str
-    num_of_terms: int
-
-    model_config = ConfigDict(from_attributes=True)
-
-
-class DTOCourseDetailOutput(BaseModel):
-    course_detail_id: UUID
-    term: str
-    definition: str
-
-    model_config = ConfigDict(from_attributes=True)
-
-class DTOCourseWithDetails(TypedDict):
-    course: DTOCourseOutput
-    course_detail: List[DTOCourseDetailOutput]
+from pydantic import BaseModel
+from typing import List, Optional
 
 
 class DTONewCourseInput(BaseModel):
@@ -35,6 +12,11 @@ class DTONewCourseDetailInput(BaseModel):
     term: str
     definition: str
 
+
+class DTOCourseImportResult(BaseModel):
+    course_id: UUID
+    num_of_terms: int
+
 # Sửa
 class DTOUpdateCourseInput(BaseModel):
     course_name: str
@@ -3,59 +3,6 @@ from pydantic import BaseModel, ConfigDict
 from typing import List, TypedDict, Literal, Optional
 
 
-class DTOPracticeTestOutput(BaseModel):
-    practice_test_id: UUID
-    practice_test_name: str
-    author_avatar_url: str
-    author_username: str
-
-
-class DTOQuestion(BaseModel):
-    question_id: UUID
-    question_text: str
-    question_type: str
-
-
-class DTOQuestionOptions(BaseModel):
-    option_id: UUID
-    option_text: str
-    is_correct: bool
-
-
-class DTOPracticeTestQuestions(BaseModel):
-    question: DTOQuestion
-    options: List[DTOQuestionOptions]
-
-
-class DTOPracticeTestDetailOutput(BaseModel):
-    practice_test: DTOPracticeTestOutput
-    questions: List[DTOPracticeTestQuestions]
-
-
-# Lịch sử làm bài kiểm tra
-class DTOResultOutput(BaseModel):
-    result_id: UUID
-    num_of_questions: int
-    score: int
-
-
-class DTOHistoryOutput(BaseModel):
-    history_id: UUID
-    option_id: List[UUID | None]
-    question_detail: DTOPracticeTestQuestions
-
-
-class DTOResultWithPracticeTest(BaseModel):
-    result: DTOResultOutput
-    base_info: DTOPracticeTestOutput
-
-
-class DTOResultWithHistory(BaseModel):
-    result: DTOResultOutput
-    base_info: DTOPracticeTestOutput
-    histories: List[DTOHistoryOutput]
-
-
 # Thêm
 class DTOBaseInfoInput(BaseModel):
     practice_test_name: str
@@ -91,8 +38,7 @@ class DTOAnsweredQuestion(BaseModel):
 class DTOSubmitTestInput(BaseModel):
     practice_test_id: UUID
     answer_questions: List[DTOAnsweredQuestion]
-    num_of_questions: int
-    score: int
+    question_set: Optional[str] = None
 
 
 # Sửa
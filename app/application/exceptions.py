@@ -3,6 +3,11 @@ class ApplicationError(Exception):
     pass
 
 
+class InvalidCursorError(ApplicationError):
+    # Cursor phân trang / kích thước trang không hợp lệ
+    pass
+
+
 # ----------------Auth----------------
 class EmailExistedError(ApplicationError):
     pass
@@ -18,6 +23,10 @@ class AccountNotFoundError(ApplicationError):
 class AccoutHasBeenLocked(ApplicationError):
     pass
 
+
+class TokenRevokedError(ApplicationError):
+    pass
+
 # ----------------User----------------
 class UserNotFoundError(ApplicationError):
     pass
@@ -36,6 +45,16 @@ class CourseDetailNotFoundError(ApplicationError):
     pass
 
 
+class InvalidCourseFileError(ApplicationError):
+    # File nhập học phần sai định dạng hoặc quá lớn
+    pass
+
+
+class CourseSessionExpiredError(ApplicationError):
+    # Học phần đã thay đổi sau khi tạo phiên học / kiểm tra
+    pass
+
+
 # ----------------Test----------------
 class PracticeTestsNotFoundError(ApplicationError):
     pass
@@ -45,6 +64,11 @@ class QuestionNotFoundError(ApplicationError):
     pass
 
 
+class InvalidSubmissionError(ApplicationError):
+    # Bài nộp có câu hỏi / đáp án không thuộc bài kiểm tra
+    pass
+
+
 class OptionNotFoundError(ApplicationError):
     pass
 
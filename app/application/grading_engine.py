@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+from app.application.exceptions import InvalidSubmissionError
+
+
+class QuestionKey(NamedTuple):
+    question_type: str
+    correct: FrozenSet[UUID]
+    options: FrozenSet[UUID]
+
+
+# question_id -> đáp án đúng / mọi đáp án của câu hỏi
+AnswerKey = Dict[UUID, QuestionKey]
+
+
+@dataclass(frozen=True, slots=True)
+class GradeResult:
+    num_of_questions: int
+    # Điểm = số câu đúng (quy đổi theo chính sách, làm tròn) như cột score cũ
+    score: int
+    credit: float
+
+
+def _all_or_nothing(chosen: FrozenSet[UUID], correct: FrozenSet[UUID]) -> float:
+    return 1.0 if chosen == correct else 0.0
+
+
+def _partial(chosen: FrozenSet[UUID], correct: FrozenSet[UUID]) -> float:
+    # Tỉ lệ đáp án đúng đã chọn; chọn nhầm bất kỳ đáp án sai nào thì 0
+    if not correct or chosen - correct:
+        return _all_or_nothing(chosen, correct)
+    return len(chosen & correct) / len(correct)
+
+
+def _right_minus_wrong(chosen: FrozenSet[UUID], correct: FrozenSet[UUID]) -> float:
+    # Mỗi đáp án sai đã chọn trừ một đáp án đúng, không âm
+    if not correct:
+        return _all_or_nothing(chosen, correct)
+    return max(0, len(chosen & correct) - len(chosen - correct)) / len(correct)
+
+
+GRADING_POLICIES: Dict[str, Callable[[FrozenSet[UUID], FrozenSet[UUID]], float]] = {
+    "all_or_nothing": _all_or_nothing,
+    "partial": _partial,
+    "right_minus_wrong": _right_minus_wrong,
+}
+
+
+def get_grading_policy(
+    name: str,
+) -> Callable[[FrozenSet[UUID], FrozenSet[UUID]], float]:
+    try:
+        return GRADING_POLICIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Chính sách chấm điểm không hợp lệ: {name} "
+            f"(hỗ trợ {', '.join(GRADING_POLICIES)})"
+        )
+
+
+def grade(
+    answer_key: AnswerKey,
+    answers: Iterable[Tuple[UUID, Optional[Sequence[UUID]]]],
+    policy: str = "all_or_nothing",
+) -> GradeResult:
+    """
+    Chấm một lượt nộp bài bằng phép toán tập hợp: mỗi câu so tập đáp án đã chọn với
+    tập đáp án đúng. Chỉ câu MULTIPLE_CHOICE được tính điểm một phần theo
+    `policy`; SINGLE_CHOICE và TRUE_FALSE luôn phải đúng tuyệt đối. Số câu là số
+    câu của answer_key (cả bài, hoặc các câu đã phát khi làm một phần bài); câu
+    không nộp được 0 điểm.
+    """
+    partial_credit = get_grading_policy(policy)
+    chosen_by_question: Dict[UUID, FrozenSet[UUID]] = {}
+    for question_id, option_ids in answers:
+        question = answer_key.get(question_id)
+        if question is None:
+            raise InvalidSubmissionError(
+                f"Câu hỏi {question_id} không thuộc bài kiểm tra"
+            )
+        chosen = frozenset(option_ids or ())
+        if not chosen <= question.options:
+            raise InvalidSubmissionError(f"Đáp án không thuộc câu hỏi {question_id}")
+        previous = chosen_by_question.get(question_id)
+        chosen_by_question[question_id] = (
+            chosen if previous is None else previous | chosen
+        )
+
+    # Câu không nộp không được cộng điểm nhưng vẫn tính vào số câu
+    credit = 0.0
+    for question_id, chosen in chosen_by_question.items():
+        question = answer_key[question_id]
+        if question.question_type == "MULTIPLE_CHOICE":
+            credit += partial_credit(chosen, question.correct)
+        else:
+            credit += _all_or_nothing(chosen, question.correct)
+    return GradeResult(
+        num_of_questions=len(answer_key),
+        score=int(credit + 0.5),
+        credit=credit,
+    )
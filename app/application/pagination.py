@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from uuid import UUID
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from app.application.exceptions import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    # after: giá trị khoá sắp xếp của phần tử cuối trang trước (None = trang đầu)
+    after: Optional[Tuple[Any, ...]] = None
+    limit: int = DEFAULT_PAGE_SIZE
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+    def map(self, func: Callable[[T], Any]) -> "Page":
+        return Page(
+            items=[func(item) for item in self.items], next_cursor=self.next_cursor
+        )
+
+
+def _to_json(value: Any):
+    if isinstance(value, (UUID, datetime)):
+        return str(value)
+    raise TypeError(f"Không mã hoá được giá trị cursor {value!r}")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    # Cursor "mờ" cho client: base64url của danh sách khoá, bỏ padding
+    raw = json.dumps(list(values), default=_to_json, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, key_types: Sequence[type]) -> Tuple[Any, ...]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(key_types):
+            raise ValueError("Sai số lượng khoá")
+        return tuple(
+            datetime.fromisoformat(value) if key_type is datetime else key_type(value)
+            for key_type, value in zip(key_types, values)
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Cursor không hợp lệ") from e
+
+
+def page_request(
+    cursor: Optional[str],
+    limit: int = DEFAULT_PAGE_SIZE,
+    key_types: Sequence[type] = (UUID,),
+) -> PageRequest:
+    # Mặc định khoá là id UUIDv7 (tăng theo thời gian tạo)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise InvalidCursorError(f"limit phải nằm trong khoảng 1..{MAX_PAGE_SIZE}")
+    after = decode_cursor(cursor, key_types) if cursor else None
+    return PageRequest(after=after, limit=limit)
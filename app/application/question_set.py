@@ -0,0 +1,45 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from typing import FrozenSet, Iterable
+from uuid import UUID
+
+from app.application.exceptions import InvalidSubmissionError
+
+
+def _signature(secret: bytes, raw: bytes) -> str:
+    digest = hmac.new(secret, raw, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def sign_question_set(
+    secret: bytes, practice_test_id: UUID, question_ids: Iterable[UUID]
+) -> str:
+    """
+    Danh sách câu hỏi đã phát cho một lượt làm một phần bài kiểm tra
+    (/random-questions), ký HMAC để client gửi lại khi nộp mà không sửa được.
+    """
+    raw = json.dumps(
+        [str(practice_test_id), [str(question_id) for question_id in question_ids]],
+        separators=(",", ":"),
+    ).encode()
+    payload = base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+    return f"{payload}.{_signature(secret, raw)}"
+
+
+def verify_question_set(
+    secret: bytes, practice_test_id: UUID, token: str
+) -> FrozenSet[UUID]:
+    try:
+        payload, signature = token.split(".")
+        raw = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        if not hmac.compare_digest(signature, _signature(secret, raw)):
+            raise ValueError("Sai chữ ký")
+        signed_test_id, question_ids = json.loads(raw)
+        if UUID(signed_test_id) != practice_test_id:
+            raise ValueError("Khác bài kiểm tra")
+        return frozenset(UUID(question_id) for question_id in question_ids)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidSubmissionError("Danh sách câu hỏi không hợp lệ") from e
@@ -0,0 +1,181 @@
+import zlib
+from typing import List, Optional, Sequence
+
+from app.application.distractor_engine import np
+
+NGRAM = 3
+BLOCK_ROWS = 512
+# Định nghĩa giống hệt nhau (cùng vector) không được làm đáp án nhiễu của nhau
+DUPLICATE_SIMILARITY = 1 - 1e-4
+# Sửa quá tỉ lệ này số thuật ngữ thì dựng lại cả index (IDF cũng đã lệch nhiều)
+REBUILD_RATIO = 0.1
+
+
+def _ngrams(text: str) -> List[str]:
+    text = f" {' '.join(text.lower().split())} "
+    return [text[i : i + NGRAM] for i in range(max(1, len(text) - NGRAM + 1))]
+
+
+def _hashed_counts(texts: Sequence[str], dimensions: int):
+    # Đếm n-gram ký tự, băm vào `dimensions` cột (crc32 để ổn định giữa các process)
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        for gram in _ngrams(text):
+            rows.append(row)
+            cols.append(zlib.crc32(gram.encode()) % dimensions)
+    counts = np.zeros((len(texts), dimensions), dtype=np.float32)
+    np.add.at(counts, (rows, cols), 1)
+    return counts
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+class TermSimilarityIndex:
+    """
+    Index hàng xóm gần nhất theo định nghĩa của một học phần: vector TF-IDF của
+    n-gram ký tự (băm) đã chuẩn hoá, giữ sẵn `neighbours` định nghĩa giống nhất
+    (cosine) của mỗi thuật ngữ. Độ tương đồng được tính theo khối BLOCK_ROWS
+    dòng nên bộ nhớ tạm là O(BLOCK_ROWS * n) thay vì O(n^2).
+    """
+
+    def __init__(self, ids, texts, idf, vectors, neighbours: int):
+        self.ids = list(ids)
+        self.texts = list(texts)
+        self.idf = idf
+        self.vectors = vectors
+        self.num_neighbours = neighbours
+        width = max(0, min(neighbours, len(self.ids) - 1))
+        self.neighbours = np.zeros((len(self.ids), width), dtype=np.int32)
+        self.scores = np.full((len(self.ids), width), -np.inf, dtype=np.float32)
+
+    @classmethod
+    def build(
+        cls, ids: Sequence, texts: Sequence[str], neighbours: int, dimensions: int
+    ) -> "TermSimilarityIndex":
+        if np is None:
+            raise RuntimeError("Index gần nghĩa yêu cầu cài đặt gói numpy")
+        counts = _hashed_counts(texts, dimensions)
+        document_frequency = (counts > 0).sum(axis=0)
+        idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(
+            np.float32
+        )
+        index = cls(ids, texts, idf, _normalize(counts * idf), neighbours)
+        index._rank(np.arange(len(index.ids)))
+        return index
+
+    def _rank(self, rows):
+        # Tính lại toàn bộ danh sách hàng xóm của các dòng `rows`
+        width = self.neighbours.shape[1]
+        if width == 0:
+            return
+        for start in range(0, len(rows), BLOCK_ROWS):
+            block = rows[start : start + BLOCK_ROWS]
+            similarity = self.vectors[block] @ self.vectors.T
+            similarity[similarity >= DUPLICATE_SIMILARITY] = -np.inf
+            similarity[np.arange(len(block)), block] = -np.inf
+            top = np.argpartition(-similarity, width - 1, axis=1)[:, :width]
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            self.neighbours[block] = np.take_along_axis(top, order, axis=1)
+            self.scores[block] = np.take_along_axis(top_scores, order, axis=1)
+
+    def update(
+        self, ids: Sequence, texts: Sequence[str], dimensions: int
+    ) -> "TermSimilarityIndex":
+        """
+        Trả về index cho danh sách thuật ngữ mới. Khi chỉ vài định nghĩa đổi (cùng
+        danh sách id), chỉ tính lại vector của các dòng đó và cập nhật hàng xóm
+        bị ảnh hưởng, O(n) mỗi dòng đổi; IDF giữ nguyên từ lần dựng trước.
+        Thêm / xoá thuật ngữ hoặc đổi nhiều thì dựng lại. Index cũ không bị sửa.
+        """
+        if list(ids) != self.ids:
+            return self.build(ids, texts, self.num_neighbours, dimensions)
+        changed = [
+            row for row, (old, new) in enumerate(zip(self.texts, texts)) if old != new
+        ]
+        if not changed:
+            return self
+        if len(changed) > max(1, REBUILD_RATIO * len(self.ids)):
+            return self.build(ids, texts, self.num_neighbours, dimensions)
+
+        index = TermSimilarityIndex(
+            self.ids, texts, self.idf, self.vectors.copy(), self.num_neighbours
+        )
+        index.neighbours = self.neighbours.copy()
+        index.scores = self.scores.copy()
+        changed = np.array(changed)
+        index.vectors[changed] = _normalize(
+            _hashed_counts([texts[row] for row in changed], dimensions) * self.idf
+        )
+        if index.neighbours.shape[1] == 0:
+            return index
+
+        # Dòng khác: chỉ điểm tới các dòng vừa đổi là thay đổi
+        similarity = index.vectors @ index.vectors[changed].T
+        similarity[similarity >= DUPLICATE_SIMILARITY] = -np.inf
+        rerank = set(changed.tolist())
+        for column, target in enumerate(changed.tolist()):
+            holds = (index.neighbours == target).any(axis=1)
+            beats = similarity[:, column] > index.scores[:, -1]
+            for row in np.flatnonzero(holds | beats).tolist():
+                if row in rerank:
+                    continue
+                score = similarity[row, column]
+                if holds[row] and score < index.scores[row, -1]:
+                    # Tụt khỏi top: dòng nào thay chỗ chỉ biết khi tính lại cả dòng
+                    rerank.add(row)
+                    continue
+                slot = (
+                    np.flatnonzero(index.neighbours[row] == target)[0]
+                    if holds[row]
+                    else -1
+                )
+                index.neighbours[row, slot] = target
+                index.scores[row, slot] = score
+                order = np.argsort(-index.scores[row])
+                index.neighbours[row] = index.neighbours[row, order]
+                index.scores[row] = index.scores[row, order]
+        index._rank(np.array(sorted(rerank)))
+        return index
+
+    def sample(
+        self, rows: Sequence[int], k: int, seed: Optional[int] = None
+    ) -> List[List[int]]:
+        """
+        Với mỗi dòng trong `rows`, chọn ngẫu nhiên k đáp án nhiễu trong các hàng
+        xóm gần nhất; thiếu hàng xóm hợp lệ (học phần nhỏ, định nghĩa trùng) thì bù
+        bằng thuật ngữ ngẫu nhiên khác.
+        """
+        rng = np.random.default_rng(seed)
+        n = len(self.ids)
+        k = max(0, min(k, n - 1))
+        rows = np.asarray(rows, dtype=np.intp)
+        if k == 0:
+            return [[] for _ in range(len(rows))]
+
+        candidates = self.neighbours[rows]
+        valid = np.isfinite(self.scores[rows])
+        keys = rng.random(candidates.shape)
+        keys[~valid] = 2  # hàng xóm không hợp lệ xếp cuối
+        order = np.argsort(keys, axis=1)[:, :k]
+        picks = np.take_along_axis(candidates, order, axis=1)
+        picked_valid = np.take_along_axis(valid, order, axis=1)
+
+        result = []
+        for row, row_picks, row_valid in zip(
+            rows.tolist(), picks.tolist(), picked_valid.tolist()
+        ):
+            chosen = [pick for pick, ok in zip(row_picks, row_valid) if ok]
+            if len(chosen) < k:
+                excluded = set(chosen) | {row}
+                for pick in rng.permutation(n).tolist():
+                    if pick not in excluded:
+                        chosen.append(pick)
+                        if len(chosen) == k:
+                            break
+            result.append(chosen)
+        return result
@@ -1,4 +1,5 @@
 from uuid import UUID
+from typing import Optional
 
 from app.domain.exceptions.user_exceptions import UserNotFoundErrorDomain
 
@@ -6,16 +7,30 @@ from app.application.abstractions.refresh_token_abstraction import (
     IRefreshTokenRepository,
 )
 from app.application.abstractions.user_abstraction import IUserRepository
+from app.application.abstractions.revocation_abstraction import IRevocationStore
 from app.application.dtos.user_dto import DTOUserOutput
 from app.application.exceptions import UserNotAllowError, UserNotFoundError
+from app.application.pagination import DEFAULT_PAGE_SIZE, Page, page_request
 
 
 class AdminServices:
-    def __init__(self, user_repo: IUserRepository, token_repo: IRefreshTokenRepository):
+    def __init__(
+        self,
+        user_repo: IUserRepository,
+        token_repo: IRefreshTokenRepository,
+        revocation_store: IRevocationStore,
+    ):
         self.user_repo = user_repo
         self.token_repo = token_repo
+        self.revocation_store = revocation_store
 
-    def get_all_users(self, user_id: UUID, role: str):
+    def get_all_users(
+        self,
+        user_id: UUID,
+        role: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[DTOUserOutput]:
         if role != "ADMIN":
             raise UserNotAllowError
 
@@ -23,10 +38,10 @@ class AdminServices:
         if cur_user.role != "ADMIN":
             raise UserNotAllowError
 
-        users_domain = self.user_repo.get_all_users()
+        users_domain = self.user_repo.get_all_users(page_request(cursor, limit))
 
-        return [
-            DTOUserOutput(
+        return users_domain.map(
+            lambda user: DTOUserOutput(
                 user_id=user.user_id,
                 email=user.email,
                 username=user.username,
@@ -35,8 +50,7 @@ class AdminServices:
                 login_method=user.login_method,
                 is_actived=user.is_actived,
             )
-            for user in users_domain
-        ]
+        )
 
     def grant_admin(self, admin_id: UUID, user_id: UUID):
         current_admin = self.user_repo.get_user_by_id(admin_id)
@@ -45,6 +59,8 @@ class AdminServices:
 
         try:
             if self.user_repo.grant_admin(user_id):
+                # Access token đang dùng mang role / trạng thái cũ
+                self.revocation_store.revoke_user(user_id)
                 return self.token_repo.revoke_all_tokens_for_user(user_id)
         except UserNotFoundErrorDomain:
             raise UserNotFoundError
@@ -56,6 +72,7 @@ class AdminServices:
         
         try:
             if self.user_repo.lock_user(user_id):
+                self.revocation_store.revoke_user(user_id)
                 return self.token_repo.revoke_all_tokens_for_user(user_id)
         except UserNotFoundErrorDomain:
             raise UserNotFoundError
@@ -68,6 +85,7 @@ class AdminServices:
         
         try:
             if self.user_repo.unlock_user(user_id):
+                self.revocation_store.revoke_user(user_id)
                 return self.token_repo.revoke_all_tokens_for_user(user_id)
         except UserNotFoundErrorDomain:
             raise UserNotFoundError
\ No newline at end of file
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone, timedelta
-from typing import Dict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
 
 from app.domain.entities.user.user_entity import (
     NewUserEmailInput,
@@ -15,6 +16,7 @@ from app.application.dtos.auth_dto import (
     DTOLoginEmail,
     DTOUserOutput,
     DTOLoginSuccessResponse,
+    DTOTokenPair,
 )
 from app.application.exceptions import (
     EmailExistedError,
@@ -28,6 +30,7 @@ from app.application.abstractions.refresh_token_abstraction import (
     IRefreshTokenRepository,
 )
 from app.application.abstractions.auth_abstraction import IAuthService
+from app.application.use_cases.token_auth_service import build_access_token_claims
 
 
 class AuthService(IAuthService):
@@ -80,33 +83,27 @@ class AuthService(IAuthService):
         user_email_auth: UserEmailOutput = self.user_repo.get_user_email_auth(
             existed_user.user_id
         )
-        if not self.security_service.verify_password(
+        verified, new_hash = self.security_service.verify_and_update(
             user_in.plain_password, user_email_auth.hashed_password
-        ):
+        )
+        if not verified:
             raise InvalidCredentialsError("Email hoặc mật khẩu không chính xác")
+        if new_hash:
+            # Hash cũ (scheme / cost trước đây): lưu lại hash theo cấu hình hiện tại
+            try:
+                self.user_repo.update_password_hash(existed_user.user_id, new_hash)
+            except Exception as e:
+                print("Không thể cập nhật hash mật khẩu", e)
 
         # Tạo Access Token
-        access_token_payload = {
-            "sub": str(existed_user.user_id),
-            "role": str(existed_user.role),
-        }
+        access_token_payload = build_access_token_claims(
+            existed_user.user_id, existed_user.role
+        )
         access_token = self.security_service.create_access_token(access_token_payload)
 
-        # Tạo và lưu Refresh Token
-        new_rt_domain = RefreshToken.create_new_refresh_token(
-            user_id=existed_user.user_id,
-            expires_at=datetime.now(timezone.utc) + timedelta(days=30),
-            issued_at=datetime.now(timezone.utc),
-        )
-        refresh_token_payload = {
-            "jti": str(new_rt_domain.jti),
-            "sub": str(existed_user.user_id),
-            "role": str(existed_user.role),
-            "exp": new_rt_domain.expires_at,
-            "iat": new_rt_domain.issued_at,
-        }
-        refresh_token = self.security_service.create_refresh_token(
-            refresh_token_payload
+        # Tạo và lưu Refresh Token (mở một họ token mới)
+        new_rt_domain, refresh_token = self._new_refresh_token(
+            existed_user.user_id, existed_user.role
         )
         self.token_repo.save_refresh_token(new_rt_domain)
 
@@ -132,24 +129,56 @@ class AuthService(IAuthService):
         payload = self.security_service.decode_access_token(access_token)
         return payload
 
-    def refresh_access_token(self, refresh_token: str) -> Dict:
-        payload = self.security_service.decode_refresh_token(refresh_token)
+    def _new_refresh_token(
+        self, user_id: UUID, role: str, family_id: Optional[UUID] = None
+    ) -> Tuple[RefreshToken, str]:
+        rt_domain = RefreshToken.create_new_refresh_token(
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=30),
+            issued_at=datetime.now(timezone.utc),
+            family_id=family_id,
+        )
+        refresh_token_payload = {
+            "jti": str(rt_domain.jti),
+            "fam": str(rt_domain.family_id),
+            "sub": str(user_id),
+            "role": str(role),
+            "exp": rt_domain.expires_at,
+            "iat": rt_domain.issued_at,
+        }
+        return rt_domain, self.security_service.create_refresh_token(
+            refresh_token_payload
+        )
 
-        jti = payload.get("jti")
-        user_id = payload.get("sub")
+    def refresh_access_token(self, refresh_token: str) -> DTOTokenPair:
+        payload = self.security_service.decode_refresh_token(refresh_token)
 
-        if not self.token_repo.is_jti_valid(jti):
-            raise InvalidCredentialsError(
-                "Refresh token đã bị thu hồi hoặc không tồn tại"
-            )
+        jti = UUID(payload.get("jti"))
+        user_id = UUID(payload.get("sub"))
+        # Token cấp trước khi có họ token: mỗi token là một họ riêng
+        family_id = UUID(payload["fam"]) if payload.get("fam") else jti
 
         user = self.user_repo.get_user_by_id(user_id)
 
         if not user:
             raise AccountNotFoundError("Tài khoản không còn tồn tại")
 
+        # Xoay vòng: refresh token cũ hết hiệu lực, cấp token mới cùng họ
+        new_rt_domain, new_refresh_token = self._new_refresh_token(
+            user.user_id, user.role, family_id
+        )
+        if not self.token_repo.rotate_refresh_token(jti, new_rt_domain):
+            # Chữ ký hợp lệ nhưng jti không còn: token đã được xoay vòng trước đó
+            # và đang bị dùng lại -> thu hồi cả họ (kể cả token mới nhất)
+            self.token_repo.revoke_token_family(family_id)
+            raise InvalidCredentialsError(
+                "Refresh token đã bị thu hồi hoặc không tồn tại"
+            )
+
         new_access_token = self.security_service.create_access_token(
-            {"sub": str(user.user_id), "role": user.role}
+            build_access_token_claims(user.user_id, user.role)
         )
 
-        return new_access_token
+        return DTOTokenPair(
+            access_token=new_access_token, refresh_token=new_refresh_token
+        )
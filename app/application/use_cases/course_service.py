@@ -1,6 +1,7 @@
 import random
 from uuid import UUID
-from typing import List, TypedDict
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, TypedDict
 
 from app.domain.entities.course.course_entity import (
     CreateNewCourseInput,
@@ -17,50 +18,75 @@ from app.domain.exceptions.course_exception import (
     CourseDetailsNotFoundErrorDomain,
 )
 
-from app.application.abstractions.course_abstraction import ICourseRepository
+from app.application.abstractions.course_abstraction import (
+    ICourseRepository,
+    CourseHeaderResponse,
+)
 from app.application.abstractions.user_abstraction import IUserRepository
+from app.application.abstractions.cache_abstraction import ITermIndexCache
 from app.application.dtos.course_dto import (
     DTONewCourseDetailInput,
     DTONewCourseInput,
-    DTOCourseOutput,
-    DTOCourseDetailOutput,
-    DTOCourseWithDetails,
     DTOUpdateCourseRequest,
+    DTOCourseImportResult,
+)
+from app.application.distractor_engine import NUM_DISTRACTORS, sample_distractors
+from app.application.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    page_request,
 )
 from app.application.exceptions import (
     UserNotAllowError,
     UserNotFoundError,
     CourseNotFoundError,
     CourseDetailNotFoundError,
+    CourseSessionExpiredError,
+    InvalidCursorError,
 )
 
+DEFAULT_TEST_SIZE = 20
+
 
 class CourseWithDetails(TypedDict):
     course: CourseOutput
     course_detail: List[CourseDetailOutput]
+    updated_at: datetime
+
+
+class CourseSessionPage(TypedDict):
+    course: CourseOutput
+    questions: List[dict]
+    total: int
+    next_cursor: Optional[str]
 
 
 class CourseService:
-    def __init__(self, course_repo: ICourseRepository, user_repo: IUserRepository):
+    def __init__(
+        self,
+        course_repo: ICourseRepository,
+        user_repo: IUserRepository,
+        term_index: Optional[ITermIndexCache] = None,
+        test_size: int = DEFAULT_TEST_SIZE,
+    ):
         self.course_repo = course_repo
         self.user_repo = user_repo
+        # None: đáp án nhiễu ngẫu nhiên (DISTRACTOR_MODE=random)
+        self.term_index = term_index
+        self.test_size = test_size
 
-    def get_user_course(self, user_id: UUID):
+    def get_user_course(
+        self,
+        user_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[CourseOutput]:
         try:
-            courses: List[CourseOutput] = self.course_repo.get_courses_by_user_id(
-                user_id
+            return self.course_repo.get_courses_by_user_id(
+                user_id, page_request(cursor, limit)
             )
-            return [
-                DTOCourseOutput(
-                    course_id=course.course_id,
-                    course_name=course.course_name,
-                    author_avatar_url=course.author_avatar_url,
-                    author_username=course.author_username,
-                    author_role=course.author_role,
-                    num_of_terms=course.num_of_terms,
-                )
-                for course in courses
-            ]
         except CoursesNotFoundErrorDomain as e:
             raise CourseNotFoundError(str(e))
 
@@ -85,45 +111,134 @@ class CourseService:
         except CoursesNotFoundErrorDomain as e:
             raise CourseNotFoundError(str(e))
 
-    def create_question(self, current_course, course_detail):
-        pool = [item for item in course_detail if item != current_course]
-        random_items = random.sample(pool, 3)
+    def build_questions(
+        self,
+        course,
+        course_detail: List[CourseDetailOutput],
+        rows: Sequence[int],
+        seed: Optional[int] = None,
+        version: Optional[str] = None,
+    ):
+        """
+        Dựng câu hỏi cho các thuật ngữ course_detail[rows], đáp án nhiễu lấy theo
+        chỉ số trong cả học phần: ngẫu nhiên, hoặc (có term_index và version của
+        học phần) trong các định nghĩa gần nghĩa nhất. Chi phí theo len(rows).
+        """
+        if self.term_index is not None and version is not None:
+            index = self.term_index.get(
+                str(course.course_id),
+                version,
+                [detail.course_detail_id for detail in course_detail],
+                [detail.definition for detail in course_detail],
+            )
+            distractors = index.sample(rows, NUM_DISTRACTORS, seed)
+        else:
+            distractors = sample_distractors(len(course_detail), seed=seed, rows=rows)
+        return [
+            {
+                "question": course_detail[row],
+                "options": [course_detail[j] for j in picks],
+            }
+            for row, picks in zip(rows, distractors)
+        ]
+
+    def build_course_learn(
+        self,
+        course,
+        course_detail,
+        seed: Optional[int] = None,
+        version: Optional[str] = None,
+    ):
+        return {
+            "course": course,
+            "questions": self.build_questions(
+                course, course_detail, range(len(course_detail)), seed, version
+            ),
+        }
+
+    def build_course_test(
+        self,
+        course,
+        course_detail,
+        seed: Optional[int] = None,
+        version: Optional[str] = None,
+        size: Optional[int] = None,
+    ):
+        size = self.test_size if size is None else size
+        rows = random.Random(seed).sample(
+            range(len(course_detail)), min(size, len(course_detail))
+        )
+        return {
+            "course": course,
+            "questions": self.build_questions(
+                course, course_detail, rows, seed, version
+            ),
+        }
+
+    def build_course_session(
+        self,
+        course,
+        course_detail,
+        version: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        size: Optional[int] = None,
+    ) -> CourseSessionPage:
+        """
+        Phiên học (size=None: mọi thuật ngữ) hoặc kiểm tra (min(size, n) thuật
+        ngữ) không lưu trạng thái ở server: cursor mang seed của thứ tự xáo, vị trí
+        trang tiếp theo, số câu và version học phần. Mỗi trang chỉ dựng câu hỏi và
+        đáp án nhiễu cho `limit` câu của trang đó.
+        """
+        request = page_request(None, limit)
+        if cursor is None:
+            seed = random.getrandbits(32)
+            offset = 0
+            total = len(course_detail) if size is None else size
+            total = min(total, len(course_detail))
+        else:
+            seed, offset, total, cursor_version = decode_cursor(
+                cursor, (int, int, int, str)
+            )
+            if cursor_version != version:
+                raise CourseSessionExpiredError(
+                    "Học phần đã thay đổi, hãy bắt đầu phiên mới"
+                )
+            if not 0 <= offset < total <= len(course_detail):
+                raise InvalidCursorError("Cursor không hợp lệ")
 
-        return {"question": current_course, "options": random_items}
+        # Cùng seed, cùng số thuật ngữ -> cùng thứ tự ở mọi trang
+        order = random.Random(seed).sample(range(len(course_detail)), total)
+        rows = order[offset : offset + request.limit]
+        next_offset = offset + len(rows)
+        return {
+            "course": course,
+            "questions": self.build_questions(
+                course, course_detail, rows, seed + offset, version
+            ),
+            "total": total,
+            "next_cursor": (
+                encode_cursor([seed, next_offset, total, version])
+                if next_offset < total
+                else None
+            ),
+        }
 
     def get_course_learn_by_id(self, course_id: str):
         try:
             response = self.get_course_detail_by_id(course_id)
-            course = response.get("course")
-            course_detail = response.get("course_detail")
-            questions = list(
-                map(
-                    lambda current_course: self.create_question(
-                        current_course, course_detail
-                    ),
-                    course_detail,
-                )
+            return self.build_course_learn(
+                response.get("course"), response.get("course_detail")
             )
-
-            return {"course": course, "questions": questions}
         except Exception as e:
             raise Exception("Không thể tạo tính năng học", e)
 
     def get_course_test_by_id(self, course_id: str):
         try:
             response = self.get_course_detail_by_id(course_id)
-            course = response.get("course")
-            course_detail = response.get("course_detail")
-            course_detail_random = random.sample(course_detail, 20)
-            questions = list(
-                map(
-                    lambda current_course: self.create_question(
-                        current_course, course_detail_random
-                    ),
-                    course_detail_random,
-                )
+            return self.build_course_test(
+                response.get("course"), response.get("course_detail")
             )
-            return {"course": course, "questions": questions}
         except Exception as e:
             raise Exception("Không thể tạo tính năng kiểm tra", e)
 
@@ -155,6 +270,35 @@ class CourseService:
         except Exception as e:
             raise Exception("Không thể thêm mới học phần - service", e)
 
+    def import_course(
+        self, user_id: UUID, course_name: str, terms: Iterable[Tuple[str, str]]
+    ) -> DTOCourseImportResult:
+        # terms được đọc dần trong lúc ghi; lỗi định dạng giữa chừng huỷ cả học phần
+        course_id, num_of_terms = self.course_repo.import_course(
+            CreateNewCourseInput(course_name=course_name, user_id=user_id),
+            (
+                CreateNewCourseDetailInput(term=term, definition=definition)
+                for term, definition in terms
+            ),
+        )
+        return DTOCourseImportResult(course_id=course_id, num_of_terms=num_of_terms)
+
+    def stream_course_detail(
+        self, course_id: UUID
+    ) -> Tuple[CourseHeaderResponse, Iterator[CourseDetailOutput]]:
+        # Kiểm tra học phần ngay; thuật ngữ chỉ được đọc khi duyệt iterator
+        try:
+            header = self.course_repo.get_course_header(course_id)
+        except CoursesNotFoundErrorDomain as e:
+            raise CourseNotFoundError(str(e))
+        return header, self.course_repo.iter_course_details(course_id)
+
+    def export_course(self, course_id: UUID) -> Tuple[str, Iterator[Tuple[str, str]]]:
+        header, details = self.stream_course_detail(course_id)
+        return header["course"].course_name, (
+            (detail.term, detail.definition) for detail in details
+        )
+
     def check_user_course(self, user_id: UUID, course_id: UUID):
         try:
             if not self.course_repo.check_user_course(user_id, course_id):
@@ -199,6 +343,10 @@ class CourseService:
                     )
         except Exception as e:
             raise Exception("Lỗi khi cập nhật chi tiết học phần", e)
+        finally:
+            # Index tìm kiếm: đọc lại học phần một lần cho cả loạt thay vì mỗi thuật
+            # ngữ (kể cả khi lỗi giữa chừng, các thuật ngữ trước đó đã commit)
+            self.course_repo.sync_search_index(course_id)
         return True
 
     def delete_course_detail(
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, TypedDict, Optional
+from typing import Iterator, List, Tuple, TypedDict, Optional
 from uuid import UUID
 
 from app.domain.entities.practice_test.practice_test_entity import (
@@ -30,17 +30,14 @@ from app.domain.exceptions.practice_test_exception import (
 
 from app.application.abstractions.practice_test_abstraction import (
     IPracticeTestRepository,
+    PraceticeTestWithDetailsResponse,
+    QuestionDetailOutput,
 )
+from app.application.abstractions.cache_abstraction import IAnswerKeyCache
+from app.application.grading_engine import AnswerKey, get_grading_policy, grade
+from app.application.pagination import DEFAULT_PAGE_SIZE, Page, page_request
+from app.application.question_set import sign_question_set, verify_question_set
 from app.application.dtos.practice_test_dto import (
-    DTOPracticeTestOutput,
-    DTOQuestion,
-    DTOQuestionOptions,
-    DTOPracticeTestQuestions,
-    # Lịch sử làm bài
-    DTOResultOutput,
-    DTOHistoryOutput,
-    DTOResultWithPracticeTest,
-    DTOResultWithHistory,
     # Thêm
     DTONewPracticeTestInput,
     DTOSubmitTestInput,
@@ -52,6 +49,7 @@ from app.application.exceptions import (
     PracticeTestsNotFoundError,
     ResultNotFoundError,
     UserNotAllowThisResultError,
+    InvalidSubmissionError,
 )
 
 
@@ -75,23 +73,31 @@ class UpdateQuestionInput:
 
 
 class PracticeTestService:
-    def __init__(self, practice_test_repo: IPracticeTestRepository):
+    def __init__(
+        self,
+        practice_test_repo: IPracticeTestRepository,
+        answer_keys: Optional[IAnswerKeyCache] = None,
+        grading_policy: str = "all_or_nothing",
+        question_set_secret: Optional[bytes] = None,
+    ):
         self.practice_test_repo = practice_test_repo
-
-    def get_user_practice_test(self, user_id: UUID):
+        # None: đọc đáp án từ DB mỗi lần chấm
+        self.answer_keys = answer_keys
+        get_grading_policy(grading_policy)  # GRADING_POLICY sai thì báo lỗi ngay
+        self.grading_policy = grading_policy
+        # None: không phát danh sách câu hỏi, mọi lượt nộp chấm trên cả bài
+        self.question_set_secret = question_set_secret
+
+    def get_user_practice_test(
+        self,
+        user_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[PracticeTestOutput]:
         try:
-            practice_tests: List[PracticeTestOutput] = (
-                self.practice_test_repo.get_practice_tests_by_user_id(user_id)
+            return self.practice_test_repo.get_practice_tests_by_user_id(
+                user_id, page_request(cursor, limit)
             )
-            return [
-                DTOPracticeTestOutput(
-                    practice_test_id=practice_test.practice_test_id,
-                    practice_test_name=practice_test.practice_test_name,
-                    author_avatar_url=practice_test.author_avatar_url,
-                    author_username=practice_test.author_username,
-                )
-                for practice_test in practice_tests
-            ]
         except PracticeTestsNotFoundErrorDomain as e:
             raise PracticeTestsNotFoundError(str(e))
 
@@ -106,7 +112,9 @@ class PracticeTestService:
         except Exception as e:
             raise Exception("Không thể lấy ngẫu nhiên bài kiểm tra thử", e)
 
-    def get_practice_test_detail_by_id(self, practice_test_id: str):
+    def get_practice_test_detail_by_id(
+        self, practice_test_id: str
+    ) -> PraceticeTestWithDetailsResponse:
         try:
             return self.practice_test_repo.get_practice_test_detail_by_id(
                 practice_test_id=practice_test_id
@@ -116,7 +124,23 @@ class PracticeTestService:
         except Exception as e:
             raise Exception("Không thể lấy thông tin chi tiết bài kiểm tra thử", e)
 
-    def get_random_questions_by_id(self, practice_test_id: str, count: int | None):
+    def stream_practice_test_detail(
+        self, practice_test_id: UUID
+    ) -> Tuple[PracticeTestOutput, Iterator[QuestionDetailOutput]]:
+        # Kiểm tra bài kiểm tra ngay; câu hỏi chỉ được đọc khi duyệt iterator
+        try:
+            base_info = self.practice_test_repo.get_practice_test_base_info(
+                practice_test_id
+            )
+        except PracticeTestsNotFoundErrorDomain as e:
+            raise PracticeTestsNotFoundError(str(e))
+        return base_info, self.practice_test_repo.iter_practice_test_questions(
+            practice_test_id
+        )
+
+    def get_random_questions_by_id(
+        self, practice_test_id: str, count: int | None
+    ) -> PraceticeTestWithDetailsResponse:
         try:
             return self.practice_test_repo.get_practice_test_random_detail_by_id(
                 practice_test_id=practice_test_id, count=count
@@ -126,85 +150,34 @@ class PracticeTestService:
         except Exception as e:
             raise Exception("Không thể lấy thông tin chi tiết bài kiểm tra thử", e)
 
-    def get_all_histories(self, user_id: UUID):
-        response: List[ResultWithPracticeTest] = (
-            self.practice_test_repo.get_all_histories(user_id)
+    def issue_question_set(
+        self, practice_test_id: UUID, questions: List[QuestionDetailOutput]
+    ) -> Optional[str]:
+        # Gửi kèm câu hỏi của /random-questions; client gửi lại khi nộp bài
+        if self.question_set_secret is None:
+            return None
+        return sign_question_set(
+            self.question_set_secret,
+            practice_test_id,
+            (question.question.question_id for question in questions),
         )
 
-        dto_response: List[DTOResultWithPracticeTest] = []
-        for raw in response:
-            result_domain = raw.result
-            base_info_domain = raw.base_info
-
-            result_domain = DTOResultOutput(
-                result_id=result_domain.result_id,
-                num_of_questions=result_domain.num_of_questions,
-                score=result_domain.score,
-            )
-
-            practice_test_domain = DTOPracticeTestOutput(
-                practice_test_id=base_info_domain.practice_test_id,
-                practice_test_name=base_info_domain.practice_test_name,
-                author_avatar_url=base_info_domain.author_avatar_url,
-                author_username=base_info_domain.author_username,
-            )
-
-            dto_response.append(
-                DTOResultWithPracticeTest(
-                    result=result_domain, base_info=practice_test_domain
-                )
-            )
-        return dto_response
+    def get_all_histories(
+        self,
+        user_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[ResultWithPracticeTest]:
+        return self.practice_test_repo.get_all_histories(
+            user_id, page_request(cursor, limit)
+        )
 
     def get_practice_test_history(
         self, user_id: UUID, result_id: UUID, practice_test_id: UUID
-    ):
+    ) -> ResultWithHistory:
         try:
-            response: ResultWithHistory = (
-                self.practice_test_repo.get_practice_test_history(
-                    user_id, result_id, practice_test_id
-                )
-            )
-            dto_result = DTOResultOutput(
-                result_id=response.result.result_id,
-                num_of_questions=response.result.num_of_questions,
-                score=response.result.score,
-            )
-            dto_base_info = DTOPracticeTestOutput(
-                practice_test_id=response.base_info.practice_test_id,
-                practice_test_name=response.base_info.practice_test_name,
-                author_avatar_url=response.base_info.author_avatar_url,
-                author_username=response.base_info.author_username,
-            )
-
-            dto_histories: List[DTOHistoryOutput] = []
-            for history in response.histories:
-                question_detail = history.history.question_detail
-                dto_question_base = DTOQuestion(
-                    question_id=question_detail.question_id,
-                    question_text=question_detail.question_text,
-                    question_type=question_detail.question_type,
-                )
-                dto_options = [
-                    DTOQuestionOptions(
-                        option_id=option.option_id,
-                        option_text=option.option_text,
-                        is_correct=option.is_correct,
-                    )
-                    for option in question_detail.options
-                ]
-                dto_histories.append(
-                    DTOHistoryOutput(
-                        history_id=history.history.history_id,
-                        option_id=history.history.option_id,
-                        question_detail=DTOPracticeTestQuestions(
-                            question=dto_question_base, options=dto_options
-                        ),
-                    ),
-                )
-
-            return DTOResultWithHistory(
-                result=dto_result, base_info=dto_base_info, histories=dto_histories
+            return self.practice_test_repo.get_practice_test_history(
+                user_id, result_id, practice_test_id
             )
         except UserNotAllowThisResultErrorDomain:
             raise UserNotAllowThisResultError
@@ -244,12 +217,46 @@ class PracticeTestService:
             )
         )
 
+    def get_answer_key(self, practice_test_id: UUID) -> AnswerKey:
+        def load() -> AnswerKey:
+            try:
+                return self.practice_test_repo.get_answer_key(practice_test_id)
+            except PracticeTestsNotFoundErrorDomain as e:
+                raise PracticeTestsNotFoundError(str(e))
+
+        if self.answer_keys is None:
+            return load()
+        return self.answer_keys.get(str(practice_test_id), load)
+
     def submit_test(self, user_id: UUID, payload: DTOSubmitTestInput):
+        # Điểm và số câu do server chấm theo đáp án, không tin giá trị client gửi
+        answer_key = self.get_answer_key(payload.practice_test_id)
+        if payload.question_set is not None:
+            # Lượt làm một phần bài: chấm trên đúng các câu đã phát (câu đã bị xoá
+            # từ lúc phát thì bỏ qua)
+            if self.question_set_secret is None:
+                raise InvalidSubmissionError("Danh sách câu hỏi không hợp lệ")
+            served = verify_question_set(
+                self.question_set_secret, payload.practice_test_id, payload.question_set
+            )
+            answer_key = {
+                question_id: question
+                for question_id, question in answer_key.items()
+                if question_id in served
+            }
+        result = grade(
+            answer_key,
+            (
+                (answered.question_id, answered.option_id)
+                for answered in payload.answer_questions
+            ),
+            self.grading_policy,
+        )
         resutl_domain = ResultInput(
             user_id=user_id,
             practice_test_id=payload.practice_test_id,
-            num_of_questions=payload.num_of_questions,
-            score=payload.score,
+            num_of_questions=result.num_of_questions,
+            score=result.score,
         )
 
         history_domain: List[HistoryInput] = []
@@ -1,48 +1,90 @@
-from app.application.abstractions.course_abstraction import ICourseRepository
-from app.application.abstractions.practice_test_abstraction import (
-    IPracticeTestRepository,
-)
+from uuid import UUID
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.application.abstractions.search_abstraction import ISearchEngine
+from app.application.exceptions import InvalidCursorError
+from app.application.pagination import decode_cursor, encode_cursor
 from app.domain.entities.course.course_entity import CourseInput
 
 
 class SearchServices:
-    def __init__(
-        self,
-        course_repo: ICourseRepository,
-        practice_test_repo: IPracticeTestRepository,
-    ):
-        self.course_repo = course_repo
-        self.practice_test_repo = practice_test_repo
+    def __init__(self, search_engine: ISearchEngine):
+        self.search_engine = search_engine
+
+    @staticmethod
+    def _cursor_id(query_input: CourseInput) -> Optional[str]:
+        # Cursor tìm kiếm là id của kết quả cuối trang trước
+        if query_input.cursor:
+            return str(decode_cursor(query_input.cursor, (UUID,))[0])
+        if query_input.cursor_id:
+            try:
+                return str(UUID(query_input.cursor_id))
+            except ValueError as e:
+                raise InvalidCursorError("cursor_id không hợp lệ") from e
+        return None
+
+    @staticmethod
+    def _page(
+        search: Callable[..., List[Any]],
+        keyword: str,
+        cursor_id: Optional[str],
+        limit: int,
+        id_of: Callable[[Any], UUID],
+    ) -> Tuple[List[Any], Optional[str]]:
+        # Lấy dư 1 kết quả để biết còn trang sau
+        results = search(keyword, cursor_id, limit + 1)
+        if len(results) <= limit:
+            return results, None
+        results = results[:limit]
+        return results, encode_cursor([id_of(results[-1])])
 
     def search_by_keyword(self, query_input: CourseInput) -> dict:
         try:
             keyword = query_input.keyword
             type = query_input.type
-            cursor_id = query_input.cursor_id
-            courses_result = []
-            practice_tests_result = []
+            limit = query_input.limit
+            cursor_id = self._cursor_id(query_input)
+            courses_result, next_courses_cursor = [], None
+            practice_tests_result, next_practice_tests_cursor = [], None
 
             match type:
                 case "all":
-                    courses_result = self.course_repo.get_courses_by_keyword(keyword)
-
-                    practice_tests_result = (
-                        self.practice_test_repo.get_practice_tests_by_keyword(keyword)
+                    courses_result, next_courses_cursor = self._page(
+                        self.search_engine.search_courses,
+                        keyword,
+                        None,
+                        limit,
+                        lambda course: course.course_id,
+                    )
+                    practice_tests_result, next_practice_tests_cursor = self._page(
+                        self.search_engine.search_practice_tests,
+                        keyword,
+                        None,
+                        limit,
+                        lambda practice_test: practice_test.practice_test_id,
                     )
                 case "courses":
-                    courses_result = self.course_repo.get_courses_by_keyword(
-                        keyword, cursor_id
+                    courses_result, next_courses_cursor = self._page(
+                        self.search_engine.search_courses,
+                        keyword,
+                        cursor_id,
+                        limit,
+                        lambda course: course.course_id,
                     )
                 case "practice_tests":
-                    practice_tests_result = (
-                        self.practice_test_repo.get_practice_tests_by_keyword(
-                            keyword, cursor_id
-                        )
+                    practice_tests_result, next_practice_tests_cursor = self._page(
+                        self.search_engine.search_practice_tests,
+                        keyword,
+                        cursor_id,
+                        limit,
+                        lambda practice_test: practice_test.practice_test_id,
                     )
 
             return {
                 "courses": courses_result,
                 "practice_tests": practice_tests_result,
+                "next_courses_cursor": next_courses_cursor,
+                "next_practice_tests_cursor": next_practice_tests_cursor,
             }
         except Exception as e:
             print("Lỗi trong quá trình tìm kiếm", e)
@@ -0,0 +1,64 @@
+from uuid import UUID
+from typing import Any, Dict, Optional
+
+from app.application.abstractions.security_abstraction import ISecurityService
+from app.application.abstractions.revocation_abstraction import IRevocationStore
+from app.application.abstractions.user_abstraction import IUserRepository
+from app.application.dtos.auth_dto import DTOCurrentUser
+from app.application.exceptions import (
+    AccountNotFoundError,
+    AccoutHasBeenLocked,
+    TokenRevokedError,
+)
+
+# Phiên bản bộ claim của access token; token có "ver" >= giá trị này mang đủ
+# sub / role / iat để xác thực mà không cần đọc bảng users
+ACCESS_TOKEN_VERSION = 1
+
+
+def build_access_token_claims(user_id: UUID, role: str) -> Dict[str, Any]:
+    return {"sub": str(user_id), "role": str(role), "ver": ACCESS_TOKEN_VERSION}
+
+
+class TokenAuthService:
+    """
+    Xác thực access token cho mỗi request.
+    - Token mới: tin claim đã ký, chỉ kiểm tra danh sách thu hồi trong bộ nhớ
+      (được cập nhật khi admin khoá / mở khoá / cấp quyền).
+    - Token cấp trước khi có claim "ver", hoặc danh sách thu hồi không dùng chung
+      giữa các worker (backend memory, nhiều worker): đọc người dùng từ DB.
+    """
+
+    def __init__(
+        self,
+        security_service: ISecurityService,
+        revocation_store: IRevocationStore,
+        user_repo: IUserRepository,
+    ):
+        self.security_service = security_service
+        self.revocation_store = revocation_store
+        self.user_repo = user_repo
+
+    def decode(self, access_token: str) -> Dict[str, Any]:
+        return self.security_service.decode_access_token(access_token)
+
+    def from_claims(self, payload: Dict[str, Any]) -> Optional[DTOCurrentUser]:
+        # None: cần gọi from_database
+        if payload.get("ver", 0) < ACCESS_TOKEN_VERSION:
+            return None
+        if not self.revocation_store.shared:
+            # Khoá tài khoản ở worker khác không tới được danh sách của worker này
+            return None
+
+        user_id = UUID(payload["sub"])
+        if self.revocation_store.is_revoked(user_id, int(payload["iat"])):
+            raise TokenRevokedError("Token đã bị thu hồi")
+        return DTOCurrentUser(user_id=user_id, role=payload["role"])
+
+    def from_database(self, payload: Dict[str, Any]) -> DTOCurrentUser:
+        user = self.user_repo.get_user_by_id(id=payload.get("sub"))
+        if not user:
+            raise AccountNotFoundError("Không tìm được tài khoản người dùng")
+        if not user.is_actived:
+            raise AccoutHasBeenLocked("Tài khoản đã bị khoá")
+        return DTOCurrentUser(user_id=user.user_id, role=user.role)
@@ -72,7 +72,7 @@ class CourseDetail:
         if not definition:
             raise ValueError("Không có định nghĩa")
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CourseDetailOutput:
     course_detail_id: str
     term: str
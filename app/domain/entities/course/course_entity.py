@@ -69,10 +69,12 @@ class Course:
 class CourseInput:
     keyword: str
     type: str
+    cursor: str | None
     cursor_id: str | None
+    limit: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CourseOutput:
     course_id: UUID
     course_name: str
@@ -72,7 +72,7 @@ class AnswerOption:
             raise ValueError("Câu trả lời không có đúng sai")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnswerOptionOutput:
     option_id: UUID
     option_text: str
@@ -65,7 +65,7 @@ class PracticeTest:
         self._updated_at = datetime.utcnow()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PracticeTestOutput:
     practice_test_id: UUID
     practice_test_name: str
@@ -56,14 +56,8 @@ class HistoryInput:
     option_id: Optional[UUID]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HistoryOutput:
     history_id: UUID
     option_id: List[UUID]
     question_detail: QuestionWithOptionsOutput
-
-
-@dataclass(frozen=True)
-class QuestionHistory:
-    question_id: UUID
-    history: HistoryOutput
@@ -61,17 +61,15 @@ class PracticeTestQuestion:
             raise ValueError("Loại câu hỏi không hợp lệ")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QuestionOutput:
     question_id: UUID
     question_text: str
     question_type: str
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QuestionWithOptionsOutput:
-    question_id: UUID
-    question_text: str
-    question_type: str
+    question: QuestionOutput
     options: List[AnswerOptionOutput]
 
 
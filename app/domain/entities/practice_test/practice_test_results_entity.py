@@ -4,7 +4,7 @@ from typing import List
 from dataclasses import dataclass
 
 from .practice_test_entity import PracticeTestOutput
-from .practice_test_histories import QuestionHistory
+from .practice_test_histories import HistoryOutput
 
 class PracticeTestResult:
     def __init__(
@@ -67,19 +67,19 @@ class ResultInput:
     score: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ResultOutput:
     result_id: UUID
     num_of_questions: int
     score: int
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ResultWithHistory:
     result: ResultOutput
     base_info: PracticeTestOutput
-    histories: List[QuestionHistory]
+    histories: List[HistoryOutput]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ResultWithPracticeTest:
     result: ResultOutput
     base_info: PracticeTestOutput
\ No newline at end of file
@@ -1,12 +1,18 @@
 from uuid import UUID
 from uuid6 import uuid7
 from datetime import datetime
+from typing import Optional
 from dataclasses import dataclass
 
 
 class RefreshToken:
     def __init__(
-        self, _jti: UUID, _user_id: UUID, _expires_at: datetime, _issued_at: datetime
+        self,
+        _jti: UUID,
+        _user_id: UUID,
+        _expires_at: datetime,
+        _issued_at: datetime,
+        _family_id: UUID,
     ):
         if not _user_id:
             raise ValueError("Không có người dùng")
@@ -17,6 +23,7 @@ class RefreshToken:
         self._user_id = _user_id
         self._expires_at = _expires_at
         self._issued_at = _issued_at
+        self._family_id = _family_id
 
     @classmethod
     def create_new_refresh_token(
@@ -24,9 +31,16 @@ class RefreshToken:
         user_id: UUID,
         expires_at: datetime,
         issued_at: datetime,
+        family_id: Optional[UUID] = None,
     ) -> "RefreshToken":
+        # Token đăng nhập mở một họ mới (family_id = jti); token xoay vòng giữ họ cũ
+        jti = uuid7()
         return cls(
-            _jti=uuid7(), _user_id=user_id, _expires_at=expires_at, _issued_at=issued_at
+            _jti=jti,
+            _user_id=user_id,
+            _expires_at=expires_at,
+            _issued_at=issued_at,
+            _family_id=family_id or jti,
         )
 
     @property
@@ -44,3 +58,7 @@ class RefreshToken:
     @property
     def issued_at(self) -> datetime:
         return self._issued_at
+
+    @property
+    def family_id(self) -> UUID:
+        return self._family_id
@@ -0,0 +1,68 @@
+import threading
+from typing import Callable, Dict
+
+from app.application.abstractions.cache_abstraction import (
+    IAnswerKeyCache,
+    IPayloadCache,
+)
+from app.application.grading_engine import AnswerKey
+from app.infrastructure.cache.backends import CacheBackend, MemoryCacheBackend
+from app.infrastructure.cache.payload_cache import practice_test_detail_cache
+from app.infrastructure.config.setting import settings
+
+
+class AnswerKeyCache(IAnswerKeyCache):
+    """
+    Đáp án (frozenset option_id đúng của từng câu) theo bài kiểm tra, giữ dạng
+    object trong bộ nhớ của từng worker. Version lấy từ cache chi tiết bài kiểm
+    tra nên invalidate_practice_test cũng bỏ đáp án cũ. shared=False (version ở
+    backend memory, nhiều worker): worker khác không thấy invalidate, không dùng
+    được cache này để chấm.
+    """
+
+    def __init__(
+        self,
+        versions: IPayloadCache,
+        backend: CacheBackend,
+        ttl: int,
+        shared: bool = True,
+    ):
+        self.versions = versions
+        self.backend = backend
+        self.ttl = ttl
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, practice_test_id: str, load: Callable[[], AnswerKey]) -> AnswerKey:
+        cache_key = f"{practice_test_id}:{self.versions.version(practice_test_id)}"
+        answer_key = self.backend.get(cache_key)
+        with self._lock:
+            if answer_key is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if answer_key is None:
+            answer_key = load()
+            self.backend.set(cache_key, answer_key, self.ttl)
+        return answer_key
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "entries": self.backend.size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+answer_key_cache = AnswerKeyCache(
+    practice_test_detail_cache,
+    MemoryCacheBackend(settings.ANSWER_KEY_CACHE_MAX_ENTRIES),
+    settings.ANSWER_KEY_CACHE_TTL,
+    shared=settings.CACHE_BACKEND == "redis" or settings.WEB_CONCURRENCY <= 1,
+)
@@ -0,0 +1,125 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheBackend(ABC):
+    name: str
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: int):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def get_version(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def bump_version(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    # LRU + TTL trong process, an toàn khi dùng từ nhiều thread
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Version cũng là LRU giới hạn max_entries. Version lấy từ một bộ đếm chung
+        # tăng dần; key bị đẩy ra nhận version lớn nhất đã bị đẩy ra, nên version của
+        # một key không bao giờ lùi về giá trị mà bản ghi cũ còn dùng
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._version_clock = 0
+        self._evicted_version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_version(self, key: str) -> int:
+        with self._lock:
+            version = self._versions.get(key)
+            if version is None:
+                return self._evicted_version
+            self._versions.move_to_end(key)
+            return version
+
+    def bump_version(self, key: str) -> int:
+        with self._lock:
+            self._version_clock += 1
+            self._versions[key] = self._version_clock
+            self._versions.move_to_end(key)
+            while len(self._versions) > self.max_entries:
+                _, version = self._versions.popitem(last=False)
+                self._evicted_version = max(self._evicted_version, version)
+            return self._version_clock
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    # Backend dùng chung giữa các worker; cần cài thêm gói `redis`
+    name = "redis"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis yêu cầu cài đặt gói redis") from e
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self.client.set(key, value, ex=ttl)
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def get_version(self, key: str) -> int:
+        version = self.client.get(key)
+        return int(version) if version else 0
+
+    def bump_version(self, key: str) -> int:
+        return self.client.incr(key)
+
+    def size(self) -> int:
+        return self.client.dbsize()
@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from app.application.abstractions.cache_abstraction import IPayloadCache
+from app.infrastructure.cache.backends import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+from app.infrastructure.config.setting import settings
+
+# Tăng khi cấu trúc payload thay đổi để bỏ qua dữ liệu cũ trong cache dùng chung
+PAYLOAD_SCHEMA_VERSION = 1
+
+
+class PayloadCache(IPayloadCache):
+    """
+    Cache payload JSON đã serialize theo namespace.
+    Mỗi key có một version; invalidate tăng version nên các bản ghi cũ
+    (kể cả bản ghi được ghi muộn bởi request đọc song song) không còn được đọc.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend, ttl: int):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.namespace}:ver:{key}"
+
+    def _data_key(self, key: str, version: int) -> str:
+        return f"{self.namespace}:v{PAYLOAD_SCHEMA_VERSION}:{key}:{version}"
+
+    def get(self, key: str) -> Tuple[Optional[bytes], int]:
+        version = self.backend.get_version(self._version_key(key))
+        payload = self.backend.get(self._data_key(key, version))
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload, version
+
+    def set(self, key: str, payload: bytes, version: int):
+        if self.backend.get_version(self._version_key(key)) != version:
+            return
+        self.backend.set(self._data_key(key, version), payload, self.ttl)
+
+    def version(self, key: str) -> int:
+        return self.backend.get_version(self._version_key(key))
+
+    def invalidate(self, key: str):
+        old_version = self.backend.get_version(self._version_key(key))
+        self.backend.bump_version(self._version_key(key))
+        self.backend.delete(self._data_key(key, old_version))
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "entries": self.backend.size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def build_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+
+cache_backend = build_cache_backend()
+
+practice_test_detail_cache = PayloadCache(
+    "practice_test_detail", cache_backend, settings.PRACTICE_TEST_DETAIL_CACHE_TTL
+)
+
+course_detail_cache = PayloadCache(
+    "course_detail", cache_backend, settings.COURSE_DETAIL_CACHE_TTL
+)
+
+
+def invalidate_practice_test(practice_test_id):
+    # Gọi sau mỗi thay đổi (đã commit) của bài kiểm tra
+    practice_test_detail_cache.invalidate(str(practice_test_id))
+
+
+def invalidate_course(course_id):
+    course_detail_cache.invalidate(str(course_id))
+
+
+def get_cache_stats() -> Dict[str, Dict]:
+    return {
+        "practice_test_detail": practice_test_detail_cache.stats(),
+        "course_detail": course_detail_cache.stats(),
+    }
@@ -0,0 +1,86 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from app.infrastructure.config.setting import settings
+
+
+class RandomPool:
+    """
+    Giữ sẵn trong bộ nhớ một tập ứng viên (vd học phần / bài kiểm tra nổi bật)
+    để lấy ngẫu nhiên mà không phải ORDER BY random() trên toàn bảng.
+    - Làm mới lười: request đầu tiên sau khi hết hạn tự nạp lại bằng loader của nó,
+      các request khác vẫn đọc pool cũ trong lúc đó (chỉ chờ khi pool còn rỗng).
+    - Phần tử bị xoá được loại khỏi pool ngay, không đợi lần làm mới sau.
+    """
+
+    def __init__(self, name: str, size: int, refresh_seconds: int):
+        self.name = name
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self._items: List[Any] = []
+        self._loaded_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self.refreshes = 0
+
+    def _stale(self) -> bool:
+        return time.monotonic() - self._loaded_at >= self.refresh_seconds
+
+    def _refresh(self, loader: Callable[[int], List[Any]], blocking: bool):
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return
+        try:
+            # Request khác có thể vừa làm mới xong trong lúc chờ lock
+            if self._items and not self._stale():
+                return
+            items = loader(self.size)
+            # Thay cả list (không sửa tại chỗ) để request đang đọc không bị ảnh hưởng
+            self._items = list(items)
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+        except Exception as e:
+            print(f"Lỗi khi làm mới pool ngẫu nhiên {self.name}", e)
+            # Giữ pool cũ, thử lại sau một chu kỳ thay vì ở mỗi request
+            self._loaded_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    def sample(self, k: int, loader: Callable[[int], List[Any]]) -> List[Any]:
+        if self._stale() or not self._items:
+            self._refresh(loader, blocking=not self._items)
+        items = self._items
+        return random.sample(items, min(k, len(items)))
+
+    def discard(self, predicate: Callable[[Any], bool]):
+        self._items = [item for item in self._items if not predicate(item)]
+
+    def clear(self):
+        self._items = []
+        self._loaded_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._items),
+            "capacity": self.size,
+            "age_seconds": (
+                round(time.monotonic() - self._loaded_at, 1) if self._items else None
+            ),
+            "refreshes": self.refreshes,
+        }
+
+
+random_course_pool = RandomPool(
+    "courses", settings.RANDOM_POOL_SIZE, settings.RANDOM_POOL_REFRESH_SECONDS
+)
+
+random_practice_test_pool = RandomPool(
+    "practice_tests", settings.RANDOM_POOL_SIZE, settings.RANDOM_POOL_REFRESH_SECONDS
+)
+
+
+def get_random_pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        "courses": random_course_pool.stats(),
+        "practice_tests": random_practice_test_pool.stats(),
+    }
@@ -0,0 +1,46 @@
+import time
+from uuid import UUID
+
+from app.application.abstractions.revocation_abstraction import IRevocationStore
+from app.infrastructure.cache.backends import CacheBackend, MemoryCacheBackend
+from app.infrastructure.cache.payload_cache import cache_backend
+from app.infrastructure.config.setting import settings
+
+
+class RevocationStore(IRevocationStore):
+    """
+    Lưu thời điểm thu hồi theo user_id; access token có iat <= thời điểm đó bị từ chối.
+    Bản ghi chỉ cần sống bằng thời hạn access token: token cấp trước đó đã tự hết hạn.
+    iat tính theo giây nên token cấp trong cùng giây với lúc thu hồi cũng bị từ chối.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int, shared: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.shared = shared
+
+    @staticmethod
+    def _key(user_id) -> str:
+        return f"auth:revoked:{user_id}"
+
+    def revoke_user(self, user_id: UUID):
+        self.backend.set(self._key(user_id), str(time.time()).encode(), self.ttl)
+
+    def is_revoked(self, user_id: UUID, issued_at: int) -> bool:
+        revoked_at = self.backend.get(self._key(user_id))
+        return revoked_at is not None and issued_at <= float(revoked_at)
+
+
+def build_revocation_backend() -> CacheBackend:
+    # Redis: thu hồi có hiệu lực ở mọi worker. Memory: backend riêng, không dùng chung
+    # LRU với cache payload để bản ghi thu hồi không bị đẩy ra khi cache đầy
+    if settings.CACHE_BACKEND == "redis":
+        return cache_backend
+    return MemoryCacheBackend(settings.REVOCATION_MAX_ENTRIES)
+
+
+revocation_store = RevocationStore(
+    build_revocation_backend(),
+    settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 60,
+    shared=settings.CACHE_BACKEND == "redis" or settings.WEB_CONCURRENCY <= 1,
+)
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Sequence, Tuple
+
+from app.application.abstractions.cache_abstraction import ITermIndexCache
+from app.application.similarity_index import TermSimilarityIndex
+from app.infrastructure.config.setting import settings
+
+
+class TermIndexCache(ITermIndexCache):
+    """
+    Index gần nghĩa theo học phần, LRU trong bộ nhớ của từng worker (mảng numpy
+    không serialize qua redis). Mỗi bản ghi gắn version (ETag của snapshot học
+    phần): version đổi thì cập nhật từ index cũ thay vì dựng lại từ đầu. Việc dựng
+    chạy ngoài lock; hai request cùng lúc có thể cùng dựng, bản sau ghi đè.
+    """
+
+    def __init__(self, max_entries: int, neighbours: int, dimensions: int):
+        self.max_entries = max_entries
+        self.neighbours = neighbours
+        self.dimensions = dimensions
+        self._entries: "OrderedDict[str, Tuple[str, TermSimilarityIndex]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.updates = 0
+
+    def get(
+        self, key: str, version: str, ids: Sequence, texts: Sequence[str]
+    ) -> TermSimilarityIndex:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == version:
+                    self.hits += 1
+                    return entry[1]
+
+        if entry is None:
+            index = TermSimilarityIndex.build(
+                ids, texts, self.neighbours, self.dimensions
+            )
+        else:
+            index = entry[1].update(ids, texts, self.dimensions)
+
+        with self._lock:
+            if entry is None:
+                self.builds += 1
+            else:
+                self.updates += 1
+            self._entries[key] = (version, index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "terms": sum(len(index.ids) for _, index in self._entries.values()),
+                "hits": self.hits,
+                "builds": self.builds,
+                "updates": self.updates,
+            }
+
+
+term_index_cache = TermIndexCache(
+    settings.SIMILARITY_INDEX_MAX_ENTRIES,
+    settings.SIMILARITY_NEIGHBOURS,
+    settings.SIMILARITY_INDEX_DIMENSIONS,
+)
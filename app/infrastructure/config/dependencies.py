@@ -1,33 +1,129 @@
-from app.infrastructure.database.connection import get_db
+from typing import Optional
+
+from app.infrastructure.database.connection import get_db, get_pool_metrics
 from app.infrastructure.database.repositories.course_repo import CoursesRepository
 from app.infrastructure.database.repositories.practice_test_repo import (
     PracticeTestRepository,
+    QueuedPracticeTestRepository,
 )
+from app.infrastructure.database.submission_queue import submission_queue
 from app.infrastructure.database.repositories.user_repo import UserRepository
 from app.infrastructure.database.repositories.refresh_token_repo import (
     RefreshTokenRepository,
 )
+from app.infrastructure.cache.payload_cache import (
+    practice_test_detail_cache,
+    course_detail_cache,
+    get_cache_stats,
+)
+from app.infrastructure.cache.random_pool import get_random_pool_stats
+from app.infrastructure.cache.revocation_store import revocation_store
+from app.infrastructure.cache.term_index_cache import term_index_cache
+from app.infrastructure.cache.answer_key_cache import answer_key_cache
+from app.infrastructure.database.maintenance import get_refresh_token_sweep_stats
+from app.infrastructure.search.postgres_search_engine import PostgresSearchEngine
+from app.infrastructure.search.like_search_engine import LikeSearchEngine
+from app.infrastructure.search.memory_search_engine import memory_search_engine
 from app.infrastructure.config.security_service_impl import SecurityServiceImpl
+from app.infrastructure.config.setting import settings
 from app.application.abstractions.security_abstraction import ISecurityService
+from app.application.abstractions.cache_abstraction import (
+    IAnswerKeyCache,
+    IPayloadCache,
+    ITermIndexCache,
+)
+from app.application.distractor_engine import np
+from app.application.abstractions.search_abstraction import ISearchEngine
+from app.application.abstractions.revocation_abstraction import IRevocationStore
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
 
-def get_course_repo(db: Session = Depends(get_db)) -> CoursesRepository:
+async def get_course_repo(db: Session = Depends(get_db)) -> CoursesRepository:
     return CoursesRepository(db)
 
 
-def get_practice_test_repo(db: Session = Depends(get_db)) -> PracticeTestRepository:
+async def get_practice_test_repo(
+    db: Session = Depends(get_db),
+) -> PracticeTestRepository:
+    if settings.SUBMISSION_MODE != "sync":
+        return QueuedPracticeTestRepository(db, submission_queue)
     return PracticeTestRepository(db)
 
 
-def get_user_repo(db: Session = Depends(get_db)) -> UserRepository:
+async def get_user_repo(db: Session = Depends(get_db)) -> UserRepository:
     return UserRepository(db)
 
 
-def get_refresh_token_repo(db: Session = Depends(get_db)) -> RefreshTokenRepository:
+async def get_refresh_token_repo(
+    db: Session = Depends(get_db),
+) -> RefreshTokenRepository:
     return RefreshTokenRepository(db)
 
 
-def get_security_service() -> ISecurityService:
+async def get_search_engine(db: Session = Depends(get_db)) -> ISearchEngine:
+    if settings.SEARCH_BACKEND == "memory":
+        return memory_search_engine
+    if settings.SEARCH_BACKEND == "like":
+        return LikeSearchEngine(CoursesRepository(db), PracticeTestRepository(db))
+    return PostgresSearchEngine(db)
+
+
+async def get_security_service() -> ISecurityService:
     return SecurityServiceImpl()
+
+
+async def get_revocation_store() -> IRevocationStore:
+    return revocation_store
+
+
+async def get_db_pool_metrics() -> dict:
+    return get_pool_metrics()
+
+
+async def get_practice_test_detail_cache() -> IPayloadCache:
+    return practice_test_detail_cache
+
+
+async def get_course_detail_cache() -> IPayloadCache:
+    return course_detail_cache
+
+
+async def get_answer_key_cache() -> Optional[IAnswerKeyCache]:
+    # Như danh sách thu hồi: chấm theo đáp án cũ ở worker khác là sai điểm
+    if settings.ANSWER_KEY_CACHE_TTL > 0 and answer_key_cache.shared:
+        return answer_key_cache
+    return None
+
+
+async def get_term_index_cache() -> Optional[ITermIndexCache]:
+    # None: đáp án nhiễu ngẫu nhiên, không cần index
+    if settings.DISTRACTOR_MODE != "similar":
+        return None
+    if np is None:
+        raise RuntimeError("DISTRACTOR_MODE=similar yêu cầu cài đặt gói numpy")
+    return term_index_cache
+
+
+async def get_submission_metrics() -> dict:
+    return submission_queue.stats()
+
+
+async def get_term_index_metrics() -> dict:
+    return term_index_cache.stats()
+
+
+async def get_cache_metrics() -> dict:
+    return get_cache_stats()
+
+
+async def get_answer_key_metrics() -> dict:
+    return answer_key_cache.stats()
+
+
+async def get_random_pool_metrics() -> dict:
+    return get_random_pool_stats()
+
+
+async def get_refresh_token_metrics() -> dict:
+    return {"sweep": get_refresh_token_sweep_stats()}
@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import status, HTTPException
+from passlib.context import CryptContext
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from app.infrastructure.config.setting import settings
+
+SUPPORTED_SCHEMES = ("bcrypt", "argon2", "scrypt")
+
+
+def scheme_costs(scheme: str) -> Dict[str, Any]:
+    # Tham số cost của từng scheme lấy từ settings (tên tham số theo passlib)
+    if scheme == "bcrypt":
+        return {"rounds": settings.BCRYPT_ROUNDS}
+    if scheme == "argon2":
+        return {
+            "type": "ID",
+            "rounds": settings.ARGON2_TIME_COST,
+            "memory_cost": settings.ARGON2_MEMORY_COST,
+            "parallelism": settings.ARGON2_PARALLELISM,
+        }
+    if scheme == "scrypt":
+        return {
+            "rounds": settings.SCRYPT_ROUNDS,
+            "block_size": settings.SCRYPT_BLOCK_SIZE,
+            "parallelism": settings.SCRYPT_PARALLELISM,
+        }
+    raise ValueError(f"Scheme băm mật khẩu không được hỗ trợ: {scheme}")
+
+
+def build_password_context(
+    schemes: List[str], costs: Optional[Dict[str, Dict[str, Any]]] = None
+) -> CryptContext:
+    """
+    Scheme đầu tiên dùng để băm mật khẩu mới; các scheme sau chỉ để xác thực
+    hash cũ. Hash khác scheme mặc định hoặc khác cost hiện tại (cả cao hơn lẫn
+    thấp hơn) được coi là cần băm lại khi người dùng đăng nhập.
+    """
+    costs = costs or {}
+    options: Dict[str, Any] = {}
+    for scheme in schemes:
+        if scheme == "argon2":
+            from passlib.hash import argon2
+
+            if not argon2.has_backend():
+                raise RuntimeError("Scheme argon2 yêu cầu cài đặt gói argon2-cffi")
+        for name, value in {**scheme_costs(scheme), **costs.get(scheme, {})}.items():
+            options[f"{scheme}__{name}"] = value
+            if name == "rounds":
+                options[f"{scheme}__min_rounds"] = value
+                options[f"{scheme}__max_rounds"] = value
+    return CryptContext(
+        schemes=schemes, default=schemes[0], deprecated="auto", **options
+    )
+
+
+pwd_context = build_password_context(settings.PASSWORD_HASH_SCHEMES)
+
+
+# Chạy trong process con: phải là hàm module-level để pickle được
+def hash_password(plain_password: str) -> str:
+    return pwd_context.hash(plain_password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Process pool riêng cho việc băm mật khẩu để bcrypt / argon2 / scrypt không giữ GIL
+    và không chiếm threadpool / event loop dùng chung với các endpoint khác.
+    - Tối đa workers + max_pending việc cùng lúc; vượt quá thì trả 503 ngay
+      thay vì xếp hàng vô hạn trong lúc bị dồn đăng nhập.
+    - workers = 0: băm ngay trên thread gọi (môi trường dev / test).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: không fork process đang chạy event loop và nhiều thread
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    @staticmethod
+    def _wait(future: Future) -> Any:
+        # Trong run_db ở chế độ async: nhường event loop thay vì chặn nó
+        if in_greenlet():
+            return await_only(asyncio.wrap_future(future))
+        return future.result()
+
+    def run(self, func: Callable[..., Any], *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Máy chủ đang bận, vui lòng thử lại sau",
+                headers={"Retry-After": "1"},
+            )
+        if self.workers <= 0:
+            try:
+                return func(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return self._wait(future)
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher_pool = PasswordHasherPool(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -1,29 +1,42 @@
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from uuid6 import uuid7
-from passlib.context import CryptContext
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from fastapi import status, HTTPException
 
 from app.application.abstractions.security_abstraction import ISecurityService
 from app.infrastructure.config.setting import settings
-
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.infrastructure.config.password_hasher import (
+    password_hasher_pool,
+    hash_password,
+    verify_password,
+    verify_and_update,
+)
 
 
 class SecurityServiceImpl(ISecurityService):
     def hash_password(self, plain_password: str) -> str:
-        return pwd_context.hash(plain_password)
+        return password_hasher_pool.run(hash_password, plain_password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_hasher_pool.run(
+            verify_password, plain_password, hashed_password
+        )
+
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return password_hasher_pool.run(
+            verify_and_update, plain_password, hashed_password
+        )
 
     def create_access_token(self, payload: Dict[str, Any]) -> str:
         encoded_payload = payload.copy()
 
-        expire = datetime.now(timezone.utc) + timedelta(minutes=30)
+        expire = datetime.now(timezone.utc) + timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        )
         issued_at = datetime.now(timezone.utc)
 
         encoded_payload.update(
@@ -11,8 +11,155 @@ class Settings:
     POSTGRES_DB: str = os.getenv("POSTGRES_DB")
 
     SQLALCHEMY_DATABASE_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    SQLALCHEMY_ASYNC_DATABASE_URL: str = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+    # Bật engine asyncpg cho toàn bộ request path
+    DB_ASYNC_MODE: bool = os.getenv("DB_ASYNC_MODE", "false").lower() == "true"
+
+    # Connection pool (mỗi worker uvicorn có pool riêng)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Nếu đặt, tổng số kết nối (pool + overflow) được chia đều cho WEB_CONCURRENCY worker
+    DB_MAX_CONNECTIONS: int | None = (
+        int(os.getenv("DB_MAX_CONNECTIONS")) if os.getenv("DB_MAX_CONNECTIONS") else None
+    )
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+    # "json": chi tiết bài kiểm tra dựng bằng 1 câu SQL json_agg; "orm": 3 truy vấn ORM
+    PRACTICE_TEST_DETAIL_MODE: str = os.getenv("PRACTICE_TEST_DETAIL_MODE", "json")
+    # Bài kiểm tra có từ chừng này câu hỏi trở lên được ghi bằng bulk insert
+    PRACTICE_TEST_BULK_INSERT_THRESHOLD: int = int(
+        os.getenv("PRACTICE_TEST_BULK_INSERT_THRESHOLD", "50")
+    )
+
+    # Cache payload: "memory" (LRU trong mỗi worker) hoặc "redis" (dùng chung)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+    PRACTICE_TEST_DETAIL_CACHE_TTL: int = int(
+        os.getenv("PRACTICE_TEST_DETAIL_CACHE_TTL", "300")
+    )
+    COURSE_DETAIL_CACHE_TTL: int = int(os.getenv("COURSE_DETAIL_CACHE_TTL", "300"))
+
+    # Cache đáp án dùng để chấm bài nộp: LRU trong mỗi worker, ttl (giây, 0 để tắt).
+    # Với CACHE_BACKEND=memory và WEB_CONCURRENCY > 1 cache bị bỏ qua, đọc đáp án từ DB
+    ANSWER_KEY_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("ANSWER_KEY_CACHE_MAX_ENTRIES", "1000")
+    )
+    ANSWER_KEY_CACHE_TTL: int = int(os.getenv("ANSWER_KEY_CACHE_TTL", "300"))
+    # Điểm câu MULTIPLE_CHOICE: "all_or_nothing" (phải chọn đúng đủ), "partial"
+    # (tỉ lệ đáp án đúng đã chọn, chọn sai thì 0) hoặc "right_minus_wrong"
+    GRADING_POLICY: str = os.getenv("GRADING_POLICY", "all_or_nothing")
+
+    # Ghi bài nộp: "sync" (ghi ngay trong request), "memory" (trả result_id ngay,
+    # thread nền ghi theo lô; bài chưa ghi mất nếu process chết) hoặc "spool" (như
+    # memory nhưng ghi trước vào file trong SUBMISSION_SPOOL_DIR, được ghi nốt khi
+    # khởi động lại). Quá SUBMISSION_MAX_PENDING bài chưa ghi thì trả 503. Bài nộp
+    # không ghi được (vi phạm ràng buộc) nằm ở SUBMISSION_SPOOL_DIR/dead-letter
+    SUBMISSION_MODE: str = os.getenv("SUBMISSION_MODE", "sync")
+    SUBMISSION_BATCH_SIZE: int = int(os.getenv("SUBMISSION_BATCH_SIZE", "200"))
+    SUBMISSION_FLUSH_INTERVAL_MS: int = int(
+        os.getenv("SUBMISSION_FLUSH_INTERVAL_MS", "50")
+    )
+    SUBMISSION_MAX_PENDING: int = int(os.getenv("SUBMISSION_MAX_PENDING", "5000"))
+    SUBMISSION_SPOOL_DIR: str = os.getenv("SUBMISSION_SPOOL_DIR", "submission_spool")
+    # false: file spool chỉ an toàn khi process chết, không an toàn khi mất điện
+    SUBMISSION_SPOOL_FSYNC: bool = (
+        os.getenv("SUBMISSION_SPOOL_FSYNC", "true").lower() == "true"
+    )
+
+    # Số dòng mỗi lần ghi (executemany khi tạo / nhập học phần) hoặc đọc
+    # (cursor phía server khi xuất file / trả JSON streaming)
+    DB_CHUNK_SIZE: int = int(os.getenv("DB_CHUNK_SIZE", "1000"))
+
+    # Lớp response mặc định của app: "json" (json.dumps của FastAPI) hoặc "orjson"
+    # (cần gói orjson), dùng cho các route trả dict / model
+    JSON_RESPONSE_CLASS: str = os.getenv("JSON_RESPONSE_CLASS", "json")
+    # true: các route đọc lớn (chi tiết, học / kiểm tra, lịch sử...) trả bytes JSON
+    # serialize từ schema đã validate, FastAPI không validate lại theo response_model;
+    # false: trả model như cũ. Từng route có thể ghi đè qua Projection(raw=...)
+    JSON_RAW_RESPONSES: bool = os.getenv("JSON_RAW_RESPONSES", "true").lower() == "true"
+
+    # Số câu mặc định của /api/course/test (ghi đè bằng ?size=)
+    COURSE_TEST_SIZE: int = int(os.getenv("COURSE_TEST_SIZE", "20"))
+    # Đáp án nhiễu của học / kiểm tra: "random" (ngẫu nhiên trong học phần) hoặc
+    # "similar" (chọn trong các định nghĩa gần nghĩa nhất, cần gói numpy). Index
+    # gần nghĩa dựng lần đầu rồi giữ trong LRU của từng worker theo ETag học phần
+    DISTRACTOR_MODE: str = os.getenv("DISTRACTOR_MODE", "random")
+    SIMILARITY_NEIGHBOURS: int = int(os.getenv("SIMILARITY_NEIGHBOURS", "10"))
+    SIMILARITY_INDEX_DIMENSIONS: int = int(
+        os.getenv("SIMILARITY_INDEX_DIMENSIONS", "512")
+    )
+    SIMILARITY_INDEX_MAX_ENTRIES: int = int(
+        os.getenv("SIMILARITY_INDEX_MAX_ENTRIES", "64")
+    )
+
+    # Tìm kiếm: "like" (ILIKE cũ), "memory" (inverted index trong process) hoặc
+    # "postgres" (pg_trgm + unaccent: chạy migrations/001_search_indexes.sql trước,
+    # thiếu hàm thì app không khởi động)
+    SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "like")
+    # Chu kỳ dựng lại index "memory" (giây), 0 để tắt
+    SEARCH_INDEX_REFRESH_SECONDS: int = int(
+        os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300")
+    )
+
+    # Pool học phần / bài kiểm tra ngẫu nhiên cho trang chủ (mỗi worker một pool)
+    RANDOM_POOL_SIZE: int = int(os.getenv("RANDOM_POOL_SIZE", "500"))
+    RANDOM_POOL_REFRESH_SECONDS: int = int(
+        os.getenv("RANDOM_POOL_REFRESH_SECONDS", "300")
+    )
+
+    # Chu kỳ đối soát courses.num_of_terms (giây), 0 để tắt
+    TERM_COUNT_RECONCILE_SECONDS: int = int(
+        os.getenv("TERM_COUNT_RECONCILE_SECONDS", "3600")
+    )
+
+    # Băm mật khẩu: số process băm của mỗi worker (0 = băm trên thread của request,
+    # mặc định chia đều số core cho các worker), số việc được chờ thêm trước khi
+    # trả 503
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv(
+            "PASSWORD_HASH_WORKERS",
+            str(max(1, (os.cpu_count() or 1) // max(WEB_CONCURRENCY, 1))),
+        )
+    )
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    # Scheme băm mật khẩu, phân cách bằng dấu phẩy: scheme đầu dùng cho hash mới,
+    # các scheme sau chỉ để xác thực hash cũ (được băm lại khi đăng nhập).
+    # Hỗ trợ bcrypt, argon2 (argon2id, cần gói argon2-cffi), scrypt.
+    # Chọn cost bằng: python calibrate_password_hash.py --target-ms 250
+    PASSWORD_HASH_SCHEMES: list = [
+        scheme.strip()
+        for scheme in os.getenv("PASSWORD_HASH_SCHEMES", "bcrypt").split(",")
+        if scheme.strip()
+    ]
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    SCRYPT_ROUNDS: int = int(os.getenv("SCRYPT_ROUNDS", "16"))  # log2(N)
+    SCRYPT_BLOCK_SIZE: int = int(os.getenv("SCRYPT_BLOCK_SIZE", "8"))
+    SCRYPT_PARALLELISM: int = int(os.getenv("SCRYPT_PARALLELISM", "1"))
+
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
+        os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    )
+    # Danh sách thu hồi access token (khoá / mở khoá / cấp quyền). Với CACHE_BACKEND=memory
+    # mỗi worker giữ một bản riêng: khi WEB_CONCURRENCY > 1 mỗi request đọc lại user
+    # từ DB, dùng redis để bỏ truy vấn đó
+    REVOCATION_MAX_ENTRIES: int = int(os.getenv("REVOCATION_MAX_ENTRIES", "100000"))
+    # Chu kỳ xoá refresh token hết hạn (giây, 0 để tắt) và số dòng xoá mỗi lô
+    REFRESH_TOKEN_SWEEP_SECONDS: int = int(
+        os.getenv("REFRESH_TOKEN_SWEEP_SECONDS", "3600")
+    )
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = int(
+        os.getenv("REFRESH_TOKEN_SWEEP_BATCH_SIZE", "1000")
+    )
 
     JWT_SECRET: str = os.getenv("JWT_SECRET").strip().encode('utf-8')
     JWT_REFRESH: str = os.getenv("JWT_REFRESH").strip().encode('utf-8')
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
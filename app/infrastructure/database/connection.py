@@ -1,22 +1,69 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from sqlalchemy.util.concurrency import greenlet_spawn
+from fastapi.concurrency import run_in_threadpool
+from typing import Generator, AsyncGenerator, AsyncIterator, Callable, Iterator, Any
 
 from app.infrastructure.config.setting import settings
+from app.infrastructure.database.pool_metrics import (
+    InstrumentedQueuePool,
+    InstrumentedAsyncAdaptedQueuePool,
+)
+
+
+def pool_options() -> dict:
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+
+    # Chia ngân sách kết nối của Postgres cho từng worker
+    if settings.DB_MAX_CONNECTIONS:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // settings.WEB_CONCURRENCY)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = max(0, per_worker - pool_size)
+
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # Tạo engine
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URL)
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    **pool_options(),
+)
 
 # Tạo session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine bất đồng bộ (asyncpg), chỉ tạo khi bật DB_ASYNC_MODE
+async_engine = (
+    create_async_engine(
+        settings.SQLALCHEMY_ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **pool_options(),
+    )
+    if settings.DB_ASYNC_MODE
+    else None
+)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if settings.DB_ASYNC_MODE
+    else None
+)
+
 # base model
 Base = declarative_base()
 
 
 # hàm dependency injection
-def get_db() -> Generator:
+def get_sync_db() -> Generator:
     db = SessionLocal()
     try:
         # 'yield' cung cấp session cho request
@@ -24,3 +71,46 @@ def get_db() -> Generator:
     finally:
         # đảm bảo session được đóng
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    db = AsyncSessionLocal()
+    try:
+        # Repository vẫn dùng Session đồng bộ, nhưng mọi I/O của nó được
+        # chuyển sang asyncpg khi chạy bên trong run_db (greenlet)
+        yield db.sync_session
+    finally:
+        await db.close()
+
+
+get_db = get_async_db if settings.DB_ASYNC_MODE else get_sync_db
+
+
+def get_pool_metrics() -> dict:
+    # Pool đang phục vụ request của worker hiện tại
+    pool = async_engine.sync_engine.pool if settings.DB_ASYNC_MODE else engine.pool
+    return pool.metrics.snapshot(pool)
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Chạy một lời gọi controller/service có truy cập DB từ route async.
+    - Chế độ async: chạy trong greenlet, I/O của SQLAlchemy được await trên event loop.
+    - Chế độ sync: đẩy sang threadpool như route `def` thông thường.
+    """
+    if settings.DB_ASYNC_MODE:
+        return await greenlet_spawn(func, *args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+async def stream_db(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """
+    Duyệt iterator có truy cập DB (vd. cursor phía server) cho response streaming:
+    mỗi bước next() chạy qua run_db như một lời gọi DB thông thường.
+    """
+    done = object()
+    while True:
+        item = await run_db(next, iterator, done)
+        if item is done:
+            return
+        yield item
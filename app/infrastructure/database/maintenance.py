@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.infrastructure.config.setting import settings
+from app.infrastructure.database.connection import SessionLocal, engine
+from app.infrastructure.database.repositories.course_repo import CoursesRepository
+from app.infrastructure.database.repositories.refresh_token_repo import (
+    RefreshTokenRepository,
+)
+from app.infrastructure.database.repositories.practice_test_repo import (
+    PracticeTestRepository,
+)
+from app.infrastructure.search.postgres_search_engine import verify_search_functions
+
+# Khoá advisory của các việc bảo trì định kỳ: mỗi chu kỳ chỉ một worker chạy
+TERM_COUNT_RECONCILE_LOCK = 7_100_001
+REFRESH_TOKEN_SWEEP_LOCK = 7_100_002
+
+# Kết quả lần quét refresh token gần nhất của worker này
+_refresh_token_sweep_stats: Dict = {
+    "runs": 0,
+    "last_run_at": None,
+    "last_duration_ms": None,
+    "last_deleted": 0,
+    "last_batches": 0,
+    "total_deleted": 0,
+    "table_rows": None,
+}
+
+
+@contextmanager
+def _exclusive_session(lock_key: int) -> Iterator[Optional[Session]]:
+    """
+    Session cho việc bảo trì khi giành được pg_try_advisory_lock(lock_key), None nếu
+    worker khác đang chạy. Session gắn cố định một kết nối để khoá mức session
+    được giữ qua các lần commit (quét theo lô commit nhiều lần).
+    """
+    with engine.connect() as conn:
+        locked = conn.execute(select(func.pg_try_advisory_lock(lock_key))).scalar()
+        conn.commit()
+        if not locked:
+            yield None
+            return
+        try:
+            with Session(bind=conn, autoflush=False) as db:
+                yield db
+        finally:
+            conn.rollback()
+            conn.execute(select(func.pg_advisory_unlock(lock_key)))
+            conn.commit()
+
+
+def check_search_backend():
+    db = SessionLocal()
+    try:
+        verify_search_functions(db)
+    finally:
+        db.close()
+
+
+def reconcile_course_term_counts():
+    with _exclusive_session(TERM_COUNT_RECONCILE_LOCK) as db:
+        if db is None:
+            return
+        fixed = CoursesRepository(db).reconcile_num_of_terms()
+    if fixed:
+        print(f"Đã đối soát num_of_terms cho {fixed} học phần")
+
+
+def sweep_expired_refresh_tokens():
+    with _exclusive_session(REFRESH_TOKEN_SWEEP_LOCK) as db:
+        if db is None:
+            return
+        repo = RefreshTokenRepository(db)
+        started = time.perf_counter()
+        deleted, batches = repo.delete_expired_tokens(
+            settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE
+        )
+        duration_ms = (time.perf_counter() - started) * 1000
+        table_rows = repo.count_tokens()
+
+    _refresh_token_sweep_stats.update(
+        runs=_refresh_token_sweep_stats["runs"] + 1,
+        last_run_at=datetime.now(timezone.utc),
+        last_duration_ms=round(duration_ms, 1),
+        last_deleted=deleted,
+        last_batches=batches,
+        total_deleted=_refresh_token_sweep_stats["total_deleted"] + deleted,
+        table_rows=table_rows,
+    )
+    if deleted:
+        print(f"Đã xoá {deleted} refresh token hết hạn ({batches} lô)")
+
+
+def write_submissions(submissions: List[Dict]):
+    # Thread ghi của SubmissionQueue: mỗi lô một session / transaction riêng
+    db = SessionLocal()
+    try:
+        PracticeTestRepository(db).insert_submissions(submissions)
+    finally:
+        db.close()
+
+
+def get_refresh_token_sweep_stats() -> Dict:
+    return dict(_refresh_token_sweep_stats)
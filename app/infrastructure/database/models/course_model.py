@@ -1,6 +1,7 @@
 from sqlalchemy import (
     Column,
     String,
+    Integer,
     DateTime,
     Text,
     ForeignKey,
@@ -18,6 +19,8 @@ class CourseModel(Base):
     course_id = Column(UUID(as_uuid=True), primary_key=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"))
     course_name = Column(String(255), nullable=False)
+    # Số thuật ngữ, cập nhật cùng transaction với course_details (xem migrations/002)
+    num_of_terms = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -33,7 +36,7 @@ class CourseDetailModel(Base):
     __tablename__ = "course_details"
 
     course_detail_id = Column(UUID(as_uuid=True), primary_key=True)
-    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.course_id"))
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.course_id"), index=True)
     term = Column(String(255), nullable=False)
     definition = Column(Text, nullable=False)
 
@@ -11,6 +11,8 @@ class RefreshTokenModel(Base):
 
     jti = Column(UUID(as_uuid=True), primary_key=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
+    # Các token sinh ra từ cùng một lần đăng nhập qua xoay vòng
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     issued_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
 
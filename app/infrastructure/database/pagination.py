@@ -0,0 +1,28 @@
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from typing import Any, List, Optional, Sequence, Tuple
+
+from app.application.pagination import PageRequest, encode_cursor
+
+
+def keyset_paginate(
+    query: Query, keys: Sequence[Any], page: PageRequest
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Phân trang keyset giảm dần theo keys (cột sắp xếp, cột cuối là id để thứ tự ổn định).
+    Lấy dư 1 dòng để biết còn trang sau; trả về (các dòng của trang, next_cursor).
+    Dòng trả về phải đọc được thuộc tính theo key của từng cột.
+    """
+    if page.after is not None:
+        if len(keys) == 1:
+            query = query.filter(keys[0] < page.after[0])
+        else:
+            query = query.filter(tuple_(*keys) < tuple_(*page.after))
+
+    rows = query.order_by(*(key.desc() for key in keys)).limit(page.limit + 1).all()
+    if len(rows) <= page.limit:
+        return rows, None
+
+    rows = rows[: page.limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, key.key) for key in keys])
@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+from typing import Dict, Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    # Số liệu lấy kết nối của pool trong một worker (process) uvicorn
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def record_checkout(self, pool: QueuePool, waited: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, pool.overflow(), 0)
+
+    def record_timeout(self, waited: float):
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "pid": os.getpid(),
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.total_wait / attempts * 1000 if attempts else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool có đo thời gian chờ lấy kết nối
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(self, time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update, insert
 from uuid import UUID
-from typing import List, Optional, TypedDict
+from uuid6 import uuid7
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple, TypedDict
 
 from app.domain.entities.course.course_entity import (
     Course,
@@ -21,50 +23,78 @@ from app.domain.exceptions.course_exception import (
 )
 from app.domain.exceptions.user_exceptions import UserNotFoundErrorDomain
 
-from app.application.abstractions.course_abstraction import ICourseRepository
+from app.application.abstractions.course_abstraction import (
+    ICourseRepository,
+    CourseHeaderResponse,
+)
+from app.application.pagination import Page, PageRequest
 
 from app.infrastructure.database.models.course_model import (
     CourseModel,
     CourseDetailModel,
 )
 from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.pagination import keyset_paginate
+from app.infrastructure.database.sampling import OVERSAMPLE, pick, sampled_entity
+from app.infrastructure.cache.payload_cache import invalidate_course
+from app.infrastructure.cache.random_pool import random_course_pool
+from app.infrastructure.search.memory_search_engine import memory_search_engine
+from app.infrastructure.config.setting import settings
 
 
 class CourseWithDetails(TypedDict):
     course: CourseOutput
     course_detail: List[CourseDetailOutput]
+    updated_at: datetime
 
 
 class CoursesRepository(ICourseRepository):
     def __init__(self, db: Session):
         self.db = db
 
-    def get_courses_by_user_id(self, user_id: UUID) -> List[CourseOutput]:
-        user_courses = (
+    def _touch_course(self, course_id: UUID, term_delta: int = 0):
+        # Đổi updated_at để ETag / snapshot cache của học phần thay đổi theo,
+        # đồng thời cộng dồn num_of_terms trong cùng transaction
+        values = {CourseModel.updated_at: datetime.utcnow()}
+        if term_delta:
+            values[CourseModel.num_of_terms] = CourseModel.num_of_terms + term_delta
+        self.db.query(CourseModel).filter(CourseModel.course_id == course_id).update(
+            values, synchronize_session=False
+        )
+
+    def sync_search_index(self, course_id: UUID):
+        # Cập nhật index tìm kiếm trong process (chỉ khi SEARCH_BACKEND=memory)
+        if settings.SEARCH_BACKEND != "memory":
+            return
+        try:
+            result = self.get_course_detail_by_id(course_id)
+            memory_search_engine.index_course(
+                result.get("course"), result.get("course_detail")
+            )
+        except CoursesNotFoundErrorDomain:
+            memory_search_engine.remove_course(course_id)
+
+    def get_courses_by_user_id(
+        self, user_id: UUID, page: PageRequest = PageRequest()
+    ) -> Page[CourseOutput]:
+        query = (
             self.db.query(
                 CourseModel.course_id,
                 CourseModel.course_name,
                 UserModel.username,
                 UserModel.avatar_url,
                 UserModel.role,
-                func.count(CourseDetailModel.course_detail_id).label("num_of_terms"),
+                CourseModel.num_of_terms,
             )
             .join(UserModel, CourseModel.course_user)
-            .join(CourseDetailModel, CourseModel.course_detail)
             .filter(CourseModel.user_id == user_id)
-            .filter(CourseDetailModel.course_id == CourseModel.course_id)
-            .group_by(
-                CourseModel.course_id,
-                CourseModel.course_name,
-                UserModel.username,
-                UserModel.avatar_url,
-                UserModel.role,
-            )
-            .all()
         )
-        if not user_courses:
+        user_courses, next_cursor = keyset_paginate(
+            query, [CourseModel.course_id], page
+        )
+        if not user_courses and page.after is None:
             raise CoursesNotFoundErrorDomain("Người dùng không có học phần")
-        return [
+        items = [
             CourseOutput(
                 course_id=course.course_id,
                 course_name=course.course_name,
@@ -75,9 +105,10 @@ class CoursesRepository(ICourseRepository):
             )
             for course in user_courses
         ]
+        return Page(items=items, next_cursor=next_cursor)
 
     def get_courses_by_keyword(
-        self, keyword: str, cursor_id: Optional[str] = None
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
     ) -> List[CourseOutput]:
         try:
             query = (
@@ -87,16 +118,10 @@ class CoursesRepository(ICourseRepository):
                     UserModel.avatar_url,
                     UserModel.username,
                     UserModel.role,
-                    func.count(CourseDetailModel.course_detail_id).label(
-                        "num_of_terms"
-                    ),
+                    CourseModel.num_of_terms,
                 )
                 .filter(CourseModel.course_name.ilike(f"%{keyword}%"))
                 .join(UserModel, CourseModel.user_id == UserModel.user_id)
-                .join(
-                    CourseDetailModel,
-                    CourseModel.course_id == CourseDetailModel.course_id,
-                )
             )
 
             if cursor_id:
@@ -104,17 +129,7 @@ class CoursesRepository(ICourseRepository):
 
             query = query.order_by(CourseModel.course_id.desc())
 
-            db_results = (
-                query.group_by(
-                    CourseModel.course_id,
-                    UserModel.avatar_url,
-                    UserModel.username,
-                    UserModel.role,
-                    CourseModel.course_name,
-                )
-                .limit(12)
-                .all()
-            )
+            db_results = query.limit(limit).all()
 
             domain_results: List[CourseOutput] = []
             for row in db_results:
@@ -135,50 +150,38 @@ class CoursesRepository(ICourseRepository):
             print("Có lỗi xảy ra khi tìm kiếm học phần", e)
             return []
 
-    def get_random_courses(self) -> List[CourseOutput]:
-        try:
-            query = (
-                self.db.query(
-                    CourseModel.course_id,
-                    CourseModel.course_name,
-                    UserModel.avatar_url,
-                    UserModel.username,
-                    UserModel.role,
-                    func.count(CourseDetailModel.course_detail_id).label(
-                        "num_of_terms"
-                    ),
-                )
-                .join(UserModel, CourseModel.user_id == UserModel.user_id)
-                .join(
-                    CourseDetailModel,
-                    CourseModel.course_id == CourseDetailModel.course_id,
-                )
-                .group_by(
-                    CourseModel.course_id,
-                    UserModel.avatar_url,
-                    UserModel.username,
-                    UserModel.role,
-                    CourseModel.course_name,
-                )
-                .limit(3)
-                .all()
+    def _load_random_pool(self, size: int) -> List[CourseOutput]:
+        # Chỉ giới thiệu học phần đã có thuật ngữ
+        course = sampled_entity(self.db, CourseModel, size)
+        rows = (
+            self.db.query(
+                course.course_id,
+                course.course_name,
+                UserModel.avatar_url,
+                UserModel.username,
+                UserModel.role,
+                course.num_of_terms,
             )
+            .join(UserModel, course.user_id == UserModel.user_id)
+            .filter(course.num_of_terms > 0)
+            .limit(size * OVERSAMPLE)
+            .all()
+        )
+        return [
+            CourseOutput(
+                course_id=item.course_id,
+                course_name=item.course_name,
+                author_avatar_url=item.avatar_url,
+                author_username=item.username,
+                author_role=item.role,
+                num_of_terms=item.num_of_terms,
+            )
+            for item in pick(rows, size)
+        ]
 
-            domain_result: List[CourseOutput] = []
-            for item in query:
-                domain_result.append(
-                    CourseOutput(
-                        course_id=item.course_id,
-                        course_name=item.course_name,
-                        author_avatar_url=item.avatar_url,
-                        author_username=item.username,
-                        author_role=item.role,
-                        num_of_terms=item.num_of_terms,
-                    )
-                )
-
-            return domain_result
-
+    def get_random_courses(self) -> List[CourseOutput]:
+        try:
+            return random_course_pool.sample(3, self._load_random_pool)
         except Exception as e:
             print("Có lỗi xảy ra khi lấy học phần ngẫu nhiên", e)
             return []
@@ -203,6 +206,9 @@ class CoursesRepository(ICourseRepository):
             self.db.query(
                 CourseModel.course_id,
                 CourseModel.course_name,
+                func.coalesce(CourseModel.updated_at, CourseModel.created_at).label(
+                    "updated_at"
+                ),
                 UserModel.avatar_url,
                 UserModel.username,
                 UserModel.role,
@@ -244,10 +250,146 @@ class CoursesRepository(ICourseRepository):
             )
 
         return CourseWithDetails(
-            course=course_domain_result, course_detail=detail_domain_result
+            course=course_domain_result,
+            course_detail=detail_domain_result,
+            updated_at=course_query.updated_at,
+        )
+
+    def iter_course_search_documents(self, batch_size: int = 1000):
+        # Duyệt toàn bộ học phần theo lô (keyset theo course_id) để dựng index tìm kiếm
+        last_course_id = None
+        while True:
+            query = self.db.query(
+                CourseModel.course_id,
+                CourseModel.course_name,
+                UserModel.avatar_url,
+                UserModel.username,
+                UserModel.role,
+            ).join(UserModel, UserModel.user_id == CourseModel.user_id)
+            if last_course_id:
+                query = query.filter(CourseModel.course_id > last_course_id)
+            courses = query.order_by(CourseModel.course_id).limit(batch_size).all()
+            if not courses:
+                return
+
+            details_by_course = {}
+            for item in (
+                self.db.query(
+                    CourseDetailModel.course_id,
+                    CourseDetailModel.course_detail_id,
+                    CourseDetailModel.term,
+                    CourseDetailModel.definition,
+                )
+                .filter(
+                    CourseDetailModel.course_id.in_(
+                        [course.course_id for course in courses]
+                    )
+                )
+                .all()
+            ):
+                details_by_course.setdefault(item.course_id, []).append(
+                    CourseDetailOutput(
+                        course_detail_id=item.course_detail_id,
+                        term=item.term,
+                        definition=item.definition,
+                    )
+                )
+
+            for course in courses:
+                details = details_by_course.get(course.course_id, [])
+                yield CourseOutput(
+                    course_id=course.course_id,
+                    course_name=course.course_name,
+                    author_avatar_url=course.avatar_url,
+                    author_username=course.username,
+                    author_role=course.role,
+                    num_of_terms=len(details),
+                ), details
+
+            last_course_id = courses[-1].course_id
+
+    def reconcile_num_of_terms(self) -> int:
+        # Đối soát num_of_terms với số dòng thực tế trong course_details
+        counts = (
+            select(
+                CourseDetailModel.course_id,
+                func.count(CourseDetailModel.course_detail_id).label("num_of_terms"),
+            )
+            .group_by(CourseDetailModel.course_id)
+            .subquery()
+        )
+        actual = func.coalesce(counts.c.num_of_terms, 0)
+        drifted = (
+            select(CourseModel.course_id, actual.label("num_of_terms"))
+            .outerjoin(counts, counts.c.course_id == CourseModel.course_id)
+            .where(CourseModel.num_of_terms != actual)
+            .subquery()
         )
+        try:
+            fixed_ids = (
+                self.db.execute(
+                    update(CourseModel)
+                    .where(CourseModel.course_id == drifted.c.course_id)
+                    .values(num_of_terms=drifted.c.num_of_terms)
+                    .returning(CourseModel.course_id)
+                )
+                .scalars()
+                .all()
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print("Lỗi khi đối soát số thuật ngữ của học phần", e)
+            raise e
+
+        for course_id in fixed_ids:
+            invalidate_course(course_id)
+        return len(fixed_ids)
 
     # Thêm
+    def _insert_course_with_details(
+        self,
+        new_course_domain: Course,
+        detail_in: Iterable[CreateNewCourseDetailInput],
+        chunk_size: int,
+    ) -> int:
+        # Học phần và toàn bộ thuật ngữ nằm trong cùng một transaction (commit ở nơi
+        # gọi). Thuật ngữ được ghi bằng executemany theo từng khối chunk_size dòng,
+        # detail_in có thể là generator đọc dần từ file
+        new_course_model = CourseModel(
+            course_id=new_course_domain.course_id,
+            user_id=new_course_domain.user_id,
+            course_name=new_course_domain.course_name,
+            num_of_terms=0,
+            created_at=new_course_domain.created_at,
+            updated_at=new_course_domain.updated_at,
+        )
+        self.db.add(new_course_model)
+        self.db.flush()
+
+        num_of_terms = 0
+        rows = []
+        for detail in detail_in:
+            CourseDetail.validate_content(detail.term, detail.definition)
+            rows.append(
+                {
+                    "course_detail_id": uuid7(),
+                    "course_id": new_course_domain.course_id,
+                    "term": detail.term,
+                    "definition": detail.definition,
+                }
+            )
+            if len(rows) >= chunk_size:
+                self.db.execute(insert(CourseDetailModel), rows)
+                num_of_terms += len(rows)
+                rows = []
+        if rows:
+            self.db.execute(insert(CourseDetailModel), rows)
+            num_of_terms += len(rows)
+
+        new_course_model.num_of_terms = num_of_terms
+        return num_of_terms
+
     def create_new_course(
         self,
         course_in: CreateNewCourseInput,
@@ -256,15 +398,6 @@ class CoursesRepository(ICourseRepository):
         new_course_domain = Course.create_new_course(
             course_name=course_in.course_name, user_id=course_in.user_id
         )
-        new_course_detail_domain: List[CourseDetail] = []
-        for detail in detail_in:
-            new_course_detail_domain.append(
-                CourseDetail.create_new_course_detail(
-                    course_id=new_course_domain.course_id,
-                    term=detail.term,
-                    definition=detail.definition,
-                )
-            )
 
         current_user = (
             self.db.query(UserModel.avatar_url, UserModel.username, UserModel.role)
@@ -276,42 +409,89 @@ class CoursesRepository(ICourseRepository):
             raise UserNotFoundErrorDomain("Không tồn tại người dùng")
 
         try:
-            new_course_model = CourseModel(
-                course_id=new_course_domain.course_id,
-                user_id=new_course_domain.user_id,
-                course_name=new_course_domain.course_name,
-                created_at=new_course_domain.created_at,
-                updated_at=new_course_domain.updated_at,
+            self._insert_course_with_details(
+                new_course_domain, detail_in, settings.DB_CHUNK_SIZE
             )
-
-            self.db.add(new_course_model)
             self.db.commit()
-            self.db.refresh(new_course_model)
         except Exception as e:
             self.db.rollback()
             print("Lỗi xảy ra khi thêm course")
             raise e
 
-        try:
-            new_detail_model: List[CourseDetailModel] = []
-            for detail_domain in new_course_detail_domain:
-                new_detail_model.append(
-                    CourseDetailModel(
-                        course_detail_id=detail_domain.course_detail_id,
-                        course_id=detail_domain.course_id,
-                        term=detail_domain.term,
-                        definition=detail_domain.definition,
-                    )
-                )
+        self.sync_search_index(new_course_domain.course_id)
+        return True
 
-            self.db.add_all(new_detail_model)
+    def import_course(
+        self,
+        course_in: CreateNewCourseInput,
+        detail_in: Iterable[CreateNewCourseDetailInput],
+    ) -> Tuple[UUID, int]:
+        new_course_domain = Course.create_new_course(
+            course_name=course_in.course_name, user_id=course_in.user_id
+        )
+        try:
+            num_of_terms = self._insert_course_with_details(
+                new_course_domain, detail_in, settings.DB_CHUNK_SIZE
+            )
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            print("Lỗi xảy ra khi thêm course detail")
+            print("Lỗi khi nhập học phần từ file", e)
             raise e
 
-        return True
+        self.sync_search_index(new_course_domain.course_id)
+        return new_course_domain.course_id, num_of_terms
+
+    def get_course_header(self, course_id: UUID) -> CourseHeaderResponse:
+        course_query = (
+            self.db.query(
+                CourseModel.course_id,
+                CourseModel.course_name,
+                CourseModel.num_of_terms,
+                func.coalesce(CourseModel.updated_at, CourseModel.created_at).label(
+                    "updated_at"
+                ),
+                UserModel.avatar_url,
+                UserModel.username,
+                UserModel.role,
+            )
+            .filter(CourseModel.course_id == course_id)
+            .join(UserModel, UserModel.user_id == CourseModel.user_id)
+            .first()
+        )
+        if not course_query:
+            raise CoursesNotFoundErrorDomain(f"Không tồn tại học phần {course_id}")
+
+        return CourseHeaderResponse(
+            course=CourseOutput(
+                course_id=course_query.course_id,
+                course_name=course_query.course_name,
+                author_avatar_url=course_query.avatar_url,
+                author_username=course_query.username,
+                author_role=course_query.role,
+                num_of_terms=course_query.num_of_terms,
+            ),
+            updated_at=course_query.updated_at,
+        )
+
+    def iter_course_details(self, course_id: UUID) -> Iterator[CourseDetailOutput]:
+        # Cursor phía server: mỗi lần chỉ giữ DB_CHUNK_SIZE dòng trong bộ nhớ
+        result = self.db.execute(
+            select(
+                CourseDetailModel.course_detail_id,
+                CourseDetailModel.term,
+                CourseDetailModel.definition,
+            )
+            .where(CourseDetailModel.course_id == course_id)
+            .order_by(CourseDetailModel.course_detail_id)
+            .execution_options(yield_per=settings.DB_CHUNK_SIZE)
+        )
+        for row in result:
+            yield CourseDetailOutput(
+                course_detail_id=row.course_detail_id,
+                term=row.term,
+                definition=row.definition,
+            )
 
     # Sửa
     def create_new_course_detail(
@@ -330,11 +510,13 @@ class CoursesRepository(ICourseRepository):
 
         try:
             self.db.add(new_detail_model)
+            self._touch_course(course_id, term_delta=1)
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             print("Lỗi khi thêm mới trong quá trình chỉnh sửa", e)
             raise e
+        invalidate_course(course_id)
 
     def update_course_detail(self, course_id: UUID, detail_in: UpdateCourseDetailInput):
         try:
@@ -352,12 +534,14 @@ class CoursesRepository(ICourseRepository):
 
             detail.term = detail_in.term
             detail.definition = detail_in.definition
+            self._touch_course(course_id)
 
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             print(f"Lỗi trong quá trình cập nhật chi tiết học phần: {e}")
             raise e
+        invalidate_course(course_id)
 
     def update_course(self, course_id: UUID, course_in: UpdateCourseInput):
         try:
@@ -371,23 +555,29 @@ class CoursesRepository(ICourseRepository):
                 raise CoursesNotFoundErrorDomain("Không tồn tại học phần cần cập nhật")
 
             current_course.course_name = course_in.course_name
+            current_course.updated_at = datetime.utcnow()
 
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             print("Lỗi khi cập nhật tên học phần", e)
             raise e
+        invalidate_course(course_id)
 
     def delete_course_detail(self, course_id: UUID, course_detail_id: List[UUID]):
         print(course_id, course_detail_id)
         try:
-            self.db.query(CourseDetailModel).filter(
-                CourseDetailModel.course_id == course_id
-            ).filter(CourseDetailModel.course_detail_id.in_(course_detail_id)).delete(
-                synchronize_session=False
+            deleted = (
+                self.db.query(CourseDetailModel)
+                .filter(CourseDetailModel.course_id == course_id)
+                .filter(CourseDetailModel.course_detail_id.in_(course_detail_id))
+                .delete(synchronize_session=False)
             )
+            self._touch_course(course_id, term_delta=-deleted)
 
             self.db.commit()
+            invalidate_course(course_id)
+            self.sync_search_index(course_id)
             return True
         except Exception as e:
             self.db.rollback()
@@ -407,6 +597,9 @@ class CoursesRepository(ICourseRepository):
 
             self.db.delete(current_course)
             self.db.commit()
+            invalidate_course(course_id)
+            self.sync_search_index(course_id)
+            random_course_pool.discard(lambda course: course.course_id == course_id)
             return True
         except Exception as e:
             self.db.rollback()
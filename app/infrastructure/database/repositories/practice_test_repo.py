@@ -1,7 +1,11 @@
 from sqlalchemy.orm import Session, selectinload, load_only
-from sqlalchemy import func, tuple_, asc
-from typing import List, Optional
+from sqlalchemy import func, tuple_, asc, select, text, literal_column, insert
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional
 from uuid import UUID
+from uuid6 import uuid7
 from dataclasses import dataclass
 
 from app.domain.entities.practice_test.practice_test_entity import (
@@ -40,7 +44,6 @@ from app.domain.entities.practice_test.practice_test_histories import (
     PracticeTestHistory,
     HistoryInput,
     HistoryOutput,
-    QuestionHistory,
 )
 
 
@@ -52,11 +55,20 @@ from app.infrastructure.database.models.practice_test_model import (
     PracticeTestHistoryModel,
 )
 from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.pagination import keyset_paginate
+from app.infrastructure.database.sampling import OVERSAMPLE, pick, sampled_entity
 from app.infrastructure.mappers import Mapper
+from app.infrastructure.config.setting import settings
+from app.infrastructure.cache.payload_cache import invalidate_practice_test
+from app.infrastructure.cache.random_pool import random_practice_test_pool
+from app.infrastructure.search.memory_search_engine import memory_search_engine
+from app.infrastructure.database.submission_queue import SubmissionQueue
 
 from app.application.abstractions.practice_test_abstraction import (
     IPracticeTestRepository,
 )
+from app.application.pagination import Page, PageRequest
+from app.application.grading_engine import AnswerKey, QuestionKey
 
 
 @dataclass(frozen=True)
@@ -94,8 +106,61 @@ class PracticeTestRepository(IPracticeTestRepository):
     def __init__(self, db: Session):
         self.db = db
 
-    def get_practice_tests_by_user_id(self, user_id: UUID) -> List[PracticeTestOutput]:
-        practice_tests = (
+    def _search_documents_query(self):
+        return self.db.query(
+            PracticeTestModel.practice_test_id,
+            PracticeTestModel.practice_test_name,
+            UserModel.avatar_url,
+            UserModel.username,
+        ).join(UserModel, UserModel.user_id == PracticeTestModel.user_id)
+
+    @staticmethod
+    def _to_search_document(row) -> PracticeTestOutput:
+        return PracticeTestOutput(
+            practice_test_id=row.practice_test_id,
+            practice_test_name=row.practice_test_name,
+            author_avatar_url=row.avatar_url,
+            author_username=row.username,
+        )
+
+    def _sync_search_index(self, practice_test_id: UUID):
+        # Cập nhật index tìm kiếm trong process (chỉ khi SEARCH_BACKEND=memory)
+        if settings.SEARCH_BACKEND != "memory":
+            return
+        row = (
+            self._search_documents_query()
+            .filter(PracticeTestModel.practice_test_id == practice_test_id)
+            .first()
+        )
+        if row:
+            memory_search_engine.index_practice_test(self._to_search_document(row))
+        else:
+            memory_search_engine.remove_practice_test(practice_test_id)
+
+    def iter_practice_test_search_documents(self, batch_size: int = 1000):
+        # Duyệt toàn bộ bài kiểm tra theo lô (keyset theo id) để dựng index tìm kiếm
+        last_practice_test_id = None
+        while True:
+            query = self._search_documents_query()
+            if last_practice_test_id:
+                query = query.filter(
+                    PracticeTestModel.practice_test_id > last_practice_test_id
+                )
+            rows = (
+                query.order_by(PracticeTestModel.practice_test_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_search_document(row)
+            last_practice_test_id = rows[-1].practice_test_id
+
+    def get_practice_tests_by_user_id(
+        self, user_id: UUID, page: PageRequest = PageRequest()
+    ) -> Page[PracticeTestOutput]:
+        query = (
             self.db.query(
                 PracticeTestModel.practice_test_id,
                 PracticeTestModel.practice_test_name,
@@ -104,11 +169,13 @@ class PracticeTestRepository(IPracticeTestRepository):
             )
             .join(UserModel, PracticeTestModel.practice_test_user)
             .filter(PracticeTestModel.user_id == user_id)
-            .all()
         )
-        if not practice_tests:
+        practice_tests, next_cursor = keyset_paginate(
+            query, [PracticeTestModel.practice_test_id], page
+        )
+        if not practice_tests and page.after is None:
             raise PracticeTestsNotFoundErrorDomain("Người dùng không có bài kiểm tra")
-        return [
+        items = [
             PracticeTestOutput(
                 practice_test_id=practice_test.practice_test_id,
                 practice_test_name=practice_test.practice_test_name,
@@ -117,9 +184,10 @@ class PracticeTestRepository(IPracticeTestRepository):
             )
             for practice_test in practice_tests
         ]
+        return Page(items=items, next_cursor=next_cursor)
 
     def get_practice_tests_by_keyword(
-        self, keyword: str, cursor_id: Optional[str] = None
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
     ) -> List[PracticeTestOutput]:
         try:
             query = (
@@ -136,9 +204,9 @@ class PracticeTestRepository(IPracticeTestRepository):
             if cursor_id:
                 query = query.filter(PracticeTestModel.practice_test_id < cursor_id)
 
-            query = query.order_by(PracticeTestModel.practice_test_id)
+            query = query.order_by(PracticeTestModel.practice_test_id.desc())
 
-            db_results = query.limit(12).all()
+            db_results = query.limit(limit).all()
 
             domain_results: List[PracticeTestOutput] = []
             for row in db_results:
@@ -156,34 +224,42 @@ class PracticeTestRepository(IPracticeTestRepository):
             print("Error occurred when query practice test", e)
             return []
 
-    def get_random_practice_test(self) -> List[PracticeTestOutput]:
-        try:
-            query = (
-                self.db.query(
-                    PracticeTestModel.practice_test_id,
-                    PracticeTestModel.practice_test_name,
-                    UserModel.username.label("author_username"),
-                    UserModel.avatar_url.label("author_avatar_url"),
-                )
-                .join(UserModel, UserModel.user_id == PracticeTestModel.user_id)
-                .order_by(func.random())
-                .limit(3)
-                .all()
+    def _load_random_pool(self, size: int) -> List[PracticeTestOutput]:
+        # Chỉ giới thiệu bài kiểm tra đã có câu hỏi
+        practice_test = sampled_entity(self.db, PracticeTestModel, size)
+        has_question = (
+            select(PracticeTestQuestionModel.question_id)
+            .where(
+                PracticeTestQuestionModel.practice_test_id
+                == practice_test.practice_test_id
             )
+            .exists()
+        )
+        rows = (
+            self.db.query(
+                practice_test.practice_test_id,
+                practice_test.practice_test_name,
+                UserModel.username.label("author_username"),
+                UserModel.avatar_url.label("author_avatar_url"),
+            )
+            .join(UserModel, UserModel.user_id == practice_test.user_id)
+            .filter(has_question)
+            .limit(size * OVERSAMPLE)
+            .all()
+        )
+        return [
+            PracticeTestOutput(
+                practice_test_id=item.practice_test_id,
+                practice_test_name=item.practice_test_name,
+                author_avatar_url=item.author_avatar_url,
+                author_username=item.author_username,
+            )
+            for item in pick(rows, size)
+        ]
 
-            domain_result: List[PracticeTestOutput] = []
-            for item in query:
-                domain_result.append(
-                    PracticeTestOutput(
-                        practice_test_id=item.practice_test_id,
-                        practice_test_name=item.practice_test_name,
-                        author_avatar_url=item.author_avatar_url,
-                        author_username=item.author_username,
-                    )
-                )
-
-            return domain_result
-
+    def get_random_practice_test(self) -> List[PracticeTestOutput]:
+        try:
+            return random_practice_test_pool.sample(3, self._load_random_pool)
         except Exception as e:
             print("Có lỗi xảy ra khi lấy bài kiểm tra thử ngẫu nhiên", e)
             return []
@@ -205,6 +281,184 @@ class PracticeTestRepository(IPracticeTestRepository):
 
     def get_practice_test_detail_by_id(
         self, practice_test_id: str
+    ) -> PraceticeTestWithDetailsResponse:
+        if settings.PRACTICE_TEST_DETAIL_MODE == "json":
+            return self._get_practice_test_detail_json(practice_test_id)
+        return self._get_practice_test_detail_orm(practice_test_id)
+
+    def get_practice_test_base_info(self, practice_test_id: UUID) -> PracticeTestOutput:
+        test_query = (
+            self.db.query(
+                PracticeTestModel.practice_test_id,
+                PracticeTestModel.practice_test_name,
+                UserModel.username.label("author_username"),
+                UserModel.avatar_url.label("author_avatar_url"),
+            )
+            .filter(PracticeTestModel.practice_test_id == practice_test_id)
+            .join(UserModel, UserModel.user_id == PracticeTestModel.user_id)
+        ).first()
+
+        if not test_query:
+            raise PracticeTestsNotFoundErrorDomain(
+                f"Không tồn tại bài kiểm tra {practice_test_id}"
+            )
+
+        return PracticeTestOutput(
+            practice_test_id=test_query.practice_test_id,
+            practice_test_name=test_query.practice_test_name,
+            author_avatar_url=test_query.author_avatar_url,
+            author_username=test_query.author_username,
+        )
+
+    def iter_practice_test_questions(
+        self, practice_test_id: UUID
+    ) -> Iterator[QuestionDetailOutput]:
+        # Một câu truy vấn câu hỏi LEFT JOIN đáp án, đọc qua cursor phía server theo
+        # thứ tự câu hỏi; các dòng liên tiếp cùng question_id gộp thành một câu hỏi
+        result = self.db.execute(
+            select(
+                PracticeTestQuestionModel.question_id,
+                PracticeTestQuestionModel.question_text,
+                PracticeTestQuestionModel.question_type,
+                AnswerOptionModel.option_id,
+                AnswerOptionModel.option_text,
+                AnswerOptionModel.is_correct,
+            )
+            .outerjoin(
+                AnswerOptionModel,
+                AnswerOptionModel.question_id == PracticeTestQuestionModel.question_id,
+            )
+            .where(PracticeTestQuestionModel.practice_test_id == practice_test_id)
+            .order_by(
+                PracticeTestQuestionModel.question_id, AnswerOptionModel.option_id
+            )
+            .execution_options(yield_per=settings.DB_CHUNK_SIZE)
+        )
+        for _, rows in groupby(result, key=lambda row: row.question_id):
+            rows = list(rows)
+            yield QuestionDetailOutput(
+                question=QuestionOutput(
+                    question_id=rows[0].question_id,
+                    question_text=rows[0].question_text,
+                    question_type=rows[0].question_type,
+                ),
+                options=[
+                    AnswerOptionOutput(
+                        option_id=row.option_id,
+                        option_text=row.option_text,
+                        is_correct=row.is_correct,
+                    )
+                    for row in rows
+                    if row.option_id is not None
+                ],
+            )
+
+    def _get_practice_test_detail_json(
+        self, practice_test_id: str
+    ) -> PraceticeTestWithDetailsResponse:
+        # Toàn bộ bài kiểm tra (thông tin, câu hỏi, câu trả lời) trong 1 câu SQL
+        options_json = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.jsonb_build_object(
+                                literal_column("'option_id'"),
+                                AnswerOptionModel.option_id,
+                                literal_column("'option_text'"),
+                                AnswerOptionModel.option_text,
+                                literal_column("'is_correct'"),
+                                AnswerOptionModel.is_correct,
+                            ),
+                            AnswerOptionModel.option_id,
+                        )
+                    ),
+                    text("'[]'::json"),
+                )
+            )
+            .where(
+                AnswerOptionModel.question_id == PracticeTestQuestionModel.question_id
+            )
+            .correlate(PracticeTestQuestionModel)
+            .scalar_subquery()
+        )
+
+        questions_json = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.jsonb_build_object(
+                                literal_column("'question_id'"),
+                                PracticeTestQuestionModel.question_id,
+                                literal_column("'question_text'"),
+                                PracticeTestQuestionModel.question_text,
+                                literal_column("'question_type'"),
+                                PracticeTestQuestionModel.question_type,
+                                literal_column("'options'"),
+                                options_json,
+                            ),
+                            PracticeTestQuestionModel.question_id,
+                        )
+                    ),
+                    text("'[]'::json"),
+                    type_=JSON,
+                )
+            )
+            .where(
+                PracticeTestQuestionModel.practice_test_id
+                == PracticeTestModel.practice_test_id
+            )
+            .correlate(PracticeTestModel)
+            .scalar_subquery()
+        )
+
+        test_query = self.db.execute(
+            select(
+                PracticeTestModel.practice_test_id,
+                PracticeTestModel.practice_test_name,
+                UserModel.username.label("author_username"),
+                UserModel.avatar_url.label("author_avatar_url"),
+                questions_json.label("questions"),
+            )
+            .join(UserModel, UserModel.user_id == PracticeTestModel.user_id)
+            .where(PracticeTestModel.practice_test_id == practice_test_id)
+        ).first()
+
+        if not test_query:
+            raise PracticeTestsNotFoundErrorDomain(
+                f"Không tồn tại bài kiểm tra {practice_test_id}"
+            )
+
+        return PraceticeTestWithDetailsResponse(
+            base_info=PracticeTestOutput(
+                practice_test_id=test_query.practice_test_id,
+                practice_test_name=test_query.practice_test_name,
+                author_avatar_url=test_query.author_avatar_url,
+                author_username=test_query.author_username,
+            ),
+            questions=[
+                QuestionDetailOutput(
+                    question=QuestionOutput(
+                        question_id=UUID(question["question_id"]),
+                        question_text=question["question_text"],
+                        question_type=question["question_type"],
+                    ),
+                    options=[
+                        AnswerOptionOutput(
+                            option_id=UUID(option["option_id"]),
+                            option_text=option["option_text"],
+                            is_correct=option["is_correct"],
+                        )
+                        for option in question["options"]
+                    ],
+                )
+                for question in test_query.questions
+            ],
+        )
+
+    def _get_practice_test_detail_orm(
+        self, practice_test_id: str
     ) -> PraceticeTestWithDetailsResponse:
         test_query = (
             self.db.query(
@@ -344,8 +598,10 @@ class PracticeTestRepository(IPracticeTestRepository):
             base_info=base_info_domain, questions=questions_domain
         )
 
-    def get_all_histories(self, user_id: UUID):
-        result_query = (
+    def get_all_histories(
+        self, user_id: UUID, page: PageRequest = PageRequest()
+    ) -> Page[ResultWithPracticeTest]:
+        query = (
             self.db.query(PracticeTestResultModel)
             .filter(PracticeTestResultModel.user_id == user_id)
             .options(
@@ -360,7 +616,10 @@ class PracticeTestRepository(IPracticeTestRepository):
                     UserModel.username,
                 )
             )
-            .all()
+        )
+        # result_id là UUIDv7 nên sắp theo id cũng là mới nhất trước
+        result_query, next_cursor = keyset_paginate(
+            query, [PracticeTestResultModel.result_id], page
         )
 
         result_with_test_domain: List[ResultWithPracticeTest] = []
@@ -385,7 +644,7 @@ class PracticeTestRepository(IPracticeTestRepository):
                     result=result_domain, base_info=practice_test_domain
                 )
             )
-        return result_with_test_domain
+        return Page(items=result_with_test_domain, next_cursor=next_cursor)
 
     def get_practice_test_history(
         self, user_id: UUID, result_id: UUID, practice_test_id: UUID
@@ -444,54 +703,44 @@ class PracticeTestRepository(IPracticeTestRepository):
             author_username=practice_test_query.author_username,
         )
 
-        history_domain: List[QuestionHistory] = []
+        # Câu hỏi nhiều lựa chọn có nhiều dòng lịch sử: gộp option_id theo câu hỏi
+        history_domain: Dict[UUID, HistoryOutput] = {}
         for history in history_query:
-            existing_question = next(
-                (
-                    item
-                    for item in history_domain
-                    if item.question_id == history.question_id
-                ),
-                None,
-            )
-
+            existing_question = history_domain.get(history.question_id)
             if existing_question:
-                existing_question.history.option_id.append(history.option_id)
+                existing_question.option_id.append(history.option_id)
                 continue
 
-            options_domain = [
-                AnswerOptionOutput(
-                    option_id=opt.option_id,
-                    option_text=opt.option_text,
-                    is_correct=opt.is_correct,
-                )
-                for opt in history.history_question.question_anwser_opt
-            ]
-
-            question_domain = QuestionWithOptionsOutput(
-                question_id=history.history_question.question_id,
-                question_text=history.history_question.question_text,
-                question_type=history.history_question.question_type,
-                options=options_domain,
-            )
-
-            history_item = HistoryOutput(
+            question = history.history_question
+            history_domain[history.question_id] = HistoryOutput(
                 history_id=history.history_id,
                 option_id=[history.option_id],
-                question_detail=question_domain,
-            )
-
-            history_domain.append(
-                QuestionHistory(question_id=history.question_id, history=history_item)
+                question_detail=QuestionWithOptionsOutput(
+                    question=QuestionOutput(
+                        question_id=question.question_id,
+                        question_text=question.question_text,
+                        question_type=question.question_type,
+                    ),
+                    options=[
+                        AnswerOptionOutput(
+                            option_id=opt.option_id,
+                            option_text=opt.option_text,
+                            is_correct=opt.is_correct,
+                        )
+                        for opt in question.question_anwser_opt
+                    ],
+                ),
             )
 
         return ResultWithHistory(
             result=result_domain,
             base_info=practice_test_domain,
-            histories=history_domain,
+            histories=list(history_domain.values()),
         )
 
     def create_new_practice_test(self, payload: NewPracticeTestInput):
+        if len(payload.questions) >= settings.PRACTICE_TEST_BULK_INSERT_THRESHOLD:
+            return self._bulk_create_practice_test(payload)
         try:
             # Thêm thông tin cơ bản
             new_practice_test_domain: PracticeTest = Mapper.new_practice_test_domain(
@@ -523,39 +772,153 @@ class PracticeTestRepository(IPracticeTestRepository):
                 new_questions_model.append(new_question_model)
             self.db.add_all(new_questions_model)
             self.db.commit()
+            self._sync_search_index(new_practice_test_domain.practice_test_id)
             return True
         except Exception as e:
             print("Lỗi khi thêm bài kiểm tra thử mới", e)
             self.db.rollback()
             raise e
 
-    def submit_test(
-        self, user_id: UUID, result: ResultInput, histories: List[HistoryInput]
-    ) -> UUID:
+    def _bulk_create_practice_test(self, payload: NewPracticeTestInput):
+        # Bài kiểm tra lớn: không dựng entity / model ORM cho từng câu hỏi và đáp án,
+        # chỉ kiểm tra theo cùng quy tắc của domain rồi ghi bằng executemany
+        question_rows = []
+        option_rows = []
+        new_practice_test_domain: PracticeTest = Mapper.new_practice_test_domain(
+            payload.base_info
+        )
+        for question_payload in payload.questions:
+            question = question_payload.question
+            PracticeTestQuestion.validate_question(
+                question.question_text, question.question_type
+            )
+            question_id = uuid7()
+            question_rows.append(
+                {
+                    "question_id": question_id,
+                    "practice_test_id": new_practice_test_domain.practice_test_id,
+                    "question_text": question.question_text,
+                    "question_type": question.question_type,
+                }
+            )
+            for option_payload in question_payload.options:
+                AnswerOption.validate_option(
+                    option_payload.option_text, option_payload.is_correct
+                )
+                option_rows.append(
+                    {
+                        "option_id": uuid7(),
+                        "question_id": question_id,
+                        "option_text": option_payload.option_text,
+                        "is_correct": option_payload.is_correct,
+                    }
+                )
+
+        try:
+            self.db.add(Mapper.practice_test_domain_to_model(new_practice_test_domain))
+            self.db.flush()
+            if question_rows:
+                self.db.execute(insert(PracticeTestQuestionModel), question_rows)
+            if option_rows:
+                self.db.execute(insert(AnswerOptionModel), option_rows)
+            self.db.commit()
+            self._sync_search_index(new_practice_test_domain.practice_test_id)
+            return True
+        except Exception as e:
+            print("Lỗi khi thêm bài kiểm tra thử mới", e)
+            self.db.rollback()
+            raise e
+
+    def get_answer_key(self, practice_test_id: UUID) -> AnswerKey:
+        # Chỉ đọc id / loại câu hỏi và id / is_correct của đáp án, không đọc nội dung
+        rows = self.db.execute(
+            select(
+                PracticeTestQuestionModel.question_id,
+                PracticeTestQuestionModel.question_type,
+                AnswerOptionModel.option_id,
+                AnswerOptionModel.is_correct,
+            )
+            .outerjoin(
+                AnswerOptionModel,
+                AnswerOptionModel.question_id == PracticeTestQuestionModel.question_id,
+            )
+            .where(PracticeTestQuestionModel.practice_test_id == practice_test_id)
+            .order_by(PracticeTestQuestionModel.question_id)
+        ).all()
+        if not rows and not self.db.get(PracticeTestModel, practice_test_id):
+            raise PracticeTestsNotFoundErrorDomain(
+                f"Không tồn tại bài kiểm tra {practice_test_id}"
+            )
+
+        answer_key: AnswerKey = {}
+        for question_id, question_rows in groupby(
+            rows, key=lambda row: row.question_id
+        ):
+            question_rows = list(question_rows)
+            options = [row for row in question_rows if row.option_id is not None]
+            answer_key[question_id] = QuestionKey(
+                question_type=question_rows[0].question_type,
+                correct=frozenset(row.option_id for row in options if row.is_correct),
+                options=frozenset(row.option_id for row in options),
+            )
+        return answer_key
+
+    @staticmethod
+    def _submission_rows(
+        user_id: UUID, result: ResultInput, histories: List[HistoryInput]
+    ) -> Dict:
         new_result: PracticeTestResult = Mapper.new_result_domain(user_id, result)
         new_histories: List[PracticeTestHistory] = [
             Mapper.new_history_domain(new_result.result_id, history)
             for history in histories
         ]
-
-        result_model: PracticeTestResultModel = (
-            Mapper.practice_test_result_domain_to_model(new_result)
-        )
-        histories_model: List[PracticeTestHistoryModel] = (
-            Mapper.practice_test_history_domain_to_model(history_domain)
-            for history_domain in new_histories
-        )
-
+        return {
+            "result": {
+                "result_id": new_result.result_id,
+                "user_id": new_result.user_id,
+                "practice_test_id": new_result.practice_test_id,
+                "num_of_questions": new_result.num_of_questions,
+                "score": new_result.score,
+            },
+            "histories": [
+                {
+                    "history_id": history.history_id,
+                    "result_id": history.result_id,
+                    "question_id": history.question_id,
+                    "option_id": history.option_id,
+                }
+                for history in new_histories
+            ],
+        }
+
+    def insert_submissions(self, submissions: List[Dict]):
+        # Ghi nhiều bài nộp trong một transaction bằng INSERT nhiều dòng; id sinh sẵn
+        # (uuid7) nên ghi lại cùng bài nộp (spool, thử lại sau lỗi) không tạo bản sao
+        history_rows = [
+            row for submission in submissions for row in submission["histories"]
+        ]
         try:
-            self.db.add(result_model)
-            self.db.add_all(histories_model)
+            self.db.execute(
+                pg_insert(PracticeTestResultModel).on_conflict_do_nothing(),
+                [submission["result"] for submission in submissions],
+            )
+            if history_rows:
+                self.db.execute(
+                    pg_insert(PracticeTestHistoryModel).on_conflict_do_nothing(),
+                    history_rows,
+                )
             self.db.commit()
-            self.db.refresh(result_model)
-            return result_model.result_id
         except Exception as e:
             self.db.rollback()
             raise e
 
+    def submit_test(
+        self, user_id: UUID, result: ResultInput, histories: List[HistoryInput]
+    ) -> UUID:
+        submission = self._submission_rows(user_id, result, histories)
+        self.insert_submissions([submission])
+        return submission["result"]["result_id"]
+
     def update_practice_test(
         self,
         practice_test_id: UUID,
@@ -658,6 +1021,8 @@ class PracticeTestRepository(IPracticeTestRepository):
                             cur_option.option_text = option.option_text
                             cur_option.is_correct = option.is_correct
             self.db.commit()
+            invalidate_practice_test(practice_test_id)
+            self._sync_search_index(practice_test_id)
             return True
         except Exception as e:
             self.db.rollback()
@@ -683,6 +1048,7 @@ class PracticeTestRepository(IPracticeTestRepository):
             .delete(synchronize_session=False)
         )
         self.db.commit()
+        invalidate_practice_test(practice_test_id)
         return True
 
     def delete_question(self, practice_test_id: UUID, question_id: List[UUID]) -> bool:
@@ -693,6 +1059,7 @@ class PracticeTestRepository(IPracticeTestRepository):
             .delete(synchronize_session=False)
         )
         self.db.commit()
+        invalidate_practice_test(practice_test_id)
         return True
 
     def delete_practice_test(self, practice_test_id: UUID) -> bool:
@@ -704,4 +1071,34 @@ class PracticeTestRepository(IPracticeTestRepository):
 
         self.db.delete(practice_test)
         self.db.commit()
+        invalidate_practice_test(practice_test_id)
+        memory_search_engine.remove_practice_test(practice_test_id)
+        random_practice_test_pool.discard(
+            lambda item: item.practice_test_id == practice_test_id
+        )
         return True
+
+
+class QueuedPracticeTestRepository(PracticeTestRepository):
+    """
+    Bài nộp đi qua SubmissionQueue (SUBMISSION_MODE=memory / spool): trả result_id
+    ngay, thread nền ghi theo lô. Xem kết quả vừa nộp ở cùng worker thì chờ bài nộp
+    đó được ghi xong trước khi đọc.
+    """
+
+    def __init__(self, db: Session, queue: SubmissionQueue):
+        super().__init__(db)
+        self.queue = queue
+
+    def submit_test(
+        self, user_id: UUID, result: ResultInput, histories: List[HistoryInput]
+    ) -> UUID:
+        submission = self._submission_rows(user_id, result, histories)
+        self.queue.put(submission)
+        return submission["result"]["result_id"]
+
+    def get_practice_test_history(
+        self, user_id: UUID, result_id: UUID, practice_test_id: UUID
+    ):
+        self.queue.wait(result_id)
+        return super().get_practice_test_history(user_id, result_id, practice_test_id)
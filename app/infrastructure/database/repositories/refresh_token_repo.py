@@ -1,4 +1,6 @@
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from app.application.abstractions.refresh_token_abstraction import (
@@ -18,36 +20,99 @@ class RefreshTokenRepository(IRefreshTokenRepository):
             user_id=payload.user_id,
             expires_at=payload.expires_at,
             issued_at=payload.issued_at,
+            family_id=payload.family_id,
         )
         self.db.add(db_token)
         self.db.commit()
 
-    def is_jti_valid(self, jti: UUID) -> bool:
-        token = (
+    def _get_valid_token(self, jti: UUID) -> Optional[RefreshTokenModel]:
+        return (
             self.db.query(RefreshTokenModel)
-            .filter(RefreshTokenModel.jti == jti)
+            .filter(
+                RefreshTokenModel.jti == jti,
+                RefreshTokenModel.expires_at > func.now(),
+            )
             .first()
         )
-        return token is not None
 
-    def revoke_refresh_token(self, jti: UUID) -> bool:
-        token = (
-            self.db.query(RefreshTokenModel)
-            .filter(RefreshTokenModel.jti == jti)
-            .first()
+    def is_jti_valid(self, jti: UUID) -> bool:
+        return self._get_valid_token(jti) is not None
+
+    def rotate_refresh_token(self, jti: UUID, new_token: RefreshToken) -> bool:
+        # Cập nhật tại chỗ: mỗi họ chỉ có một dòng, jti cũ biến mất cùng lúc jti mới có
+        rotated = self.db.execute(
+            update(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.jti == jti,
+                RefreshTokenModel.family_id == new_token.family_id,
+                RefreshTokenModel.user_id == new_token.user_id,
+                RefreshTokenModel.expires_at > func.now(),
+            )
+            .values(
+                jti=new_token.jti,
+                expires_at=new_token.expires_at,
+                issued_at=new_token.issued_at,
+            )
+            .returning(RefreshTokenModel.jti)
+            .execution_options(synchronize_session=False)
+        ).first()
+        self.db.commit()
+        return rotated is not None
+
+    def _delete_tokens(self, condition) -> List[UUID]:
+        jtis = (
+            self.db.execute(
+                delete(RefreshTokenModel)
+                .where(condition)
+                .returning(RefreshTokenModel.jti)
+                .execution_options(synchronize_session=False)
+            )
+            .scalars()
+            .all()
         )
+        self.db.commit()
+        return jtis
 
-        if token:
-            self.db.delete(token)
-            self.db.commit()
-            return True
-        return False
+    def revoke_token_family(self, family_id: UUID) -> bool:
+        return len(self._delete_tokens(RefreshTokenModel.family_id == family_id)) > 0
 
-    def revoke_all_tokens_for_user(self, user_id: UUID) -> bool:
+    def revoke_refresh_token(self, jti: UUID) -> bool:
         num_deleted = (
             self.db.query(RefreshTokenModel)
-            .filter(RefreshTokenModel.user_id == user_id)
-            .delete()
+            .filter(RefreshTokenModel.jti == jti)
+            .delete(synchronize_session=False)
         )
         self.db.commit()
+        return num_deleted > 0
+
+    def revoke_all_tokens_for_user(self, user_id: UUID) -> bool:
+        self._delete_tokens(RefreshTokenModel.user_id == user_id)
         return True
+
+    def delete_expired_tokens(self, batch_size: int) -> Tuple[int, int]:
+        # Xoá theo lô, commit sau mỗi lô để transaction ngắn; SKIP LOCKED cho phép
+        # nhiều worker cùng quét mà không chờ nhau
+        expired = (
+            select(RefreshTokenModel.jti)
+            .where(RefreshTokenModel.expires_at < func.now())
+            .order_by(RefreshTokenModel.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        deleted = 0
+        batches = 0
+        while True:
+            result = self.db.execute(
+                delete(RefreshTokenModel)
+                .where(RefreshTokenModel.jti.in_(expired))
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            batches += 1
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted, batches
+
+    def count_tokens(self) -> int:
+        return self.db.query(func.count(RefreshTokenModel.jti)).scalar()
+
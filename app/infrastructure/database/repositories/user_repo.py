@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
 from dataclasses import asdict
 
@@ -13,17 +13,20 @@ from app.domain.entities.user.user_email_entity import UserEmail, UserEmailOutpu
 from app.domain.exceptions.user_exceptions import UserNotFoundErrorDomain
 
 from app.infrastructure.database.models.user_model import UserModel, UserEmailModel
+from app.infrastructure.database.pagination import keyset_paginate
 
 from app.application.abstractions.user_abstraction import IUserRepository
+from app.application.pagination import Page, PageRequest
 
 
 class UserRepository(IUserRepository):
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all_users(self) -> List[UserOutput]:
-        users = self.db.query(UserModel).filter(UserModel.role != "ADMIN").all()
-        return [
+    def get_all_users(self, page: PageRequest = PageRequest()) -> Page[UserOutput]:
+        query = self.db.query(UserModel).filter(UserModel.role != "ADMIN")
+        users, next_cursor = keyset_paginate(query, [UserModel.user_id], page)
+        items = [
             UserOutput(
                 user_id=user.user_id,
                 email=user.email,
@@ -35,6 +38,7 @@ class UserRepository(IUserRepository):
             )
             for user in users
         ]
+        return Page(items=items, next_cursor=next_cursor)
 
     def create_new_user_email(self, user_in: NewUserEmailInput) -> UserOutput:
         new_user_domain = User.create_new_user(
@@ -98,6 +102,18 @@ class UserRepository(IUserRepository):
             )
         return None
 
+    def update_password_hash(self, user_id: UUID, hashed_password: str) -> bool:
+        updated = (
+            self.db.query(UserEmailModel)
+            .filter(UserEmailModel.user_id == user_id)
+            .update(
+                {UserEmailModel.hashed_password: hashed_password},
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        return updated > 0
+
     def get_user_by_id(self, id: str) -> UserOutput:
         user = self.db.query(UserModel).filter(UserModel.user_id == id).first()
         return UserOutput(
@@ -0,0 +1,34 @@
+import random
+from sqlalchemy import func, tablesample, text
+from sqlalchemy.orm import Session, aliased
+from typing import Any, List
+
+# TABLESAMPLE SYSTEM lấy theo block và các điều kiện lọc loại bớt dòng,
+# nên lấy dư rồi chọn ngẫu nhiên lại trong Python
+OVERSAMPLE = 3
+
+
+def sampled_entity(db: Session, model, size: int):
+    """
+    Trả về entity dùng trong câu truy vấn nạp pool ngẫu nhiên:
+    bảng nhỏ (hoặc chưa ANALYZE) đọc thẳng, bảng lớn dùng TABLESAMPLE SYSTEM
+    với tỉ lệ đủ cho khoảng size * OVERSAMPLE dòng, không quét / sắp xếp toàn bảng.
+    """
+    estimated = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": model.__tablename__},
+    ).scalar()
+    if not estimated or estimated <= 0:
+        return model
+
+    percent = size * OVERSAMPLE * 100 / estimated
+    if percent >= 100:
+        return model
+    return aliased(
+        model,
+        tablesample(model, func.system(percent), name=f"{model.__tablename__}_sample"),
+    )
+
+
+def pick(rows: List[Any], size: int) -> List[Any]:
+    return random.sample(rows, size) if len(rows) > size else list(rows)
@@ -0,0 +1,344 @@
+import asyncio
+import glob
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import status, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+try:
+    import fcntl
+except ImportError:  # Windows: không khoá được file spool, chỉ dùng được memory
+    fcntl = None
+
+from app.infrastructure.config.setting import settings
+
+# {"result": dòng practice_test_results, "histories": [dòng practice_test_histories]}
+Submission = Dict
+SubmissionWriter = Callable[[List[Submission]], None]
+
+RETRY_MAX_SECONDS = 5
+
+
+def _to_json(value):
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Không ghi được giá trị {value!r} vào spool")
+
+
+def _from_json(row: Dict) -> Dict:
+    # Cột *_id là UUID (option_id của câu bỏ trống là None)
+    return {
+        key: UUID(value) if key.endswith("_id") and value is not None else value
+        for key, value in row.items()
+    }
+
+
+def _read_spool(path: str) -> List[Submission]:
+    submissions = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                # Dòng cuối ghi dở khi process chết: bài nộp đó chưa được trả result_id
+                continue
+            submissions.append(
+                {
+                    "result": _from_json(raw["result"]),
+                    "histories": [_from_json(row) for row in raw["histories"]],
+                }
+            )
+    return submissions
+
+
+class SubmissionQueue:
+    """
+    Ghi sau (write-behind) bài nộp: submit_test trả result_id ngay, một thread nền
+    gom các bài nộp đang chờ và ghi theo lô (INSERT nhiều dòng, ON CONFLICT DO
+    NOTHING nên ghi lại một lô là an toàn).
+    - memory: bài nộp chưa ghi mất khi process chết.
+    - spool: bài nộp được append vào file segment (fsync nếu spool_fsync) trước
+      khi trả về; segment bị xoá khi mọi bài nộp trong đó đã commit. Lúc khởi động,
+      segment còn sót của các worker đã dừng được ghi nốt. Segment của worker đang
+      chạy được giữ bằng flock nên worker khác không đụng tới.
+    - Quá max_pending bài nộp chưa ghi thì trả 503 thay vì để hàng đợi phình.
+    - Lỗi DB: giữ lô và thử lại (tối đa RETRY_MAX_SECONDS giữa hai lần). Bài nộp
+      vi phạm ràng buộc (vd. bài kiểm tra vừa bị xoá) được chuyển vào
+      spool_dir/dead-letter để xử lý tay, vì client đã nhận result_id.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int,
+        spool_dir: str,
+        spool_fsync: bool,
+    ):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.spool_dir = spool_dir
+        self.spool_fsync = spool_fsync
+        self.dead_letter_dir = os.path.join(spool_dir, "dead-letter")
+        self._cond = threading.Condition()
+        # Ghi / fsync file spool ngoài _cond; thứ tự khoá: _spool_lock rồi _cond
+        self._spool_lock = threading.Lock()
+        self._pending: List[Submission] = []
+        # result_id -> Future hoàn tất khi bài nộp đã commit
+        self._futures: Dict[UUID, Future] = {}
+        self._size = 0
+        self._segment: Optional[Tuple[str, object]] = None
+        self._write: Optional[SubmissionWriter] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.flushed = 0
+        self.batches = 0
+        self.replayed = 0
+        self.rejected = 0
+        self.errors = 0
+        self.dead_letter = 0
+        self.last_batch_size = 0
+        self.last_flush_ms: Optional[float] = None
+
+    def start(self, write: SubmissionWriter):
+        if self.mode == "spool":
+            if fcntl is None:
+                raise RuntimeError(
+                    "SUBMISSION_MODE=spool yêu cầu hệ điều hành hỗ trợ fcntl"
+                )
+            os.makedirs(self.spool_dir, exist_ok=True)
+        self._write = write
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        # Ghi nốt hàng đợi trước khi tắt; quá timeout thì bỏ (spool vẫn còn trên đĩa)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def put(self, submission: Submission):
+        if self.mode == "spool" and in_greenlet():
+            # Chế độ async: ghi / fsync file spool trong thread, không chặn event loop
+            await_only(asyncio.to_thread(self._put, submission))
+        else:
+            self._put(submission)
+
+    def _put(self, submission: Submission):
+        # Giữ chỗ trước để không ghi spool cho bài nộp sẽ bị từ chối
+        with self._cond:
+            if self._size >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Máy chủ đang bận, vui lòng thử lại sau",
+                    headers={"Retry-After": "1"},
+                )
+            self._size += 1
+        if self.mode != "spool":
+            self._enqueue(submission)
+            return
+        try:
+            # Append và đưa vào hàng đợi trong cùng _spool_lock: segment được tách ra
+            # để ghi luôn chứa đúng các bài nộp của lô đó
+            with self._spool_lock:
+                self._append_spool(submission)
+                self._enqueue(submission)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+            raise
+
+    def _enqueue(self, submission: Submission):
+        with self._cond:
+            self._pending.append(submission)
+            self._futures[submission["result"]["result_id"]] = Future()
+            # Đánh thức thread ghi khi có bài nộp đầu tiên hoặc đã đủ một lô
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def wait(self, result_id: UUID, timeout: float = 5):
+        """
+        Chờ bài nộp (của worker này) được ghi xong, để xem kết quả ngay sau khi nộp
+        không bị 404. Bài nộp đã ghi hoặc ở worker khác: trả về ngay.
+        """
+        with self._cond:
+            future = self._futures.get(result_id)
+        if future is None:
+            return
+        try:
+            if in_greenlet():
+                # Chế độ async: nhường event loop thay vì chặn nó
+                await_only(asyncio.wait_for(asyncio.wrap_future(future), timeout))
+            else:
+                future.result(timeout)
+        except (asyncio.TimeoutError, FutureTimeoutError):
+            pass
+
+    def _append_spool(self, submission: Submission):
+        if self._segment is None:
+            self._segment = self._open_segment()
+        f = self._segment[1]
+        f.write(
+            json.dumps(submission, default=_to_json, separators=(",", ":")).encode()
+            + b"\n"
+        )
+        f.flush()
+        if self.spool_fsync:
+            os.fsync(f.fileno())
+
+    def _open_segment(self) -> Tuple[str, object]:
+        # Khoá file trước khi đổi sang tên .jsonl để worker khác không kịp nhận nó
+        name = f"{os.getpid()}-{time.time_ns()}"
+        temp_path = os.path.join(self.spool_dir, f"{name}.tmp")
+        path = os.path.join(self.spool_dir, f"{name}.jsonl")
+        f = open(temp_path, "ab")
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        os.rename(temp_path, path)
+        if self.spool_fsync:
+            # fsync thư mục để tên file mới cũng không mất khi mất điện
+            dir_fd = os.open(self.spool_dir, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        return path, f
+
+    def _write_with_retry(self, batch: List[Submission]):
+        delay = self.flush_interval or 0.05
+        while True:
+            try:
+                started = time.perf_counter()
+                self._write(batch)
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 1)
+                return
+            except IntegrityError as e:
+                # Dữ liệu hỏng (vd. bài kiểm tra đã bị xoá): ghi lẻ từng bài nộp để
+                # chỉ bỏ bài lỗi, không thử lại mãi cả lô
+                if len(batch) > 1:
+                    for submission in batch:
+                        self._write_with_retry([submission])
+                    return
+                self._dead_letter(batch[0], e)
+                return
+            except Exception as e:
+                self.errors += 1
+                print("Lỗi khi ghi lô bài nộp, sẽ thử lại", e)
+                time.sleep(delay)
+                delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+    def _dead_letter(self, submission: Submission, error: IntegrityError):
+        os.makedirs(self.dead_letter_dir, exist_ok=True)
+        path = os.path.join(self.dead_letter_dir, f"{os.getpid()}.jsonl")
+        line = {"error": str(error.orig), **submission}
+        with open(path, "ab") as f:
+            f.write(
+                json.dumps(line, default=_to_json, separators=(",", ":")).encode()
+                + b"\n"
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        self.dead_letter += 1
+        print(
+            "Không ghi được bài nộp, đã chuyển vào",
+            path,
+            submission["result"]["result_id"],
+            error.orig,
+        )
+
+    def _replay_spool(self):
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "*.jsonl"))):
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            try:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # segment của worker đang chạy
+                submissions = _read_spool(path)
+                for start in range(0, len(submissions), self.batch_size):
+                    self._write_with_retry(submissions[start : start + self.batch_size])
+                self.replayed += len(submissions)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # worker khác vừa ghi nốt cùng segment
+                if submissions:
+                    print(f"Đã ghi nốt {len(submissions)} bài nộp từ {path}")
+            finally:
+                f.close()
+
+    def _run(self):
+        if self.mode == "spool":
+            self._replay_spool()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                # Gom thêm trong flush_interval cho lô lớn hơn
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.batch_size or self._stopping,
+                    timeout=self.flush_interval,
+                )
+            with self._spool_lock, self._cond:
+                batch, self._pending = self._pending, []
+                segment, self._segment = self._segment, None
+
+            for start in range(0, len(batch), self.batch_size):
+                chunk = batch[start : start + self.batch_size]
+                self._write_with_retry(chunk)
+                with self._cond:
+                    for submission in chunk:
+                        future = self._futures.pop(submission["result"]["result_id"])
+                        future.set_result(True)
+                    self._size -= len(chunk)
+                    self.flushed += len(chunk)
+                    self.batches += 1
+                    self.last_batch_size = len(chunk)
+
+            if segment is not None:
+                path, f = segment
+                os.remove(path)
+                f.close()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "mode": self.mode,
+                "pending": self._size,
+                "max_pending": self.max_pending,
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "replayed": self.replayed,
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "dead_letter": self.dead_letter,
+                "last_batch_size": self.last_batch_size,
+                "last_flush_ms": self.last_flush_ms,
+            }
+
+
+submission_queue = SubmissionQueue(
+    settings.SUBMISSION_MODE,
+    settings.SUBMISSION_BATCH_SIZE,
+    settings.SUBMISSION_FLUSH_INTERVAL_MS / 1000,
+    settings.SUBMISSION_MAX_PENDING,
+    settings.SUBMISSION_SPOOL_DIR,
+    settings.SUBMISSION_SPOOL_FSYNC,
+)
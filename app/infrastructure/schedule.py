@@ -9,3 +9,18 @@ def start_avatar_cleanup_scheduler(cleanup_service):
             time.sleep(300)
 
     threading.Thread(target=_run, daemon=True).start()
+
+
+def start_periodic(name: str, func, interval: int, run_first: bool = True):
+    # Chạy func mỗi interval giây trong thread nền; lỗi chỉ in ra, lần sau chạy tiếp
+    def _run():
+        if not run_first:
+            time.sleep(interval)
+        while True:
+            try:
+                func()
+            except Exception as e:
+                print(f"Lỗi khi {name}", e)
+            time.sleep(interval)
+
+    threading.Thread(target=_run, daemon=True).start()
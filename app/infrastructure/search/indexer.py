@@ -0,0 +1,15 @@
+from app.infrastructure.database.connection import SessionLocal
+from app.infrastructure.database.repositories.course_repo import CoursesRepository
+from app.infrastructure.database.repositories.practice_test_repo import (
+    PracticeTestRepository,
+)
+from app.infrastructure.search.memory_search_engine import memory_search_engine
+
+
+def rebuild_memory_search_index():
+    # Dùng session đồng bộ riêng, không phụ thuộc request
+    db = SessionLocal()
+    try:
+        memory_search_engine.rebuild(CoursesRepository(db), PracticeTestRepository(db))
+    finally:
+        db.close()
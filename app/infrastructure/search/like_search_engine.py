@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.practice_test.practice_test_entity import PracticeTestOutput
+
+from app.application.abstractions.search_abstraction import ISearchEngine
+from app.application.abstractions.course_abstraction import ICourseRepository
+from app.application.abstractions.practice_test_abstraction import (
+    IPracticeTestRepository,
+)
+
+
+class LikeSearchEngine(ISearchEngine):
+    # Tìm kiếm ILIKE cũ, dùng khi database chưa chạy migration tìm kiếm
+    def __init__(
+        self,
+        course_repo: ICourseRepository,
+        practice_test_repo: IPracticeTestRepository,
+    ):
+        self.course_repo = course_repo
+        self.practice_test_repo = practice_test_repo
+
+    def search_courses(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[CourseOutput]:
+        return self.course_repo.get_courses_by_keyword(keyword, cursor_id, limit)
+
+    def search_practice_tests(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[PracticeTestOutput]:
+        return self.practice_test_repo.get_practice_tests_by_keyword(
+            keyword, cursor_id, limit
+        )
@@ -0,0 +1,389 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from uuid import UUID
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.course.course_detail_entity import CourseDetailOutput
+from app.domain.entities.practice_test.practice_test_entity import PracticeTestOutput
+
+from app.application.abstractions.search_abstraction import ISearchEngine
+
+TOKEN_PATTERN = re.compile(r"\w+")
+COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+
+# BM25
+K1 = 1.2
+B = 0.75
+# Tên học phần / bài kiểm tra quan trọng hơn thuật ngữ và định nghĩa
+NAME_WEIGHT = 3.0
+# Từ khoá chỉ khớp tiền tố (vd "toa" -> "toan") được tính điểm thấp hơn khớp đủ
+PREFIX_WEIGHT = 0.7
+# Giới hạn số term mở rộng cho một tiền tố để giữ độ trễ ổn định
+MAX_PREFIX_EXPANSIONS = 64
+# Điểm BM25 đã tính sẵn được tính lại khi số document / độ dài trung bình lệch quá mức này
+STATS_DRIFT = 0.1
+
+
+def fold(text: str) -> str:
+    # Bỏ dấu tiếng Việt: "Đề Toán" -> "de toan"
+    text = text.lower().replace("đ", "d")
+    return COMBINING_MARKS.sub("", unicodedata.normalize("NFD", text))
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+def descending(ranked: List[Tuple[float, int]], end: int, weight: float):
+    # Duyệt ranked[:end] từ điểm cao xuống thấp, nhân hệ số của term
+    for i in range(end - 1, -1, -1):
+        score, key = ranked[i]
+        yield weight * score, key
+
+
+class InvertedIndex:
+    """
+    Inverted index với BM25 và tìm theo tiền tố.
+    Mỗi document giữ kèm output để trả kết quả mà không cần truy vấn DB.
+
+    - Document được khoá bằng UUID.int: hash / so sánh int nhanh hơn nhiều so với
+      UUID mà vẫn giữ đúng thứ tự id để phân trang.
+    - Điểm BM25 của từng (term, document) được tính sẵn khi term được truy vấn lần
+      đầu và giữ tới khi posting của term đó thay đổi.
+    - Truy vấn một từ khoá lấy top-k bằng cách trộn các danh sách đã sắp xếp,
+      không phải duyệt toàn bộ posting.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.doc_terms: Dict[int, List[str]] = {}
+        self.doc_len: Dict[int, float] = {}
+        self.docs: Dict[int, Any] = {}
+        self.total_len = 0.0
+        # Sắp xếp lười: dựng index hàng loạt không phải insort từng term
+        self._sorted_terms: Optional[List[str]] = None
+        # term -> (điểm theo document, danh sách (điểm, key) tăng dần)
+        self._impacts: Dict[str, Tuple[Dict[int, float], List[Tuple[float, int]]]] = {}
+        self._impact_stats = (0, 0.0)
+
+    def add(self, doc_id: UUID, output: Any, fields: Iterable[Tuple[str, float]]):
+        frequencies: Dict[str, float] = {}
+        for text, weight in fields:
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+
+        key = doc_id.int
+        with self._lock:
+            self._remove(key)
+            for term, frequency in frequencies.items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = {}
+                    if self._sorted_terms is not None:
+                        insort(self._sorted_terms, term)
+                posting[key] = frequency
+                self._impacts.pop(term, None)
+
+            length = sum(frequencies.values())
+            self.doc_terms[key] = list(frequencies)
+            self.doc_len[key] = length
+            self.docs[key] = output
+            self.total_len += length
+
+    def remove(self, doc_id: UUID):
+        with self._lock:
+            self._remove(doc_id.int)
+
+    def _remove(self, key: int):
+        terms = self.doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings[term]
+            del posting[key]
+            self._impacts.pop(term, None)
+            if not posting:
+                del self.postings[term]
+                if self._sorted_terms is not None:
+                    del self._sorted_terms[bisect_left(self._sorted_terms, term)]
+        self.total_len -= self.doc_len.pop(key)
+        del self.docs[key]
+
+    def _expand(self, token: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms: List[str] = []
+        i = bisect_left(self._sorted_terms, token)
+        while i < len(self._sorted_terms) and len(terms) < MAX_PREFIX_EXPANSIONS:
+            term = self._sorted_terms[i]
+            if not term.startswith(token):
+                break
+            terms.append(term)
+            i += 1
+        return terms
+
+    def _check_stats(self):
+        num_docs = len(self.doc_len)
+        avg_len = self.total_len / num_docs if num_docs else 0.0
+        cached_docs, cached_avg = self._impact_stats
+        if abs(num_docs - cached_docs) > STATS_DRIFT * max(cached_docs, 1) or abs(
+            avg_len - cached_avg
+        ) > STATS_DRIFT * max(cached_avg, 1.0):
+            self._impacts.clear()
+            self._impact_stats = (num_docs, avg_len)
+
+    def _term_impacts(
+        self, term: str
+    ) -> Tuple[Dict[int, float], List[Tuple[float, int]]]:
+        cached = self._impacts.get(term)
+        if cached is not None:
+            return cached
+
+        num_docs, avg_len = self._impact_stats
+        avg_len = avg_len or 1.0
+        posting = self.postings[term]
+        idf = math.log(1 + (num_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+        doc_len = self.doc_len
+        scores = {
+            key: idf
+            * frequency
+            * (K1 + 1)
+            / (frequency + K1 * (1 - B + B * doc_len[key] / avg_len))
+            for key, frequency in posting.items()
+        }
+        ranked = sorted((score, key) for key, score in scores.items())
+        self._impacts[term] = (scores, ranked)
+        return scores, ranked
+
+    def _top_of_token(
+        self, token: str, terms: List[str], cursor: Optional[int], limit: int
+    ) -> List[Any]:
+        weighted = [
+            (1.0 if term == token else PREFIX_WEIGHT, *self._term_impacts(term))
+            for term in terms
+        ]
+
+        def best(key: int) -> Optional[float]:
+            # Một document khớp nhiều term cùng tiền tố chỉ lấy điểm cao nhất
+            return max(
+                (
+                    weight * scores[key]
+                    for weight, scores, _ in weighted
+                    if key in scores
+                ),
+                default=None,
+            )
+
+        cursor_key = None
+        if cursor is not None:
+            cursor_score = best(cursor)
+            if cursor_score is None:
+                return []
+            cursor_key = (cursor_score, cursor)
+
+        streams = []
+        for weight, _, ranked in weighted:
+            end = len(ranked)
+            if cursor_key:
+                end = bisect_left(
+                    ranked,
+                    cursor_key,
+                    key=lambda item, w=weight: (w * item[0], item[1]),
+                )
+            streams.append(descending(ranked, end, weight))
+
+        results: List[Any] = []
+        seen = set()
+        for score, key in heapq.merge(*streams, reverse=True):
+            if key in seen:
+                continue
+            seen.add(key)
+            # Điểm cao nhất của document nằm trước cursor -> đã trả ở trang trước
+            if len(weighted) > 1 and score != best(key):
+                continue
+            results.append(self.docs[key])
+            if len(results) == limit:
+                break
+        return results
+
+    def _score_token(self, token: str, terms: List[str]) -> Dict[int, float]:
+        if terms == [token]:
+            return self._term_impacts(token)[0]
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            weight = 1.0 if term == token else PREFIX_WEIGHT
+            for key, score in self._term_impacts(term)[0].items():
+                score *= weight
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+        return scores
+
+    def search(
+        self, query: str, cursor_id: Optional[UUID] = None, limit: int = 12
+    ) -> List[Any]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        cursor = cursor_id.int if cursor_id else None
+
+        with self._lock:
+            if not self.doc_len:
+                return []
+            self._check_stats()
+
+            expansions = [self._expand(token) for token in tokens]
+            if not all(expansions):
+                return []
+            if len(tokens) == 1:
+                return self._top_of_token(tokens[0], expansions[0], cursor, limit)
+
+            # Nhiều từ khoá: mọi từ đều phải khớp (AND), điểm là tổng BM25 từng từ;
+            # duyệt từ khoá có ít document nhất
+            token_scores = sorted(
+                (
+                    self._score_token(token, terms)
+                    for token, terms in zip(tokens, expansions)
+                ),
+                key=len,
+            )
+            smallest, others = token_scores[0], token_scores[1:]
+            candidates = []
+            for key, score in smallest.items():
+                for other in others:
+                    other_score = other.get(key)
+                    if other_score is None:
+                        break
+                    score += other_score
+                else:
+                    candidates.append((score, key))
+
+            if cursor is not None:
+                cursor_key = next(
+                    (item for item in candidates if item[1] == cursor), None
+                )
+                if cursor_key is None:
+                    return []
+                candidates = [item for item in candidates if item < cursor_key]
+
+            return [self.docs[key] for _, key in heapq.nlargest(limit, candidates)]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"documents": len(self.docs), "terms": len(self.postings)}
+
+
+class MemorySearchEngine(ISearchEngine):
+    """
+    Backend tìm kiếm trong process (SEARCH_BACKEND=memory).
+    Được dựng lúc khởi động, cập nhật từ repository sau mỗi lần ghi
+    và dựng lại định kỳ để nhận thay đổi từ các worker khác.
+    """
+
+    def __init__(self):
+        self.courses = InvertedIndex()
+        self.practice_tests = InvertedIndex()
+        # Ghi xảy ra trong lúc rebuild được ghi lại và áp lên index mới sau khi thay
+        self._write_lock = threading.Lock()
+        self._writes_during_rebuild: Optional[List[Tuple[Callable, tuple]]] = None
+
+    def search_courses(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[CourseOutput]:
+        return self.courses.search(
+            keyword, UUID(cursor_id) if cursor_id else None, limit
+        )
+
+    def search_practice_tests(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[PracticeTestOutput]:
+        return self.practice_tests.search(
+            keyword, UUID(cursor_id) if cursor_id else None, limit
+        )
+
+    @staticmethod
+    def _add_course(
+        index: InvertedIndex, course: CourseOutput, details: List[CourseDetailOutput]
+    ):
+        fields = [(course.course_name, NAME_WEIGHT)]
+        fields.extend((detail.term, 1.0) for detail in details)
+        fields.extend((detail.definition, 1.0) for detail in details)
+        index.add(course.course_id, course, fields)
+
+    def _write(self, apply: Callable, *args):
+        with self._write_lock:
+            apply(*args)
+            if self._writes_during_rebuild is not None:
+                self._writes_during_rebuild.append((apply, args))
+
+    def _index_course(self, course: CourseOutput, details: List[CourseDetailOutput]):
+        self._add_course(self.courses, course, details)
+
+    def index_course(self, course: CourseOutput, details: List[CourseDetailOutput]):
+        self._write(self._index_course, course, details)
+
+    def _remove_course(self, course_id: UUID):
+        self.courses.remove(course_id)
+
+    def remove_course(self, course_id: UUID):
+        self._write(self._remove_course, course_id)
+
+    @staticmethod
+    def _add_practice_test(index: InvertedIndex, practice_test: PracticeTestOutput):
+        index.add(
+            practice_test.practice_test_id,
+            practice_test,
+            [(practice_test.practice_test_name, NAME_WEIGHT)],
+        )
+
+    def _index_practice_test(self, practice_test: PracticeTestOutput):
+        self._add_practice_test(self.practice_tests, practice_test)
+
+    def index_practice_test(self, practice_test: PracticeTestOutput):
+        self._write(self._index_practice_test, practice_test)
+
+    def _remove_practice_test(self, practice_test_id: UUID):
+        self.practice_tests.remove(practice_test_id)
+
+    def remove_practice_test(self, practice_test_id: UUID):
+        self._write(self._remove_practice_test, practice_test_id)
+
+    def rebuild(self, course_repo, practice_test_repo):
+        # Dựng index mới rồi thay thế, request tìm kiếm vẫn dùng index cũ trong lúc dựng
+        with self._write_lock:
+            self._writes_during_rebuild = []
+        try:
+            courses = InvertedIndex()
+            for course, details in course_repo.iter_course_search_documents():
+                self._add_course(courses, course, details)
+
+            practice_tests = InvertedIndex()
+            for (
+                practice_test
+            ) in practice_test_repo.iter_practice_test_search_documents():
+                self._add_practice_test(practice_tests, practice_test)
+
+            with self._write_lock:
+                self.courses = courses
+                self.practice_tests = practice_tests
+                # Bản đọc lúc dựng có thể cũ hơn các ghi này: áp lại theo thứ tự
+                for apply, args in self._writes_during_rebuild:
+                    apply(*args)
+        finally:
+            with self._write_lock:
+                self._writes_during_rebuild = None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "courses": self.courses.stats(),
+            "practice_tests": self.practice_tests.stats(),
+        }
+
+
+memory_search_engine = MemorySearchEngine()
@@ -0,0 +1,148 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, tuple_, or_, literal, text
+from uuid import UUID
+from typing import List, Optional
+
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.practice_test.practice_test_entity import PracticeTestOutput
+
+from app.application.abstractions.search_abstraction import ISearchEngine
+
+from app.infrastructure.database.models.course_model import CourseModel
+from app.infrastructure.database.models.practice_test_model import PracticeTestModel
+from app.infrastructure.database.models.user_model import UserModel
+
+
+def normalize(expr):
+    # Phải khớp chính xác với biểu thức của index trong migrations/001_search_indexes.sql
+    return func.lower(func.immutable_unaccent(expr))
+
+
+def verify_search_functions(db: Session):
+    # Thiếu hàm thì mọi truy vấn tìm kiếm đều lỗi và bị nuốt thành kết quả rỗng
+    for signature in ("immutable_unaccent(text)", "word_similarity(text, text)"):
+        found = db.execute(
+            text("SELECT to_regprocedure(:signature)"), {"signature": signature}
+        ).scalar()
+        if found is None:
+            raise RuntimeError(
+                f"SEARCH_BACKEND=postgres yêu cầu chạy "
+                f"migrations/001_search_indexes.sql (thiếu hàm {signature})"
+            )
+
+
+def escape_like(keyword: str) -> str:
+    return keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class PostgresSearchEngine(ISearchEngine):
+    """
+    Tìm kiếm dựa trên pg_trgm + unaccent (không phân biệt dấu tiếng Việt).
+    - Lọc: word_similarity (toán tử <%) hoặc chứa chuỗi con, đều dùng GIN trigram index.
+    - Xếp hạng: word_similarity giảm dần, hoà thì theo id giảm dần.
+    - Phân trang keyset theo (rank, id); rank của cursor được tính lại từ cursor_id.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _ranked_ids(self, id_column, name_column, keyword: str, cursor_id, limit):
+        term = normalize(literal(keyword))
+        pattern = normalize(literal(f"%{escape_like(keyword)}%"))
+        name = normalize(name_column)
+        rank = func.word_similarity(term, name)
+
+        query = select(id_column.label("id"), rank.label("rank")).where(
+            or_(term.op("<%")(name), name.like(pattern, escape="\\"))
+        )
+
+        if cursor_id:
+            cursor_id = UUID(str(cursor_id))
+            cursor_rank = select(rank).where(id_column == cursor_id).scalar_subquery()
+            query = query.where(
+                tuple_(rank, id_column) < tuple_(cursor_rank, cursor_id)
+            )
+
+        return (
+            query.order_by(rank.desc(), id_column.desc()).limit(limit).subquery("page")
+        )
+
+    def search_courses(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[CourseOutput]:
+        try:
+            page = self._ranked_ids(
+                CourseModel.course_id,
+                CourseModel.course_name,
+                keyword,
+                cursor_id,
+                limit,
+            )
+            rows = self.db.execute(
+                select(
+                    CourseModel.course_id,
+                    CourseModel.course_name,
+                    UserModel.avatar_url,
+                    UserModel.username,
+                    UserModel.role,
+                    CourseModel.num_of_terms,
+                )
+                .select_from(page)
+                .join(CourseModel, CourseModel.course_id == page.c.id)
+                .join(UserModel, UserModel.user_id == CourseModel.user_id)
+                .order_by(page.c.rank.desc(), page.c.id.desc())
+            ).all()
+
+            return [
+                CourseOutput(
+                    course_id=row.course_id,
+                    course_name=row.course_name,
+                    author_avatar_url=row.avatar_url,
+                    author_username=row.username,
+                    author_role=row.role,
+                    num_of_terms=row.num_of_terms,
+                )
+                for row in rows
+            ]
+        except Exception as e:
+            print("Có lỗi xảy ra khi tìm kiếm học phần", e)
+            return []
+
+    def search_practice_tests(
+        self, keyword: str, cursor_id: Optional[str] = None, limit: int = 12
+    ) -> List[PracticeTestOutput]:
+        try:
+            page = self._ranked_ids(
+                PracticeTestModel.practice_test_id,
+                PracticeTestModel.practice_test_name,
+                keyword,
+                cursor_id,
+                limit,
+            )
+            rows = self.db.execute(
+                select(
+                    PracticeTestModel.practice_test_id,
+                    PracticeTestModel.practice_test_name,
+                    UserModel.avatar_url,
+                    UserModel.username,
+                )
+                .select_from(page)
+                .join(
+                    PracticeTestModel, PracticeTestModel.practice_test_id == page.c.id
+                )
+                .join(UserModel, UserModel.user_id == PracticeTestModel.user_id)
+                .order_by(page.c.rank.desc(), page.c.id.desc())
+            ).all()
+
+            return [
+                PracticeTestOutput(
+                    practice_test_id=row.practice_test_id,
+                    practice_test_name=row.practice_test_name,
+                    author_avatar_url=row.avatar_url,
+                    author_username=row.username,
+                )
+                for row in rows
+            ]
+        except Exception as e:
+            print("Có lỗi xảy ra khi tìm kiếm bài kiểm tra", e)
+            return []
@@ -1,5 +1,7 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -9,13 +11,64 @@ from app.presentation.routers import (
     user_router,
     course_router,
     practice_test_router,
-    admin_router
+    admin_router,
+    metrics_router,
 )
+from app.presentation.projection import default_response_class
+from app.infrastructure.config.setting import settings
+from app.infrastructure.schedule import start_periodic
+from app.infrastructure.database.maintenance import (
+    check_search_backend,
+    reconcile_course_term_counts,
+    sweep_expired_refresh_tokens,
+    write_submissions,
+)
+from app.infrastructure.database.submission_queue import submission_queue
+from app.infrastructure.search.indexer import rebuild_memory_search_index
+from app.infrastructure.config.password_hasher import password_hasher_pool
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PUBLIC_DIR_PATH = os.path.join(BASE_DIR, "public")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.SEARCH_BACKEND == "postgres":
+        await run_in_threadpool(check_search_backend)
+    if settings.SEARCH_BACKEND == "memory":
+        # Dựng index tìm kiếm trước khi nhận request
+        await run_in_threadpool(rebuild_memory_search_index)
+        if settings.SEARCH_INDEX_REFRESH_SECONDS > 0:
+            # Nhận thay đổi từ các worker khác; index vừa dựng nên chờ hết chu kỳ đầu
+            start_periodic(
+                "dựng lại index tìm kiếm",
+                rebuild_memory_search_index,
+                settings.SEARCH_INDEX_REFRESH_SECONDS,
+                run_first=False,
+            )
+    if settings.TERM_COUNT_RECONCILE_SECONDS > 0:
+        # Sửa num_of_terms bị lệch (vd. ghi dở dang) so với course_details
+        start_periodic(
+            "đối soát số thuật ngữ",
+            reconcile_course_term_counts,
+            settings.TERM_COUNT_RECONCILE_SECONDS,
+        )
+    if settings.REFRESH_TOKEN_SWEEP_SECONDS > 0:
+        # Xoá refresh token đã hết hạn để bảng refresh_tokens không phình mãi
+        start_periodic(
+            "xoá refresh token hết hạn",
+            sweep_expired_refresh_tokens,
+            settings.REFRESH_TOKEN_SWEEP_SECONDS,
+        )
+    if settings.SUBMISSION_MODE != "sync":
+        # spool: ghi nốt bài nộp còn trong spool trước, trong thread ghi
+        submission_queue.start(write_submissions)
+    yield
+    submission_queue.stop()
+    password_hasher_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=default_response_class())
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,3 +92,4 @@ app.include_router(user_router.router, prefix="/api", tags=["USER"])
 app.include_router(course_router.router, prefix="/api", tags=["COURSE"])
 app.include_router(practice_test_router.router, prefix="/api", tags=["PRACTICETEST"])
 app.include_router(admin_router.router, prefix="/api", tags=["ADMIN"])
+app.include_router(metrics_router.router, prefix="/api", tags=["METRICS"])
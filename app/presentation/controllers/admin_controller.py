@@ -1,19 +1,27 @@
 from fastapi import status, HTTPException
 from uuid import UUID
+from typing import Optional
 
 from app.application.use_cases.admin_service import AdminServices
-from app.application.exceptions import UserNotAllowError, UserNotFoundError
+from app.application.exceptions import (
+    UserNotAllowError,
+    UserNotFoundError,
+    InvalidCursorError,
+)
 from app.presentation.schemas.user_schema import UserOut
+from app.presentation.schemas.pagination_schema import PageOutput
 
 
 class AdminController:
     def __init__(self, service: AdminServices):
         self.service = service
 
-    def get_all_users(self, user_id: UUID, role: str):
+    def get_all_users(
+        self, user_id: UUID, role: str, cursor: Optional[str], limit: int
+    ):
         try:
-            response = self.service.get_all_users(user_id, role)
-            return [
+            response = self.service.get_all_users(user_id, role, cursor, limit)
+            users = [
                 UserOut(
                     user_id=raw.user_id,
                     email=raw.email,
@@ -22,8 +30,11 @@ class AdminController:
                     avatar_url=raw.avatar_url,
                     is_actived=raw.is_actived,
                 )
-                for raw in response
+                for raw in response.items
             ]
+            return PageOutput[UserOut](items=users, next_cursor=response.next_cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except UserNotAllowError:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
 
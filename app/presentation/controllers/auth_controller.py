@@ -15,7 +15,11 @@ from app.application.exceptions import (
 )
 
 from app.presentation.schemas.user_schema import UserOut, UserResponse
-from app.presentation.schemas.auth_schema import UserCreateEmail, UserLoginEmail
+from app.presentation.schemas.auth_schema import (
+    UserCreateEmail,
+    UserLoginEmail,
+    TokenPair,
+)
 
 
 class AuthController:
@@ -74,9 +78,12 @@ class AuthController:
                 detail="Đã xảy ra lỗi không mong muốn.",
             )
 
-    def re_generate_access_token(self, refresh_token: str):
+    def re_generate_access_token(self, refresh_token: str) -> TokenPair:
         try:
-            return self.service.refresh_access_token(refresh_token)
+            tokens = self.service.refresh_access_token(refresh_token)
+            return TokenPair(
+                access_token=tokens.access_token, refresh_token=tokens.refresh_token
+            )
         except InvalidCredentialsError as e:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
         except AccountNotFoundError as e:
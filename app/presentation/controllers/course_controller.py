@@ -1,60 +1,117 @@
-from fastapi import status, HTTPException
+import io
+from fastapi import status, HTTPException, Response, UploadFile
+from urllib.parse import quote
 from uuid import UUID
-from typing import List
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from app.application.use_cases.course_service import CourseService
+from app.application.course_file import (
+    COURSE_FILE_MEDIA_TYPES,
+    check_course_name,
+    course_file_format,
+    format_course_file,
+    parse_course_file,
+)
+from app.application.abstractions.cache_abstraction import IPayloadCache
 from app.application.dtos.course_dto import (
     DTONewCourseInput,
     DTONewCourseDetailInput,
-    DTOCourseWithDetails,
     DTOUpdateCourseInput,
     DTOUpdateCourseDetailInput,
     DTOUpdateCourseRequest,
-    DTOCourseOutput,
 )
 from app.application.exceptions import (
     CourseNotFoundError,
     UserNotFoundError,
     UserNotAllowError,
     CourseDetailNotFoundError,
+    InvalidCursorError,
+    InvalidCourseFileError,
+    CourseSessionExpiredError,
 )
 
 from app.presentation.schemas.course_schema import (
     CourseQuestionOutput,
+    CourseSessionOutput,
     CourseWithDetailsOutput,
-    LearnQuestionOutput,
     CourseOutput,
     CourseDetailOutput,
     NewCourseInput,
     NewCourseDetailInput,
     UpdateCourseRequest,
+    CourseImportOutput,
 )
+from app.presentation.schemas.pagination_schema import PageOutput
+from app.presentation.json_stream import json_array_chunks
+from app.presentation.projection import Projection
+
+course_with_details = Projection(CourseWithDetailsOutput)
+course_output = Projection(CourseOutput)
+course_list = Projection(List[CourseOutput])
+course_page = Projection(PageOutput[CourseOutput])
+course_detail_item = Projection(CourseDetailOutput)
+course_questions = Projection(CourseQuestionOutput)
+course_session = Projection(CourseSessionOutput)
+
+
+def course_etag(course_id: UUID, updated_at: Optional[datetime]) -> str:
+    # Học phần cũ có thể chưa có updated_at lẫn created_at (xem migrations/006)
+    version = f"{updated_at:%Y%m%d%H%M%S%f}" if updated_at else "0"
+    return f'"{course_id.hex}-{version}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    # If-None-Match dùng so sánh yếu: bỏ tiền tố W/ trước khi so
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
 
 
 class CourseController:
-    def __init__(self, service: CourseService):
+    def __init__(self, service: CourseService, detail_cache: IPayloadCache):
         self.service = service
+        self.detail_cache = detail_cache
 
-    def get_user_course(self, user_id: UUID):
+    def get_course_snapshot(self, course_id: UUID) -> Tuple[str, bytes]:
+        """
+        Trả về (ETag, JSON) của chi tiết học phần, ưu tiên lấy từ cache.
+        Bản ghi cache có dạng b'<etag>\\n<json>'.
+        """
+        cache_key = str(course_id)
+        cached, version = self.detail_cache.get(cache_key)
+        if cached is not None:
+            etag, payload = cached.split(b"\n", 1)
+            return etag.decode(), payload
+
+        response = self.service.get_course_detail_by_id(course_id=course_id)
+        payload = course_with_details.dump(
+            {
+                "course": response.get("course"),
+                "course_detail": response.get("course_detail"),
+            }
+        )
+        etag = course_etag(course_id, response.get("updated_at"))
+
+        self.detail_cache.set(cache_key, etag.encode() + b"\n" + payload, version)
+        return etag, payload
+
+    def get_user_course(self, user_id: UUID, cursor: Optional[str], limit: int):
         try:
-            courses: List[DTOCourseOutput] = self.service.get_user_course(user_id)
-            return [
-                CourseOutput(
-                    course_id=course.course_id,
-                    course_name=course.course_name,
-                    author_avatar_url=course.author_avatar_url,
-                    author_username=course.author_username,
-                    author_role=course.author_role,
-                    num_of_terms=course.num_of_terms,
-                )
-                for course in courses
-            ]
+            return course_page.response(
+                self.service.get_user_course(user_id, cursor, limit)
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except CourseNotFoundError:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
     def get_random_course(self):
         try:
-            return self.service.get_random_course()
+            return course_list.response(self.service.get_random_course())
         except CourseNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except Exception as e:
@@ -62,70 +119,103 @@ class CourseController:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
-    def get_course_detail_by_id(self, course_id: UUID):
+    def get_course_detail_by_id(
+        self, course_id: UUID, if_none_match: Optional[str] = None
+    ):
         try:
-            response = self.service.get_course_detail_by_id(course_id=course_id)
-            return CourseWithDetailsOutput(
-                course=response.get("course"),
-                course_detail=response.get("course_detail"),
-            )
+            etag, payload = self.get_course_snapshot(course_id)
+        except CourseNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(etag, if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=payload, media_type="application/json", headers=headers)
+
+    def stream_course_detail(
+        self, course_id: UUID, if_none_match: Optional[str] = None
+    ) -> Tuple[Dict[str, str], Optional[Iterator[bytes]]]:
+        """
+        Chi tiết học phần dạng JSON streaming (cùng cấu trúc với bản thường), đọc
+        thuật ngữ từ cursor phía server; không qua cache payload.
+        Trả về (headers, chunks); chunks là None khi ETag khớp (304).
+        """
+        try:
+            header, details = self.service.stream_course_detail(course_id)
         except CourseNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
+        etag = course_etag(course_id, header["updated_at"])
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(etag, if_none_match):
+            return headers, None
+
+        prefix = (
+            b'{"course":' + course_output.dump(header["course"]) + b',"course_detail":'
+        )
+        items = (course_detail_item.dump(detail) for detail in details)
+        return headers, json_array_chunks(prefix, items, b"}")
+
+    def build_course_question_output(self, response) -> Response:
+        return course_questions.response(response)
+
     def get_course_learn_by_id(self, course_id: str):
+        # Câu hỏi được xáo ngẫu nhiên mỗi lần -> không gắn ETag,
+        # nhưng vẫn dùng snapshot đã cache thay vì truy vấn lại DB
         try:
-            response = self.service.get_course_learn_by_id(course_id)
-            course = response.get("course")
-            questions = response.get("questions")
-            course_res = CourseOutput(
-                course_id=course.course_id,
-                course_name=course.course_name,
-                author_avatar_url=course.author_avatar_url,
-                author_username=course.author_username,
-                author_role=course.author_role,
-                num_of_terms=course.num_of_terms,
+            etag, payload = self.get_course_snapshot(UUID(course_id))
+            snapshot = course_with_details.adapter.validate_json(payload)
+            # ETag làm version cho index gần nghĩa (DISTRACTOR_MODE=similar)
+            response = self.service.build_course_learn(
+                snapshot["course"], snapshot["course_detail"], version=etag
             )
-            questions_res: List[LearnQuestionOutput] = []
-            for question in questions:
-                questions_res.append(
-                    LearnQuestionOutput(
-                        question=question.get("question"),
-                        options=question.get("options"),
-                    )
-                )
-            return CourseQuestionOutput(course=course_res, questions=questions_res)
+            return self.build_course_question_output(response)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
-    def get_course_test_by_id(self, course_id: str):
+    def get_course_test_by_id(self, course_id: str, size: Optional[int] = None):
         try:
-            response = self.service.get_course_test_by_id(course_id)
-            course = response.get("course")
-            questions = response.get("questions")
-            course_res = CourseOutput(
-                course_id=course.course_id,
-                course_name=course.course_name,
-                author_avatar_url=course.author_avatar_url,
-                author_username=course.author_username,
-                author_role=course.author_role,
-                num_of_terms=course.num_of_terms,
+            etag, payload = self.get_course_snapshot(UUID(course_id))
+            snapshot = course_with_details.adapter.validate_json(payload)
+            # ETag làm version cho index gần nghĩa (DISTRACTOR_MODE=similar)
+            response = self.service.build_course_test(
+                snapshot["course"], snapshot["course_detail"], version=etag, size=size
             )
-            questions_res: List[LearnQuestionOutput] = []
-            for question in questions:
-                questions_res.append(
-                    LearnQuestionOutput(
-                        question=question.get("question"),
-                        options=question.get("options"),
-                    )
-                )
-            return CourseQuestionOutput(course=course_res, questions=questions_res)
+            return self.build_course_question_output(response)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
+    def get_course_session(
+        self,
+        course_id: UUID,
+        cursor: Optional[str],
+        limit: int,
+        size: Optional[int] = None,
+    ):
+        try:
+            etag, payload = self.get_course_snapshot(course_id)
+            snapshot = course_with_details.adapter.validate_json(payload)
+            # ETag vừa là version trong cursor vừa là version của index gần nghĩa
+            response = self.service.build_course_session(
+                snapshot["course"],
+                snapshot["course_detail"],
+                etag,
+                cursor,
+                limit,
+                size,
+            )
+            return course_session.response(response)
+        except CourseNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except CourseSessionExpiredError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
     def create_new_course(
         self,
         user_id: UUID,
@@ -159,6 +249,50 @@ class CourseController:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
+    def import_course(
+        self,
+        user_id: UUID,
+        course_name: str,
+        file: UploadFile,
+        file_format: Optional[str],
+    ) -> CourseImportOutput:
+        try:
+            check_course_name(course_name)
+            file_format = course_file_format(file_format, file.filename)
+            # Đọc file tải lên theo từng dòng; utf-8-sig bỏ BOM của file xuất từ Excel
+            lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+            result = self.service.import_course(
+                user_id, course_name, parse_course_file(lines, file_format)
+            )
+            return CourseImportOutput(
+                course_id=result.course_id, num_of_terms=result.num_of_terms
+            )
+        except InvalidCourseFileError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except (UnicodeDecodeError, ValueError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File không hợp lệ: {e}",
+            )
+
+    def export_course(
+        self, course_id: UUID, file_format: str
+    ) -> Tuple[Dict[str, str], Iterator[bytes]]:
+        try:
+            course_name, terms = self.service.export_course(course_id)
+        except CourseNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+        filename = f"{course_name}.{file_format}"
+        headers = {
+            "Content-Type": COURSE_FILE_MEDIA_TYPES[file_format],
+            "Content-Disposition": (
+                f"attachment; filename=course.{file_format}; "
+                f"filename*=UTF-8''{quote(filename)}"
+            ),
+        }
+        return headers, format_course_file(terms, file_format)
+
     def update_course(
         self, user_id: UUID, course_id: UUID, payload: UpdateCourseRequest
     ):
@@ -1,12 +1,11 @@
-from fastapi import status, HTTPException
+from fastapi import status, HTTPException, Response
 from uuid import UUID
-from typing import List
+from typing import Iterator, List, Optional
 
 
 from app.application.use_cases.practice_test_service import PracticeTestService
+from app.application.abstractions.cache_abstraction import IPayloadCache
 from app.application.dtos.practice_test_dto import (
-    DTOPracticeTestOutput,
-    DTOResultWithPracticeTest,
     # POST
     DTOBaseInfoInput,
     DTOQuestionBaseInput,
@@ -31,17 +30,15 @@ from app.application.exceptions import (
     UserNotAllowError,
     ResultNotFoundError,
     UserNotAllowThisResultError,
+    InvalidCursorError,
+    InvalidSubmissionError,
 )
 
 from app.presentation.schemas.practice_test_schema import (
     PracticeTestOutput,
-    Question,
-    QuestionOptions,
     PracticeTestQuestions,
     PracticeTestDetailOutput,
     # Lịch sử
-    ResultOutput,
-    HistoryOutput,
     ResultWithPracticeTest,
     ResultWithHistory,
     # Thêm
@@ -50,32 +47,37 @@ from app.presentation.schemas.practice_test_schema import (
     UpdatePracticeTestInput,
     DeleteOptions,
 )
+from app.presentation.schemas.pagination_schema import PageOutput
+from app.presentation.json_stream import json_array_chunks
+from app.presentation.projection import Projection
+
+practice_test_output = Projection(PracticeTestOutput)
+practice_test_list = Projection(List[PracticeTestOutput])
+practice_test_page = Projection(PageOutput[PracticeTestOutput])
+practice_test_question = Projection(PracticeTestQuestions)
+practice_test_detail = Projection(PracticeTestDetailOutput)
+history_page = Projection(PageOutput[ResultWithPracticeTest])
+result_with_history = Projection(ResultWithHistory)
 
 
 class PracticeTestController:
-    def __init__(self, service: PracticeTestService):
+    def __init__(self, service: PracticeTestService, detail_cache: IPayloadCache):
         self.service = service
+        self.detail_cache = detail_cache
 
-    def get_user_practice_test(self, user_id: UUID):
+    def get_user_practice_test(self, user_id: UUID, cursor: Optional[str], limit: int):
         try:
-            practiceTests: List[DTOPracticeTestOutput] = (
-                self.service.get_user_practice_test(user_id)
+            return practice_test_page.response(
+                self.service.get_user_practice_test(user_id, cursor, limit)
             )
-            return [
-                PracticeTestOutput(
-                    practice_test_id=practiceTest.practice_test_id,
-                    practice_test_name=practiceTest.practice_test_name,
-                    author_avatar_url=practiceTest.author_avatar_url,
-                    author_username=practiceTest.author_username,
-                )
-                for practiceTest in practiceTests
-            ]
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except PracticeTestsNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
     def get_random_practice_test(self):
         try:
-            return self.service.get_random_practice_test()
+            return practice_test_list.response(self.service.get_random_practice_test())
         except PracticeTestsNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except Exception as e:
@@ -84,79 +86,63 @@ class PracticeTestController:
             )
 
     def get_practice_test_detail_by_id(self, practice_test_id: str):
+        # Chuẩn hoá key cache; id không hợp lệ thì bỏ qua cache
+        try:
+            cache_key = str(UUID(practice_test_id))
+        except ValueError:
+            cache_key = None
+
+        if cache_key:
+            payload, version = self.detail_cache.get(cache_key)
+            if payload is not None:
+                return Response(content=payload, media_type="application/json")
+
         try:
             response = self.service.get_practice_test_detail_by_id(
                 practice_test_id=practice_test_id
             )
-            practice_test = PracticeTestOutput(
-                practice_test_id=response.base_info.practice_test_id,
-                practice_test_name=response.base_info.practice_test_name,
-                author_avatar_url=response.base_info.author_avatar_url,
-                author_username=response.base_info.author_username,
-            )
-
-            questions: List[PracticeTestQuestions] = []
-            for question in response.questions:
-                question_data = Question(
-                    question_id=question.question.question_id,
-                    question_text=question.question.question_text,
-                    question_type=question.question.question_type,
-                )
-                options_data: List[QuestionOptions] = []
-                for option in question.options:
-                    options_data.append(
-                        QuestionOptions(
-                            option_id=option.option_id,
-                            option_text=option.option_text,
-                            is_correct=option.is_correct,
-                        )
-                    )
+        except PracticeTestsNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
-                questions.append(
-                    PracticeTestQuestions(question=question_data, options=options_data)
-                )
+        payload = practice_test_detail.dump(
+            {"practice_test": response.base_info, "questions": response.questions}
+        )
+        if cache_key:
+            self.detail_cache.set(cache_key, payload, version)
+        return Response(content=payload, media_type="application/json")
 
-            return PracticeTestDetailOutput(
-                practice_test=practice_test, questions=questions
+    def stream_practice_test_detail(self, practice_test_id: str) -> Iterator[bytes]:
+        # Chi tiết bài kiểm tra dạng JSON streaming, không qua cache payload
+        try:
+            base_info, questions = self.service.stream_practice_test_detail(
+                UUID(practice_test_id)
             )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
         except PracticeTestsNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
+        prefix = (
+            b'{"practice_test":'
+            + practice_test_output.dump(base_info)
+            + b',"questions":'
+        )
+        items = (practice_test_question.dump(question) for question in questions)
+        return json_array_chunks(prefix, items, b"}")
+
     def get_random_questions_by_id(self, practice_test_id: str, count: int | None):
         try:
             response = self.service.get_random_questions_by_id(
                 practice_test_id=practice_test_id, count=count
             )
-            practice_test = PracticeTestOutput(
-                practice_test_id=response.base_info.practice_test_id,
-                practice_test_name=response.base_info.practice_test_name,
-                author_avatar_url=response.base_info.author_avatar_url,
-                author_username=response.base_info.author_username,
-            )
-
-            questions: List[PracticeTestQuestions] = []
-            for question in response.questions:
-                question_data = Question(
-                    question_id=question.question.question_id,
-                    question_text=question.question.question_text,
-                    question_type=question.question.question_type,
-                )
-                options_data: List[QuestionOptions] = []
-                for option in question.options:
-                    options_data.append(
-                        QuestionOptions(
-                            option_id=option.option_id,
-                            option_text=option.option_text,
-                            is_correct=option.is_correct,
-                        )
-                    )
-
-                questions.append(
-                    PracticeTestQuestions(question=question_data, options=options_data)
-                )
-
-            return PracticeTestDetailOutput(
-                practice_test=practice_test, questions=questions
+            return practice_test_detail.response(
+                {
+                    "practice_test": response.base_info,
+                    "questions": response.questions,
+                    "question_set": self.service.issue_question_set(
+                        practice_test_id, response.questions
+                    ),
+                }
             )
         except PracticeTestsNotFoundError as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -165,81 +151,22 @@ class PracticeTestController:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
-    def get_all_histories(self, user_id: UUID):
-        dto_response: List[DTOResultWithPracticeTest] = self.service.get_all_histories(
-            user_id
-        )
-        response: List[ResultWithPracticeTest] = []
-        for raw in dto_response:
-            result_domain = raw.result
-            base_info_domain = raw.base_info
-
-            result_domain = ResultOutput(
-                result_id=result_domain.result_id,
-                num_of_questions=result_domain.num_of_questions,
-                score=result_domain.score,
-            )
-
-            practice_test_domain = PracticeTestOutput(
-                practice_test_id=base_info_domain.practice_test_id,
-                practice_test_name=base_info_domain.practice_test_name,
-                author_avatar_url=base_info_domain.author_avatar_url,
-                author_username=base_info_domain.author_username,
-            )
-
-            response.append(
-                ResultWithPracticeTest(
-                    result=result_domain, base_info=practice_test_domain
-                )
+    def get_all_histories(self, user_id: UUID, cursor: Optional[str], limit: int):
+        try:
+            return history_page.response(
+                self.service.get_all_histories(user_id, cursor, limit)
             )
-        return response
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     def get_practice_test_history(
         self, user_id: UUID, result_id: UUID, practice_test_id: UUID
     ):
         try:
-            response = self.service.get_practice_test_history(
-                user_id, result_id, practice_test_id
-            )
-            result = ResultOutput(
-                result_id=response.result.result_id,
-                num_of_questions=response.result.num_of_questions,
-                score=response.result.score,
-            )
-            base_info = PracticeTestOutput(
-                practice_test_id=response.base_info.practice_test_id,
-                practice_test_name=response.base_info.practice_test_name,
-                author_avatar_url=response.base_info.author_avatar_url,
-                author_username=response.base_info.author_username,
-            )
-            histories: List[HistoryOutput] = []
-            for history in response.histories:
-                question_detail = history.question_detail
-                question_base = Question(
-                    question_id=question_detail.question.question_id,
-                    question_text=question_detail.question.question_text,
-                    question_type=question_detail.question.question_type,
-                )
-                options = [
-                    QuestionOptions(
-                        option_id=option.option_id,
-                        option_text=option.option_text,
-                        is_correct=option.is_correct,
-                    )
-                    for option in question_detail.options
-                ]
-                histories.append(
-                    HistoryOutput(
-                        history_id=history.history_id,
-                        option_id=history.option_id,
-                        question_detail=PracticeTestQuestions(
-                            question=question_base, options=options
-                        ),
-                    )
+            return result_with_history.response(
+                self.service.get_practice_test_history(
+                    user_id, result_id, practice_test_id
                 )
-
-            return ResultWithHistory(
-                result=result, base_info=base_info, histories=histories
             )
         except UserNotAllowThisResultError:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
@@ -296,10 +223,14 @@ class PracticeTestController:
         dto_submit = DTOSubmitTestInput(
             practice_test_id=payload.practice_test_id,
             answer_questions=dto_answer,
-            num_of_questions=payload.num_of_questions,
-            score=payload.score,
+            question_set=payload.question_set,
         )
-        return self.service.submit_test(user_id=user_id, payload=dto_submit)
+        try:
+            return self.service.submit_test(user_id=user_id, payload=dto_submit)
+        except PracticeTestsNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except InvalidSubmissionError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     def update_practice_test(
         self, user_id: UUID, practice_test_id: UUID, payload: UpdatePracticeTestInput
@@ -1,6 +1,7 @@
 from fastapi import status, HTTPException
 
 from app.application.use_cases.search_service import SearchServices
+from app.application.exceptions import InvalidCursorError
 from app.presentation.schemas.search_schema import SearchInput, SearchOutput
 
 
@@ -14,7 +15,11 @@ class SearchController:
             return SearchOutput(
                 courses=result.get("courses"),
                 practice_tests=result.get("practice_tests"),
+                next_courses_cursor=result.get("next_courses_cursor"),
+                next_practice_tests_cursor=result.get("next_practice_tests_cursor"),
             )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
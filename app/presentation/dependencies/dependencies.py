@@ -1,5 +1,6 @@
 from fastapi import Depends, Request, HTTPException, status
 from uuid import UUID
+from typing import Optional
 
 from app.application.use_cases.search_service import SearchServices
 from app.application.use_cases.auth_service import AuthService
@@ -7,6 +8,7 @@ from app.application.use_cases.user_service import UserServices
 from app.application.use_cases.course_service import CourseService
 from app.application.use_cases.practice_test_service import PracticeTestService
 from app.application.use_cases.admin_service import AdminServices
+from app.application.use_cases.token_auth_service import TokenAuthService
 
 from app.presentation.controllers.search_controller import SearchController
 from app.presentation.controllers.auth_controller import AuthController
@@ -25,6 +27,13 @@ from app.application.abstractions.refresh_token_abstraction import (
 )
 from app.application.abstractions.security_abstraction import ISecurityService
 from app.application.abstractions.auth_abstraction import IAuthService
+from app.application.abstractions.cache_abstraction import (
+    IAnswerKeyCache,
+    IPayloadCache,
+    ITermIndexCache,
+)
+from app.application.abstractions.search_abstraction import ISearchEngine
+from app.application.abstractions.revocation_abstraction import IRevocationStore
 
 from app.infrastructure.config.dependencies import (
     get_course_repo,
@@ -32,25 +41,32 @@ from app.infrastructure.config.dependencies import (
     get_user_repo,
     get_refresh_token_repo,
     get_security_service,
+    get_practice_test_detail_cache,
+    get_course_detail_cache,
+    get_term_index_cache,
+    get_answer_key_cache,
+    get_search_engine,
+    get_revocation_store,
 )
+from app.infrastructure.database.connection import run_db, stream_db
+from app.infrastructure.config.setting import settings
 
-from app.presentation.schemas.user_schema import CurrentUser
+from app.presentation.schemas.user_schema import CurrentUser, UserRole
 
 
-def get_search_service(
-    course_repo: ICourseRepository = Depends(get_course_repo),
-    practice_test_repo: IPracticeTestRepository = Depends(get_practice_test_repo),
+async def get_search_service(
+    search_engine: ISearchEngine = Depends(get_search_engine),
 ):
-    return SearchServices(course_repo, practice_test_repo)
+    return SearchServices(search_engine)
 
 
-def get_search_controller(
+async def get_search_controller(
     service: SearchServices = Depends(get_search_service),
 ) -> SearchController:
     return SearchController(service)
 
 
-def get_auth_service(
+async def get_auth_service(
     user_repo: IUserRepository = Depends(get_user_repo),
     token_repo: IRefreshTokenRepository = Depends(get_refresh_token_repo),
     security_service: ISecurityService = Depends(get_security_service),
@@ -58,63 +74,85 @@ def get_auth_service(
     return AuthService(user_repo, token_repo, security_service)
 
 
-def get_auth_controller(
+async def get_auth_controller(
     service: AuthService = Depends(get_auth_service),
 ) -> AuthController:
     return AuthController(service)
 
 
-def get_user_service(
+async def get_user_service(
     user_repo: IUserRepository = Depends(get_user_repo),
     auth_service: IAuthService = Depends(get_auth_service),
 ) -> UserServices:
     return UserServices(user_repo, auth_service)
 
 
-def get_user_controller(
+async def get_user_controller(
     service: UserController = Depends(get_user_service),
 ) -> UserController:
     return UserController(service)
 
 
-def get_course_service(
+async def get_course_service(
     course_repo: ICourseRepository = Depends(get_course_repo),
     user_repo: IUserRepository = Depends(get_user_repo),
+    term_index: Optional[ITermIndexCache] = Depends(get_term_index_cache),
 ) -> CourseService:
-    return CourseService(course_repo, user_repo)
+    return CourseService(
+        course_repo, user_repo, term_index, test_size=settings.COURSE_TEST_SIZE
+    )
 
 
-def get_course_controller(
+async def get_course_controller(
     service: CourseService = Depends(get_course_service),
+    detail_cache: IPayloadCache = Depends(get_course_detail_cache),
 ) -> CourseController:
-    return CourseController(service)
+    return CourseController(service, detail_cache)
 
 
-def get_practice_test_service(
+async def get_practice_test_service(
     practice_test_repo: IPracticeTestRepository = Depends(get_practice_test_repo),
+    answer_keys: Optional[IAnswerKeyCache] = Depends(get_answer_key_cache),
 ) -> PracticeTestService:
-    return PracticeTestService(practice_test_repo)
+    return PracticeTestService(
+        practice_test_repo,
+        answer_keys,
+        grading_policy=settings.GRADING_POLICY,
+        question_set_secret=settings.JWT_SECRET,
+    )
 
 
-def get_practice_test_controller(
+async def get_practice_test_controller(
     service: PracticeTestService = Depends(get_practice_test_service),
+    detail_cache: IPayloadCache = Depends(get_practice_test_detail_cache),
 ) -> PracticeTestController:
-    return PracticeTestController(service)
+    return PracticeTestController(service, detail_cache)
 
 
-def get_admin_service(
+async def get_admin_service(
     user_repo: IUserRepository = Depends(get_user_repo),
     token_repo: IRefreshTokenRepository = Depends(get_refresh_token_repo),
+    revocation_store: IRevocationStore = Depends(get_revocation_store),
 ) -> AdminServices:
-    return AdminServices(user_repo, token_repo)
+    return AdminServices(user_repo, token_repo, revocation_store)
 
 
-def get_admin_controller(service: AdminServices = Depends(get_admin_service)):
+async def get_admin_controller(service: AdminServices = Depends(get_admin_service)):
     return AdminController(service)
 
 
-def get_current_user(
-    req: Request, controller: UserController = Depends(get_user_controller)
+async def get_token_auth_service(
+    security_service: ISecurityService = Depends(get_security_service),
+    revocation_store: IRevocationStore = Depends(get_revocation_store),
+    user_repo: IUserRepository = Depends(get_user_repo),
+) -> TokenAuthService:
+    # user_repo chỉ được dùng (mở kết nối DB) với token cũ chưa có claim "ver" hoặc
+    # khi danh sách thu hồi không dùng chung giữa các worker
+    return TokenAuthService(security_service, revocation_store, user_repo)
+
+
+async def get_current_user(
+    req: Request, service: TokenAuthService = Depends(get_token_auth_service)
 ) -> CurrentUser:
     authorization = req.headers.get("Authorization")
     if not authorization:
@@ -124,7 +162,18 @@ def get_current_user(
     token = authorization.split(" ")[-1]
 
     try:
-        cur_user = controller.get_access_user(token)
+        payload = service.decode(token)
+        cur_user = service.from_claims(payload)
+        if cur_user is None:
+            cur_user = await run_db(service.from_database, payload)
         return CurrentUser(user_id=cur_user.user_id, role=cur_user.role)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+
+async def get_current_admin(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    return current_user
@@ -0,0 +1,29 @@
+from typing import Iterable, Iterator
+
+# Số phần tử gom vào một chunk của response: mỗi chunk là một lần đọc DB qua run_db
+STREAM_BATCH_ITEMS = 500
+
+
+def json_array_chunks(
+    prefix: bytes,
+    items: Iterable[bytes],
+    suffix: bytes,
+    batch_size: int = STREAM_BATCH_ITEMS,
+) -> Iterator[bytes]:
+    """
+    Ghép prefix + [item, item, ...] + suffix thành các chunk JSON, mỗi chunk tối đa
+    batch_size phần tử, để trả mảng rất lớn mà không dựng cả payload trong bộ nhớ.
+    """
+    parts = [prefix, b"["]
+    count = 0
+    for item in items:
+        if count:
+            parts.append(b",")
+        parts.append(item)
+        count += 1
+        if count % batch_size == 0:
+            yield b"".join(parts)
+            parts = []
+    parts.append(b"]")
+    parts.append(suffix)
+    yield b"".join(parts)
@@ -0,0 +1,47 @@
+from typing import Any, Generic, Optional, Type, TypeVar
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.infrastructure.config.setting import settings
+
+T = TypeVar("T")
+
+
+def default_response_class() -> Type[JSONResponse]:
+    # JSON_RESPONSE_CLASS=orjson: route trả dict / model được serialize bằng orjson
+    if settings.JSON_RESPONSE_CLASS != "orjson":
+        return JSONResponse
+    try:
+        import orjson  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "JSON_RESPONSE_CLASS=orjson yêu cầu cài đặt gói orjson"
+        ) from e
+    return ORJSONResponse
+
+
+class Projection(Generic[T]):
+    """
+    Dựng schema đầu ra thẳng từ output của domain / use case (from_attributes),
+    không chép tay qua DTO trung gian. Ở chế độ raw, response() trả bytes đã
+    serialize để FastAPI không dump rồi validate lại theo response_model lần nữa.
+    """
+
+    def __init__(self, schema: Type[T], raw: Optional[bool] = None):
+        self.adapter = TypeAdapter(schema)
+        # None: theo JSON_RAW_RESPONSES; True / False: bật / tắt riêng cho route này
+        self.raw = raw
+
+    def validate(self, value: Any) -> T:
+        return self.adapter.validate_python(value, from_attributes=True)
+
+    def dump(self, value: Any) -> bytes:
+        return self.adapter.dump_json(self.validate(value))
+
+    def response(self, value: Any) -> Response | T:
+        raw = settings.JSON_RAW_RESPONSES if self.raw is None else self.raw
+        if not raw:
+            return self.validate(value)
+        return Response(content=self.dump(value), media_type="application/json")
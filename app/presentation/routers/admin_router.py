@@ -1,10 +1,13 @@
-from fastapi import Depends, APIRouter, status, Request, File, UploadFile
+from fastapi import Depends, APIRouter, status, Query
 from uuid import UUID
-from typing import List
+from typing import Optional
 
+from app.application.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.presentation.controllers.admin_controller import AdminController
 from app.presentation.schemas.user_schema import UserOut, CurrentUser
+from app.presentation.schemas.pagination_schema import PageOutput
 from app.presentation.dependencies.dependencies import (
+    run_db,
     get_admin_controller,
     get_current_user,
 )
@@ -12,38 +15,48 @@ from app.presentation.dependencies.dependencies import (
 router = APIRouter(prefix="/admin", tags=["ADMIN"])
 
 
-@router.get("/all-users", response_model=List[UserOut], status_code=status.HTTP_200_OK)
-def get_all_users(
+@router.get(
+    "/all-users", response_model=PageOutput[UserOut], status_code=status.HTTP_200_OK
+)
+async def get_all_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: CurrentUser = Depends(get_current_user),
     controller: AdminController = Depends(get_admin_controller),
 ):
     user_id = current_user.user_id
     role = current_user.role.value
-    return controller.get_all_users(user_id, role)
+    return await run_db(controller.get_all_users, user_id, role, cursor, limit)
 
 
 @router.put("/grant-admin", response_model=bool, status_code=status.HTTP_200_OK)
-def grant_admin(
+async def grant_admin(
     user_id: UUID,
     current_user: CurrentUser = Depends(get_current_user),
     controller: AdminController = Depends(get_admin_controller),
 ):
-    return controller.grant_admin(current_user.user_id, current_user.role, user_id)
+    return await run_db(
+        controller.grant_admin, current_user.user_id, current_user.role, user_id
+    )
 
 
 @router.put("/lock-user", response_model=bool, status_code=status.HTTP_200_OK)
-def lock_user(
+async def lock_user(
     user_id: UUID,
     current_user: CurrentUser = Depends(get_current_user),
     controller: AdminController = Depends(get_admin_controller),
 ):
-    return controller.lock_user(current_user.user_id, current_user.role, user_id)
+    return await run_db(
+        controller.lock_user, current_user.user_id, current_user.role, user_id
+    )
 
 
 @router.put("/unlock-user", response_model=bool, status_code=status.HTTP_200_OK)
-def unlock_user(
+async def unlock_user(
     user_id: UUID,
     current_user: CurrentUser = Depends(get_current_user),
     controller: AdminController = Depends(get_admin_controller),
 ):
-    return controller.unlock_user(current_user.user_id, current_user.role, user_id)
+    return await run_db(
+        controller.unlock_user, current_user.user_id, current_user.role, user_id
+    )
@@ -1,18 +1,35 @@
-from fastapi import APIRouter, Depends, status, Body
+from fastapi import (
+    APIRouter,
+    Depends,
+    status,
+    Body,
+    Header,
+    Query,
+    File,
+    Form,
+    UploadFile,
+)
+from fastapi.responses import Response, StreamingResponse
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
+from app.application.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.presentation.controllers.course_controller import CourseController
 from app.presentation.schemas.course_schema import (
     CourseOutput,
     CourseWithDetailsOutput,
     CourseQuestionOutput,
+    CourseSessionOutput,
     NewCourseInput,
     NewCourseDetailInput,
     UpdateCourseRequest,
+    CourseImportOutput,
 )
 from app.presentation.schemas.user_schema import CurrentUser
+from app.presentation.schemas.pagination_schema import PageOutput
 from app.presentation.dependencies.dependencies import (
+    run_db,
+    stream_db,
     get_course_controller,
     get_current_user,
 )
@@ -21,53 +38,92 @@ router = APIRouter(prefix="/course", tags=["COURSE"])
 
 
 @router.get(
-    "/my-course", response_model=List[CourseOutput], status_code=status.HTTP_200_OK
+    "/my-course",
+    response_model=PageOutput[CourseOutput],
+    status_code=status.HTTP_200_OK,
 )
-def get_user_course(
+async def get_user_course(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: CurrentUser = Depends(get_current_user),
     controller: CourseController = Depends(get_course_controller),
 ):
     user_id = current_user.user_id
-    return controller.get_user_course(user_id)
+    return await run_db(controller.get_user_course, user_id, cursor, limit)
 
 
 @router.get(
     "/random", response_model=List[CourseOutput], status_code=status.HTTP_200_OK
 )
-def get_random_courses(controller: CourseController = Depends(get_course_controller)):
-    return controller.get_random_course()
+async def get_random_courses(
+    controller: CourseController = Depends(get_course_controller),
+):
+    return await run_db(controller.get_random_course)
 
 
 @router.get("/", response_model=CourseWithDetailsOutput, status_code=status.HTTP_200_OK)
-def get_coures_detail_by_id(
-    course_id: UUID, controller: CourseController = Depends(get_course_controller)
+async def get_coures_detail_by_id(
+    course_id: UUID,
+    # stream=true: trả JSON từng phần cho học phần rất lớn (bộ nhớ không tăng theo
+    # số thuật ngữ), bỏ qua cache payload
+    stream: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    controller: CourseController = Depends(get_course_controller),
 ):
-    result = controller.get_course_detail_by_id(course_id=course_id)
-    return CourseWithDetailsOutput(
-        course=result.get("course"), course_detail=result.get("course_detail")
+    if stream:
+        headers, chunks = await run_db(
+            controller.stream_course_detail, course_id, if_none_match
+        )
+        if chunks is None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return StreamingResponse(
+            stream_db(chunks), media_type="application/json", headers=headers
+        )
+    return await run_db(
+        controller.get_course_detail_by_id,
+        course_id=course_id,
+        if_none_match=if_none_match,
     )
 
 
 @router.get(
     "/learn", response_model=CourseQuestionOutput, status_code=status.HTTP_200_OK
 )
-def get_course_learn_by_id(
+async def get_course_learn_by_id(
     course_id: str, controller: CourseController = Depends(get_course_controller)
 ):
-    return controller.get_course_learn_by_id(course_id)
+    return await run_db(controller.get_course_learn_by_id, course_id)
 
 
 @router.get(
     "/test", response_model=CourseQuestionOutput, status_code=status.HTTP_200_OK
 )
-def get_course_test_by_id(
-    course_id: str, controller: CourseController = Depends(get_course_controller)
+async def get_course_test_by_id(
+    course_id: str,
+    # Số câu hỏi, mặc định COURSE_TEST_SIZE; học phần ít thuật ngữ hơn thì lấy hết
+    size: Optional[int] = Query(None, ge=1),
+    controller: CourseController = Depends(get_course_controller),
+):
+    return await run_db(controller.get_course_test_by_id, course_id, size)
+
+
+@router.get(
+    "/session", response_model=CourseSessionOutput, status_code=status.HTTP_200_OK
+)
+async def get_course_session(
+    course_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    # Bỏ trống: phiên học toàn bộ thuật ngữ; có size: phiên kiểm tra min(size, n) câu
+    size: Optional[int] = Query(None, ge=1),
+    controller: CourseController = Depends(get_course_controller),
 ):
-    return controller.get_course_test_by_id(course_id)
+    # Không cursor: tạo phiên mới (thứ tự xáo ngẫu nhiên); có cursor: trang tiếp theo
+    return await run_db(controller.get_course_session, course_id, cursor, limit, size)
 
 
 @router.post("/", response_model=bool, status_code=status.HTTP_201_CREATED)
-def create_new_course(
+async def create_new_course(
     course_in: NewCourseInput,
     detail_in: List[NewCourseDetailInput],
     current_user: CurrentUser = Depends(get_current_user),
@@ -75,7 +131,34 @@ def create_new_course(
 ):
     print(detail_in)
     user_id = current_user.user_id
-    return controller.create_new_course(user_id, course_in, detail_in)
+    return await run_db(controller.create_new_course, user_id, course_in, detail_in)
+
+
+@router.post(
+    "/import", response_model=CourseImportOutput, status_code=status.HTTP_201_CREATED
+)
+async def import_course(
+    course_name: str = Form(...),
+    file: UploadFile = File(...),
+    # "csv" hoặc "tsv"; bỏ trống thì đoán theo đuôi file
+    file_format: Optional[str] = Form(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    controller: CourseController = Depends(get_course_controller),
+):
+    user_id = current_user.user_id
+    return await run_db(
+        controller.import_course, user_id, course_name, file, file_format
+    )
+
+
+@router.get("/{course_id}/export", status_code=status.HTTP_200_OK)
+async def export_course(
+    course_id: UUID,
+    file_format: str = Query("tsv", alias="format", pattern="^(csv|tsv)$"),
+    controller: CourseController = Depends(get_course_controller),
+):
+    headers, chunks = await run_db(controller.export_course, course_id, file_format)
+    return StreamingResponse(stream_db(chunks), headers=headers)
 
 
 @router.put(
@@ -83,14 +166,14 @@ def create_new_course(
     response_model=bool,
     status_code=status.HTTP_200_OK,
 )
-def update_course(
+async def update_course(
     course_id: UUID,
     payload: UpdateCourseRequest,
     current_user: CurrentUser = Depends(get_current_user),
     controller: CourseController = Depends(get_course_controller),
 ):
     user_id = current_user.user_id
-    return controller.update_course(user_id, course_id, payload)
+    return await run_db(controller.update_course, user_id, course_id, payload)
 
 
 @router.delete(
@@ -98,21 +181,23 @@ def update_course(
     response_model=bool,
     status_code=status.HTTP_200_OK,
 )
-def delete_course_detail(
+async def delete_course_detail(
     course_id: UUID,
     course_detail_id: List[UUID] = Body(..., embed=True),
     current_user: CurrentUser = Depends(get_current_user),
     controller: CourseController = Depends(get_course_controller),
 ):
     user_id = current_user.user_id
-    return controller.delete_course_detail(user_id, course_id, course_detail_id)
+    return await run_db(
+        controller.delete_course_detail, user_id, course_id, course_detail_id
+    )
 
 
 @router.delete("/{course_id}", response_model=bool, status_code=status.HTTP_200_OK)
-def delete_course(
+async def delete_course(
     course_id: UUID,
     current_user: CurrentUser = Depends(get_current_user),
     controller: CourseController = Depends(get_course_controller),
 ):
     user_id = current_user.user_id
-    return controller.delete_course(user_id, course_id)
+    return await run_db(controller.delete_course, user_id, course_id)
@@ -0,0 +1,93 @@
+import os
+
+from fastapi import APIRouter, Depends, status
+
+from app.presentation.schemas.metrics_schema import (
+    DbPoolMetricsOutput,
+    CacheMetricsOutput,
+    RandomPoolMetricsOutput,
+    RefreshTokenMetricsOutput,
+    TermIndexMetricsOutput,
+    SubmissionMetricsOutput,
+)
+from app.infrastructure.config.dependencies import (
+    get_db_pool_metrics,
+    get_cache_metrics,
+    get_answer_key_metrics,
+    get_random_pool_metrics,
+    get_refresh_token_metrics,
+    get_term_index_metrics,
+    get_submission_metrics,
+)
+from app.infrastructure.config.setting import settings
+from app.presentation.dependencies.dependencies import get_current_admin
+
+# Số liệu vận hành (pool, cache, hàng đợi) chỉ dành cho ADMIN
+router = APIRouter(
+    prefix="/metrics", tags=["METRICS"], dependencies=[Depends(get_current_admin)]
+)
+
+
+@router.get(
+    "/db-pool", response_model=DbPoolMetricsOutput, status_code=status.HTTP_200_OK
+)
+async def get_db_pool_metrics_endpoint(metrics: dict = Depends(get_db_pool_metrics)):
+    # Số liệu của worker đã nhận request này
+    return metrics
+
+
+@router.get("/cache", response_model=CacheMetricsOutput, status_code=status.HTTP_200_OK)
+async def get_cache_metrics_endpoint(
+    caches: dict = Depends(get_cache_metrics),
+    answer_key: dict = Depends(get_answer_key_metrics),
+):
+    # Với backend memory, số liệu chỉ thuộc về worker hiện tại
+    return {"pid": os.getpid(), "caches": caches, "answer_key": answer_key}
+
+
+@router.get(
+    "/random-pool",
+    response_model=RandomPoolMetricsOutput,
+    status_code=status.HTTP_200_OK,
+)
+async def get_random_pool_metrics_endpoint(
+    pools: dict = Depends(get_random_pool_metrics),
+):
+    # Pool ngẫu nhiên nằm trong bộ nhớ của từng worker
+    return {"pid": os.getpid(), "pools": pools}
+
+
+@router.get(
+    "/refresh-tokens",
+    response_model=RefreshTokenMetricsOutput,
+    status_code=status.HTTP_200_OK,
+)
+async def get_refresh_token_metrics_endpoint(
+    metrics: dict = Depends(get_refresh_token_metrics),
+):
+    # Mỗi worker có lịch quét riêng
+    return {"pid": os.getpid(), **metrics}
+
+
+@router.get(
+    "/term-index",
+    response_model=TermIndexMetricsOutput,
+    status_code=status.HTTP_200_OK,
+)
+async def get_term_index_metrics_endpoint(
+    index: dict = Depends(get_term_index_metrics),
+):
+    # Index gần nghĩa nằm trong bộ nhớ của từng worker
+    return {"pid": os.getpid(), "mode": settings.DISTRACTOR_MODE, "index": index}
+
+
+@router.get(
+    "/submissions",
+    response_model=SubmissionMetricsOutput,
+    status_code=status.HTTP_200_OK,
+)
+async def get_submission_metrics_endpoint(
+    queue: dict = Depends(get_submission_metrics),
+):
+    # Mỗi worker có hàng đợi bài nộp riêng
+    return {"pid": os.getpid(), "queue": queue}
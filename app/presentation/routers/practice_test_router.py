@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, status, Body
+from fastapi import APIRouter, Depends, status, Body, Query
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 from typing import List, Optional
 
+from app.application.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.presentation.controllers.practice_test_controller import PracticeTestController
 from app.presentation.schemas.practice_test_schema import (
     PracticeTestOutput,
@@ -17,7 +19,10 @@ from app.presentation.schemas.practice_test_schema import (
     DeleteOptions,
 )
 from app.presentation.schemas.user_schema import CurrentUser
+from app.presentation.schemas.pagination_schema import PageOutput
 from app.presentation.dependencies.dependencies import (
+    run_db,
+    stream_db,
     get_practice_test_controller,
     get_current_user,
 )
@@ -27,15 +32,17 @@ router = APIRouter(prefix="/practice-test", tags=["PRACTICETEST"])
 
 @router.get(
     "/my-practice-tests",
-    response_model=List[PracticeTestOutput],
+    response_model=PageOutput[PracticeTestOutput],
     status_code=status.HTTP_200_OK,
 )
-def get_user_practice_test(
+async def get_user_practice_test(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.get_user_practice_test(user_id)
+    return await run_db(controller.get_user_practice_test, user_id, cursor, limit)
 
 
 @router.get(
@@ -43,20 +50,27 @@ def get_user_practice_test(
     response_model=List[PracticeTestOutput],
     status_code=status.HTTP_200_OK,
 )
-def get_random_courses(
+async def get_random_courses(
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
-    return controller.get_random_practice_test()
+    return await run_db(controller.get_random_practice_test)
 
 
 @router.get(
     "/", response_model=PracticeTestDetailOutput, status_code=status.HTTP_200_OK
 )
-def get_detail(
+async def get_detail(
     practice_test_id: str,
+    # stream=true: trả JSON từng phần cho bài kiểm tra rất lớn, bỏ qua cache payload
+    stream: bool = False,
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
-    return controller.get_practice_test_detail_by_id(practice_test_id=practice_test_id)
+    if stream:
+        chunks = await run_db(controller.stream_practice_test_detail, practice_test_id)
+        return StreamingResponse(stream_db(chunks), media_type="application/json")
+    return await run_db(
+        controller.get_practice_test_detail_by_id, practice_test_id=practice_test_id
+    )
 
 
 @router.get(
@@ -64,25 +78,27 @@ def get_detail(
     response_model=PracticeTestDetailOutput,
     status_code=status.HTTP_200_OK,
 )
-def getrandom_questions(
+async def getrandom_questions(
     practice_test_id: UUID,
     count: Optional[int] = None,
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
-    return controller.get_random_questions_by_id(practice_test_id, count)
+    return await run_db(controller.get_random_questions_by_id, practice_test_id, count)
 
 
 @router.get(
     "/history",
-    response_model=List[ResultWithPracticeTest],
+    response_model=PageOutput[ResultWithPracticeTest],
     status_code=status.HTTP_200_OK,
 )
-def get_all_histories(
+async def get_all_histories(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.get_all_histories(user_id)
+    return await run_db(controller.get_all_histories, user_id, cursor, limit)
 
 
 @router.get(
@@ -90,45 +106,49 @@ def get_all_histories(
     response_model=ResultWithHistory,
     status_code=status.HTTP_200_OK,
 )
-def get_practice_test_history(
+async def get_practice_test_history(
     practice_test_id: UUID,
     result_id: UUID,
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.get_practice_test_history(user_id, result_id, practice_test_id)
+    return await run_db(
+        controller.get_practice_test_history, user_id, result_id, practice_test_id
+    )
 
 
 @router.post("/", response_model=bool, status_code=status.HTTP_201_CREATED)
-def create_new_practice_test(
+async def create_new_practice_test(
     payload: NewPracticeTestInput,
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.create_new_practice_test(user_id, payload)
+    return await run_db(controller.create_new_practice_test, user_id, payload)
 
 
 @router.post("/submit-test", response_model=UUID, status_code=status.HTTP_201_CREATED)
-def create_test_result(
+async def create_test_result(
     payload: SubmitTestInput,
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.submit_test(user_id, payload)
+    return await run_db(controller.submit_test, user_id, payload)
 
 
 @router.put("/{practice_test_id}", response_model=bool, status_code=status.HTTP_200_OK)
-def update_practice_test(
+async def update_practice_test(
     practice_test_id: UUID,
     payload: UpdatePracticeTestInput,
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.update_practice_test(user_id, practice_test_id, payload)
+    return await run_db(
+        controller.update_practice_test, user_id, practice_test_id, payload
+    )
 
 
 @router.delete(
@@ -136,14 +156,14 @@ def update_practice_test(
     response_model=bool,
     status_code=status.HTTP_200_OK,
 )
-def delete_option(
+async def delete_option(
     practice_test_id: UUID,
     payload: List[DeleteOptions],
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.delete_option(user_id, practice_test_id, payload)
+    return await run_db(controller.delete_option, user_id, practice_test_id, payload)
 
 
 @router.delete(
@@ -151,23 +171,25 @@ def delete_option(
     response_model=bool,
     status_code=status.HTTP_200_OK,
 )
-def delete_question(
+async def delete_question(
     practice_test_id: UUID,
     question_id: List[UUID] = Body(..., embed=True),
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.delete_question(user_id, practice_test_id, question_id)
+    return await run_db(
+        controller.delete_question, user_id, practice_test_id, question_id
+    )
 
 
 @router.delete(
     "/{practice_test_id}", response_model=bool, status_code=status.HTTP_200_OK
 )
-def delete_practice_test(
+async def delete_practice_test(
     practice_test_id: UUID,
     current_user: CurrentUser = Depends(get_current_user),
     controller: PracticeTestController = Depends(get_practice_test_controller),
 ):
     user_id = current_user.user_id
-    return controller.delete_practice_test(user_id, practice_test_id)
+    return await run_db(controller.delete_practice_test, user_id, practice_test_id)
@@ -31,6 +31,11 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+
+
 class TokenData(BaseModel):
     sub: str | None = None
     role: str | None = None
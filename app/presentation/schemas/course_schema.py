@@ -37,6 +37,14 @@ class CourseQuestionOutput(TypedDict):
     questions: List[LearnQuestionOutput]
 
 
+class CourseSessionOutput(TypedDict):
+    course: CourseOutput
+    questions: List[LearnQuestionOutput]
+    # Số câu của cả phiên; trang tiếp theo lấy bằng ?cursor=next_cursor
+    total: int
+    next_cursor: Optional[str]
+
+
 # Tạo mới
 class NewCourseInput(BaseModel):
     course_name: str
@@ -47,6 +55,11 @@ class NewCourseDetailInput(BaseModel):
     definition: str
 
 
+class CourseImportOutput(BaseModel):
+    course_id: UUID
+    num_of_terms: int
+
+
 # Sửa
 class UpdateCourseInput(BaseModel):
     course_name: str
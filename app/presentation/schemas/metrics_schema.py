@@ -0,0 +1,102 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class DbPoolMetricsOutput(BaseModel):
+    pid: int
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    peak_checked_out: int
+    peak_overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class PayloadCacheStats(BaseModel):
+    backend: str
+    entries: int
+    hits: int
+    misses: int
+    invalidations: int
+    hit_ratio: float
+
+
+class AnswerKeyCacheStats(BaseModel):
+    backend: str
+    entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class CacheMetricsOutput(BaseModel):
+    pid: int
+    caches: Dict[str, PayloadCacheStats]
+    answer_key: AnswerKeyCacheStats
+
+
+class RandomPoolStats(BaseModel):
+    size: int
+    capacity: int
+    age_seconds: Optional[float]
+    refreshes: int
+
+
+class RandomPoolMetricsOutput(BaseModel):
+    pid: int
+    pools: Dict[str, RandomPoolStats]
+
+
+class RefreshTokenSweepStats(BaseModel):
+    runs: int
+    last_run_at: Optional[datetime]
+    last_duration_ms: Optional[float]
+    last_deleted: int
+    last_batches: int
+    total_deleted: int
+    table_rows: Optional[int]
+
+
+class RefreshTokenMetricsOutput(BaseModel):
+    pid: int
+    sweep: RefreshTokenSweepStats
+
+
+class TermIndexStats(BaseModel):
+    entries: int
+    capacity: int
+    terms: int
+    hits: int
+    builds: int
+    updates: int
+
+
+class TermIndexMetricsOutput(BaseModel):
+    pid: int
+    mode: str
+    index: TermIndexStats
+
+
+class SubmissionQueueStats(BaseModel):
+    mode: str
+    pending: int
+    max_pending: int
+    flushed: int
+    batches: int
+    replayed: int
+    rejected: int
+    errors: int
+    dead_letter: int
+    last_batch_size: int
+    last_flush_ms: Optional[float]
+
+
+class SubmissionMetricsOutput(BaseModel):
+    pid: int
+    queue: SubmissionQueueStats
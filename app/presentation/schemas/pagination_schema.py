@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PageOutput(BaseModel, Generic[T]):
+    items: List[T]
+    # None khi đã hết dữ liệu; gửi lại qua ?cursor= để lấy trang tiếp theo
+    next_cursor: Optional[str] = None
@@ -38,6 +38,8 @@ class PracticeTestQuestions(BaseModel):
 class PracticeTestDetailOutput(BaseModel):
     practice_test: PracticeTestOutput
     questions: List[PracticeTestQuestions]
+    # Chỉ có ở /random-questions: gửi lại nguyên văn khi nộp bài
+    question_set: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -100,8 +102,11 @@ class AnsweredQuestion(BaseModel):
 class SubmitTestInput(BaseModel):
     practice_test_id: UUID
     answer_questions: List[AnsweredQuestion]
-    num_of_questions: int
-    score: int
+    # question_set nhận từ /random-questions; không gửi thì chấm trên cả bài
+    question_set: Optional[str] = None
+    # Bỏ qua: server tự chấm; giữ lại để client cũ vẫn gửi được
+    num_of_questions: Optional[int] = None
+    score: Optional[int] = None
 
 
 # Sửa
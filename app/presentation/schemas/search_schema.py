@@ -1,12 +1,17 @@
 from pydantic import BaseModel, Field, ConfigDict
 from uuid import UUID
-from typing import List
+from typing import List, Optional
+
+from app.application.pagination import MAX_PAGE_SIZE
 
 
 class SearchInput(BaseModel):
     keyword: str = Field()
     type: str = Field(default="all")
+    # cursor lấy từ next_*_cursor của trang trước; cursor_id (id thô) giữ cho client cũ
+    cursor: str | None = Field(default=None)
     cursor_id: str | None = Field(default=None)
+    limit: int = Field(default=12, ge=1, le=MAX_PAGE_SIZE)
 
 
 class CourseOutput(BaseModel):
@@ -31,3 +36,5 @@ class PracticeTestOutput(BaseModel):
 class SearchOutput(BaseModel):
     courses: List[CourseOutput]
     practice_tests: List[PracticeTestOutput]
+    next_courses_cursor: Optional[str] = None
+    next_practice_tests_cursor: Optional[str] = None
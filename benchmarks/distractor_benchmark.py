@@ -0,0 +1,84 @@
+"""
+Đo thời gian dựng câu hỏi chế độ học (mỗi thuật ngữ một câu, 3 đáp án nhiễu) của
+học phần n thuật ngữ (không cần database):
+
+    python benchmarks/distractor_benchmark.py --terms 100 1000 10000
+
+- legacy: cách cũ, dựng lại pool loại trừ câu hiện tại cho mỗi câu rồi
+  random.sample, O(n^2); bỏ qua khi n > --legacy-max-terms
+- python / numpy: app/application/distractor_engine.py, O(n)
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.entities.course.course_detail_entity import CourseDetailOutput
+from app.application.distractor_engine import np, sample_distractors
+
+
+def legacy(course_detail):
+    questions = []
+    for current in course_detail:
+        pool = [item for item in course_detail if item != current]
+        questions.append({"question": current, "options": random.sample(pool, 3)})
+    return questions
+
+
+def engine(use_numpy: bool):
+    def build(course_detail):
+        distractors = sample_distractors(len(course_detail), use_numpy=use_numpy)
+        return [
+            {"question": current, "options": [course_detail[j] for j in picks]}
+            for current, picks in zip(course_detail, distractors)
+        ]
+
+    return build
+
+
+def measure(build, course_detail, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build(course_detail)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(args):
+    modes = {"legacy": legacy, "python": engine(False)}
+    if np is not None:
+        modes["numpy"] = engine(True)
+    else:
+        print("Chưa cài numpy: bỏ qua chế độ numpy")
+
+    for terms in args.terms:
+        course_detail = [
+            CourseDetailOutput(
+                course_detail_id=uuid4(), term=f"Thuật ngữ {i}", definition=f"Nghĩa {i}"
+            )
+            for i in range(terms)
+        ]
+        results = []
+        for mode, build in modes.items():
+            if mode == "legacy" and terms > args.legacy_max_terms:
+                results.append(f"{mode}={'-':>10}")
+                continue
+            # legacy chậm nên chỉ chạy một lần
+            repeat = 1 if mode == "legacy" else args.repeat
+            results.append(f"{mode}={measure(build, course_detail, repeat):8.1f}ms")
+        print(f"terms={terms:<6} " + "  ".join(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--legacy-max-terms", type=int, default=10000)
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+"""
+Đo số lượt nộp bài chấm được mỗi giây với đáp án đã cache (không cần database):
+
+    python benchmarks/grading_benchmark.py --questions 10 50 200
+
+Mỗi bài kiểm tra có 1/3 câu SINGLE_CHOICE, 1/3 MULTIPLE_CHOICE, 1/3 TRUE_FALSE;
+lượt nộp chọn đáp án ngẫu nhiên. Chạy với mọi chính sách chấm điểm.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.grading_engine import GRADING_POLICIES, QuestionKey, grade
+
+QUESTION_TYPES = ("SINGLE_CHOICE", "MULTIPLE_CHOICE", "TRUE_FALSE")
+
+
+def make_answer_key(questions: int, options: int, rng: random.Random):
+    answer_key = {}
+    for i in range(questions):
+        question_type = QUESTION_TYPES[i % len(QUESTION_TYPES)]
+        option_ids = [
+            uuid4() for _ in range(2 if question_type == "TRUE_FALSE" else options)
+        ]
+        if question_type == "MULTIPLE_CHOICE":
+            correct = rng.sample(option_ids, rng.randint(1, len(option_ids)))
+        else:
+            correct = [rng.choice(option_ids)]
+        answer_key[uuid4()] = QuestionKey(
+            question_type=question_type,
+            correct=frozenset(correct),
+            options=frozenset(option_ids),
+        )
+    return answer_key
+
+
+def make_submission(answer_key, rng: random.Random):
+    answers = []
+    for question_id, question in answer_key.items():
+        options = list(question.options)
+        if question.question_type == "MULTIPLE_CHOICE":
+            picks = rng.sample(options, rng.randint(0, len(options)))
+        else:
+            picks = [rng.choice(options)]
+        answers.append((question_id, picks or None))
+    return answers
+
+
+def main(args):
+    rng = random.Random(0)
+    for questions in args.questions:
+        answer_key = make_answer_key(questions, args.options, rng)
+        submissions = [
+            make_submission(answer_key, rng) for _ in range(args.submissions)
+        ]
+        results = []
+        for policy in GRADING_POLICIES:
+            started = time.perf_counter()
+            for answers in submissions:
+                grade(answer_key, answers, policy)
+            elapsed = time.perf_counter() - started
+            results.append(f"{policy}={len(submissions) / elapsed:9.0f}/s")
+        print(f"questions={questions:<5} " + "  ".join(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--submissions", type=int, default=5000)
+    main(parser.parse_args())
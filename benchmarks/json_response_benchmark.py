@@ -0,0 +1,149 @@
+"""
+So sánh chi phí serialize response của các route chi tiết bài kiểm tra, học phần
+(learn) và lịch sử làm bài theo từng chế độ (không cần database):
+
+    python benchmarks/json_response_benchmark.py --questions 10 100 1000
+
+- model+json: controller trả model, FastAPI validate lại theo response_model,
+  serialize ra dict rồi json.dumps (JSON_RAW_RESPONSES=false, mặc định cũ)
+- model+orjson: như trên nhưng JSON_RESPONSE_CLASS=orjson
+- raw: controller trả bytes từ dump_json của schema (JSON_RAW_RESPONSES=true)
+
+Response field của từng route lấy từ chính app, nên kiểu response_model khớp với
+bản chạy thật.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.main import app
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.course.course_detail_entity import CourseDetailOutput
+from app.presentation.controllers.course_controller import course_questions
+from app.presentation.controllers.practice_test_controller import (
+    practice_test_detail,
+    result_with_history,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from read_projection_benchmark import make_detail, make_history
+
+
+def make_learn(questions: int, options: int):
+    details = [
+        CourseDetailOutput(
+            course_detail_id=uuid4(),
+            term=f"Thuật ngữ {i}",
+            definition=f"Định nghĩa {i}",
+        )
+        for i in range(questions)
+    ]
+    return {
+        "course": CourseOutput(
+            course_id=uuid4(),
+            course_name="Học phần",
+            author_avatar_url="",
+            author_username="bench",
+            author_role="TEACHER",
+            num_of_terms=questions,
+        ),
+        "questions": [
+            {
+                "question": detail,
+                "options": [details[(i + j) % questions] for j in range(1, options)],
+            }
+            for i, detail in enumerate(details)
+        ],
+    }
+
+
+def detail_content(questions: int, options: int):
+    response = make_detail(questions, options)
+    return {"practice_test": response.base_info, "questions": response.questions}
+
+
+ENDPOINTS = {
+    "detail": ("/api/practice-test/", practice_test_detail, detail_content),
+    "learn": ("/api/course/learn", course_questions, make_learn),
+    "history": (
+        "/api/practice-test/history/{practice_test_id}",
+        result_with_history,
+        make_history,
+    ),
+}
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if getattr(route, "path", None) == path and "GET" in route.methods:
+            return route.response_field
+    raise SystemExit(f"Không tìm thấy route {path}")
+
+
+def model_mode(response_class):
+    def build(field, projection, content) -> bytes:
+        model = projection.validate(content)
+        # Như fastapi.routing.serialize_response với pydantic v2
+        value, errors = field.validate(model, {}, loc=("response",))
+        assert not errors
+        return response_class(field.serialize(value)).body
+
+    return build
+
+
+def raw_mode(field, projection, content) -> bytes:
+    return projection.dump(content)
+
+
+MODES = {
+    "model+json": model_mode(JSONResponse),
+    "model+orjson": model_mode(ORJSONResponse),
+    "raw": raw_mode,
+}
+
+
+def measure(build, field, projection, content, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build(field, projection, content)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(args):
+    for name, (path, projection, make) in ENDPOINTS.items():
+        field = response_field(path)
+        for questions in args.questions:
+            content = make(questions, args.options)
+            bodies = [build(field, projection, content) for build in MODES.values()]
+            # Mọi chế độ phải cho cùng một JSON
+            assert all(json.loads(body) == json.loads(bodies[0]) for body in bodies)
+            results = {
+                mode: measure(build, field, projection, content, args.repeat)
+                for mode, build in MODES.items()
+            }
+            print(
+                f"{name:<8} questions={questions:<5} "
+                + "  ".join(
+                    f"{mode}={elapsed:8.2f}ms" for mode, elapsed in results.items()
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
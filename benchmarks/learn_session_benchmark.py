@@ -0,0 +1,86 @@
+"""
+So sánh /api/course/learn (câu hỏi cho mọi thuật ngữ trong một response) với một
+trang của /api/course/session theo số thuật ngữ (không cần database):
+
+    python benchmarks/learn_session_benchmark.py --terms 100 1000 10000
+
+Mỗi chế độ tính cả dựng câu hỏi lẫn serialize JSON; in thêm kích thước response.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.use_cases.course_service import CourseService
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.course.course_detail_entity import CourseDetailOutput
+from app.presentation.controllers.course_controller import (
+    course_questions,
+    course_session,
+)
+
+
+def measure(run, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(body)
+
+
+def main(args):
+    service = CourseService(None, None)
+    for terms in args.terms:
+        course = CourseOutput(
+            course_id=uuid4(),
+            course_name="Học phần",
+            author_avatar_url="",
+            author_username="bench",
+            author_role="TEACHER",
+            num_of_terms=terms,
+        )
+        course_detail = [
+            CourseDetailOutput(
+                course_detail_id=uuid4(),
+                term=f"Thuật ngữ {i}",
+                definition=f"Định nghĩa {i}",
+            )
+            for i in range(terms)
+        ]
+        results = {
+            "learn": measure(
+                lambda: course_questions.dump(
+                    service.build_course_learn(course, course_detail)
+                ),
+                args.repeat,
+            ),
+            "session": measure(
+                lambda: course_session.dump(
+                    service.build_course_session(
+                        course, course_detail, '"v"', limit=args.limit
+                    )
+                ),
+                args.repeat,
+            ),
+        }
+        print(
+            f"terms={terms:<6} "
+            + "  ".join(
+                f"{mode}={elapsed:8.2f}ms/{size / 1024:8.1f}KiB"
+                for mode, (elapsed, size) in results.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    main(parser.parse_args())
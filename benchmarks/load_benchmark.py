@@ -0,0 +1,82 @@
+"""
+Đo thông lượng (req/s) của các endpoint đọc nóng trên một server đang chạy.
+
+Chạy server hai lần (DB_ASYNC_MODE=false rồi DB_ASYNC_MODE=true) và so sánh:
+
+    uvicorn app.main:app --workers 1
+    python benchmarks/load_benchmark.py --base-url http://127.0.0.1:8000 \
+        --practice-test-id <uuid> --keyword toan --concurrency 200 --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient, path: str, params: dict, total: int, concurrency: int
+):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                res = await client.get(path, params=params)
+                if res.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+    print(
+        f"{path:<24} {total / elapsed:>9.1f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:.1f}ms  "
+        f"p99={p99 * 1000:.1f}ms  errors={errors}"
+    )
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        await run_endpoint(
+            client,
+            "/api/practice-test/",
+            {"practice_test_id": args.practice_test_id},
+            args.requests,
+            args.concurrency,
+        )
+        await run_endpoint(
+            client,
+            "/api/search/",
+            {"keyword": args.keyword, "type": "all"},
+            args.requests,
+            args.concurrency,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--practice-test-id", required=True)
+    parser.add_argument("--keyword", default="a")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Đo số lần đăng nhập (bcrypt verify) mỗi giây trên một core và qua process pool
+(không cần database):
+
+    python benchmarks/password_hash_benchmark.py --rounds 10 11 12 --workers 1 2 4
+
+Cột "per core" là thông lượng khi băm ngay trên thread gọi; "pool" là thông lượng
+của PasswordHasherPool với --clients luồng gửi đồng thời, kèm số request bị từ chối
+(503) khi hàng đợi đầy.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext
+
+from app.infrastructure.config.password_hasher import (
+    PasswordHasherPool,
+    verify_password,
+)
+
+PASSWORD = "mat-khau-benchmark"
+
+
+def per_core(context: CryptContext, hashed: str, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        context.verify(PASSWORD, hashed)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def through_pool(
+    hashed: str, workers: int, clients: int, max_pending: int, requests: int
+):
+    pool = PasswordHasherPool(workers, max_pending)
+    # Khởi động process trước khi đo
+    pool.run(verify_password, PASSWORD, hashed)
+
+    done = 0
+    rejected = 0
+    lock = threading.Lock()
+
+    def client(n: int):
+        nonlocal done, rejected
+        for _ in range(n):
+            try:
+                pool.run(verify_password, PASSWORD, hashed)
+                with lock:
+                    done += 1
+            except Exception:
+                with lock:
+                    rejected += 1
+                time.sleep(0.01)
+
+    threads = [
+        threading.Thread(target=client, args=(requests // clients,))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    pool.shutdown()
+    return done / elapsed, rejected
+
+
+def main(args):
+    print(f"cpu={os.cpu_count()}")
+    for rounds in args.rounds:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        hashed = context.hash(PASSWORD)
+        # verify_password trong process con dùng cost của chính hash
+        print(
+            f"rounds={rounds:<3} per core={per_core(context, hashed, args.seconds):8.1f}/s"
+        )
+        for workers in args.workers:
+            rate, rejected = through_pool(
+                hashed, workers, args.clients, args.max_pending, args.requests
+            )
+            print(
+                f"           pool workers={workers:<3} {rate:8.1f}/s  "
+                f"rejected={rejected}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=160)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    main(parser.parse_args())
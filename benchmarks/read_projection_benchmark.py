@@ -0,0 +1,243 @@
+"""
+So sánh chi phí dựng JSON đầu ra của các API đọc (không cần database):
+
+    python benchmarks/read_projection_benchmark.py --questions 10 100 1000
+
+- legacy: cách cũ, chép tay output domain sang DTO rồi sang schema, sau đó FastAPI
+  dump model ra dict, validate lại theo response_model và serialize
+- projection: schema validate thẳng từ output domain (from_attributes) rồi
+  serialize ra bytes một lần (app/presentation/projection.py)
+
+Đo trên chi tiết lịch sử làm bài (GET /practice-test/history/{id}, đường có nhiều
+lớp chép nhất) và chi tiết bài kiểm tra; mỗi câu hỏi có --options đáp án.
+"peak" là bộ nhớ cấp phát cao nhất trong lúc dựng một response (tracemalloc).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+
+from app.domain.entities.practice_test.practice_test_entity import PracticeTestOutput
+from app.domain.entities.practice_test.practice_test_question_entity import (
+    QuestionOutput,
+    QuestionWithOptionsOutput,
+)
+from app.domain.entities.practice_test.answer_option_entity import AnswerOptionOutput
+from app.domain.entities.practice_test.practice_test_histories import HistoryOutput
+from app.domain.entities.practice_test.practice_test_results_entity import (
+    ResultOutput,
+    ResultWithHistory,
+)
+from app.application.abstractions.practice_test_abstraction import (
+    PraceticeTestWithDetailsResponse,
+    QuestionDetailOutput,
+)
+from app.presentation.controllers.practice_test_controller import (
+    practice_test_detail,
+    result_with_history,
+)
+from app.presentation.schemas import practice_test_schema as schema
+
+
+def make_options(options: int):
+    return [
+        AnswerOptionOutput(
+            option_id=uuid4(), option_text=f"Đáp án {j}", is_correct=j == 0
+        )
+        for j in range(options)
+    ]
+
+
+def make_question(i: int) -> QuestionOutput:
+    return QuestionOutput(
+        question_id=uuid4(),
+        question_text=f"Câu hỏi số {i}",
+        question_type="SINGLE_CHOICE",
+    )
+
+
+def make_base_info() -> PracticeTestOutput:
+    return PracticeTestOutput(
+        practice_test_id=uuid4(),
+        practice_test_name="Bài kiểm tra",
+        author_avatar_url="",
+        author_username="bench",
+    )
+
+
+def make_history(questions: int, options: int) -> ResultWithHistory:
+    histories = []
+    for i in range(questions):
+        detail = QuestionWithOptionsOutput(
+            question=make_question(i), options=make_options(options)
+        )
+        histories.append(
+            HistoryOutput(
+                history_id=uuid4(),
+                option_id=[detail.options[0].option_id],
+                question_detail=detail,
+            )
+        )
+    return ResultWithHistory(
+        result=ResultOutput(result_id=uuid4(), num_of_questions=questions, score=0),
+        base_info=make_base_info(),
+        histories=histories,
+    )
+
+
+def make_detail(questions: int, options: int) -> PraceticeTestWithDetailsResponse:
+    return PraceticeTestWithDetailsResponse(
+        base_info=make_base_info(),
+        questions=[
+            QuestionDetailOutput(
+                question=make_question(i), options=make_options(options)
+            )
+            for i in range(questions)
+        ],
+    )
+
+
+# Cách cũ: DTO trong application/dtos có cùng trường với schema nên dùng lại schema
+def copy_base_info(base_info):
+    return schema.PracticeTestOutput(
+        practice_test_id=base_info.practice_test_id,
+        practice_test_name=base_info.practice_test_name,
+        author_avatar_url=base_info.author_avatar_url,
+        author_username=base_info.author_username,
+    )
+
+
+def copy_question(question, options):
+    return schema.PracticeTestQuestions(
+        question=schema.Question(
+            question_id=question.question_id,
+            question_text=question.question_text,
+            question_type=question.question_type,
+        ),
+        options=[
+            schema.QuestionOptions(
+                option_id=option.option_id,
+                option_text=option.option_text,
+                is_correct=option.is_correct,
+            )
+            for option in options
+        ],
+    )
+
+
+def copy_history(response):
+    return schema.ResultWithHistory(
+        result=schema.ResultOutput(
+            result_id=response.result.result_id,
+            num_of_questions=response.result.num_of_questions,
+            score=response.result.score,
+        ),
+        base_info=copy_base_info(response.base_info),
+        histories=[
+            schema.HistoryOutput(
+                history_id=history.history_id,
+                option_id=history.option_id,
+                question_detail=copy_question(
+                    history.question_detail.question, history.question_detail.options
+                ),
+            )
+            for history in response.histories
+        ],
+    )
+
+
+history_response_model = TypeAdapter(schema.ResultWithHistory)
+
+
+def legacy_history(response: ResultWithHistory) -> bytes:
+    dto = copy_history(response)  # service: domain -> DTO
+    output = copy_history(dto)  # controller: DTO -> schema
+    # FastAPI với response_model: dump, validate lại rồi JSONResponse.render
+    content = history_response_model.validate_python(output.model_dump())
+    return json.dumps(
+        history_response_model.dump_python(content, mode="json"),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def legacy_detail(response: PraceticeTestWithDetailsResponse) -> bytes:
+    return (
+        schema.PracticeTestDetailOutput(
+            practice_test=copy_base_info(response.base_info),
+            questions=[
+                copy_question(question.question, question.options)
+                for question in response.questions
+            ],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def projection_history(response: ResultWithHistory) -> bytes:
+    return result_with_history.dump(response)
+
+
+def projection_detail(response: PraceticeTestWithDetailsResponse) -> bytes:
+    return practice_test_detail.dump(
+        {"practice_test": response.base_info, "questions": response.questions}
+    )
+
+
+CASES = {
+    "history": (make_history, legacy_history, projection_history),
+    "detail": (make_detail, legacy_detail, projection_detail),
+}
+
+
+def measure(build, response, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build(response)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    build(response)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak / 1024
+
+
+def main(args):
+    for name, (make, legacy, projection) in CASES.items():
+        for questions in args.questions:
+            response = make(questions, args.options)
+            # Hai cách phải cho cùng một JSON
+            assert json.loads(legacy(response)) == json.loads(projection(response))
+            results = {
+                "legacy": measure(legacy, response, args.repeat),
+                "projection": measure(projection, response, args.repeat),
+            }
+            print(
+                f"{name:<8} questions={questions:<5} "
+                + "  ".join(
+                    f"{mode}={elapsed:8.2f}ms peak={peak:9.1f}KiB"
+                    for mode, (elapsed, peak) in results.items()
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
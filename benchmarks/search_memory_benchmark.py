@@ -0,0 +1,132 @@
+"""
+Đo bộ nhớ và độ trễ của backend tìm kiếm "memory" (không cần database).
+
+    python benchmarks/search_memory_benchmark.py --courses 10000 --terms 30 \
+        --practice-tests 10000 --vocabulary 20000
+
+Dữ liệu sinh ngẫu nhiên với tần suất từ theo Zipf; "memory: index" là phần bộ nhớ
+do index cấp phát (không tính output của document vốn đã có trước khi dựng).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.entities.course.course_entity import CourseOutput
+from app.domain.entities.course.course_detail_entity import CourseDetailOutput
+from app.domain.entities.practice_test.practice_test_entity import PracticeTestOutput
+from app.infrastructure.search.memory_search_engine import MemorySearchEngine
+
+SUBJECTS = ["Toán", "Tiếng Anh", "Lịch sử", "Địa lý", "Vật lý", "Hoá học", "Sinh học"]
+ONSETS = ["b", "c", "ch", "d", "đ", "g", "h", "kh", "l", "m", "n", "ng", "nh", "ph"]
+ONSETS += ["qu", "s", "t", "th", "tr", "v", "x"]
+RHYMES = ["a", "á", "ạ", "an", "ăn", "âm", "em", "ên", "i", "ình", "o", "ốc", "ông"]
+RHYMES += ["ơn", "u", "ức", "ương", "ai", "ao", "ay", "iêu", "oa", "uy", "ưa"]
+QUERIES = ["toan", "tieng anh", "lop 12", "tr", "thuong", "ngu", "zzz"]
+
+
+def make_vocabulary(rng: random.Random, size: int):
+    words = list(
+        dict.fromkeys(rng.choice(ONSETS) + rng.choice(RHYMES) for _ in range(size * 4))
+    )[:size]
+    # Tần suất từ theo phân phối Zipf như văn bản thực
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, len(words) + 1):
+        total += 1 / rank
+        cum_weights.append(total)
+    return words, cum_weights
+
+
+def make_documents(args, rng: random.Random):
+    words, cum_weights = make_vocabulary(rng, args.vocabulary)
+
+    def sentence(length: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=cum_weights, k=length))
+
+    courses = []
+    for i in range(args.courses):
+        course = CourseOutput(
+            course_id=uuid4(),
+            course_name=f"{rng.choice(SUBJECTS)} lớp {rng.randint(6, 12)} {sentence(2)}",
+            author_avatar_url="",
+            author_username=f"user{i % 500}",
+            author_role="TEACHER",
+            num_of_terms=args.terms,
+        )
+        details = [
+            CourseDetailOutput(
+                course_detail_id=uuid4(), term=sentence(2), definition=sentence(8)
+            )
+            for _ in range(args.terms)
+        ]
+        courses.append((course, details))
+
+    practice_tests = [
+        PracticeTestOutput(
+            practice_test_id=uuid4(),
+            practice_test_name=f"Đề {rng.choice(SUBJECTS)} {sentence(3)}",
+            author_avatar_url="",
+            author_username=f"user{i % 500}",
+        )
+        for i in range(args.practice_tests)
+    ]
+    return courses, practice_tests
+
+
+def build(courses, practice_tests) -> MemorySearchEngine:
+    engine = MemorySearchEngine()
+    for course, details in courses:
+        engine.index_course(course, details)
+    for practice_test in practice_tests:
+        engine.index_practice_test(practice_test)
+    return engine
+
+
+def main(args):
+    courses, practice_tests = make_documents(args, random.Random(args.seed))
+
+    started = time.perf_counter()
+    engine = build(courses, practice_tests)
+    print(f"build: {time.perf_counter() - started:.2f}s  {engine.stats()}")
+
+    # Đo riêng dưới tracemalloc (chậm hơn nhiều) chỉ phần bộ nhớ do index cấp phát
+    del engine
+    tracemalloc.start()
+    engine = build(courses, practice_tests)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory: index={current / 2**20:.1f} MiB  peak={peak / 2**20:.1f} MiB")
+
+    for query in QUERIES:
+        timings = []
+        result = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            result = engine.search_courses(query)
+            engine.search_practice_tests(query)
+            timings.append(time.perf_counter() - t)
+        timings.sort()
+        print(
+            f"{query!r:<16} p50={statistics.median(timings) * 1000:.3f}ms  "
+            f"p99={timings[int(len(timings) * 0.99) - 1] * 1000:.3f}ms  "
+            f"courses={len(result)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--terms", type=int, default=30)
+    parser.add_argument("--practice-tests", type=int, default=10_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,81 @@
+"""
+Đo index gần nghĩa của DISTRACTOR_MODE=similar với học phần n thuật ngữ (không
+cần database, cần numpy):
+
+    python benchmarks/similarity_index_benchmark.py --terms 100 1000 10000
+
+- build: dựng index lần đầu (request học / kiểm tra đầu tiên sau khi đổi học phần)
+- learn: chọn đáp án nhiễu cho cả học phần từ index đã cache
+- update: sửa định nghĩa của 1 thuật ngữ rồi cập nhật index, so với build lại
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.distractor_engine import NUM_DISTRACTORS, np
+from app.application.similarity_index import TermSimilarityIndex
+
+WORDS = (
+    "tế bào năng lượng phân tử nguyên tử ánh sáng nhiệt độ áp suất dòng điện "
+    "từ trường lực hấp dẫn gia tốc vận tốc khối lượng thể tích mật độ phản ứng "
+    "axit bazơ muối kim loại enzyme protein gen di truyền quang hợp hô hấp"
+).split()
+
+
+def make_definitions(terms: int, rng: random.Random):
+    return [" ".join(rng.choices(WORDS, k=rng.randint(4, 12))) for _ in range(terms)]
+
+
+def measure(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(args):
+    if np is None:
+        raise SystemExit("Chưa cài numpy")
+    rng = random.Random(0)
+    for terms in args.terms:
+        ids = list(range(terms))
+        texts = make_definitions(terms, rng)
+
+        def build():
+            return TermSimilarityIndex.build(
+                ids, texts, args.neighbours, args.dimensions
+            )
+
+        index = build()
+        changed = list(texts)
+        changed[rng.randrange(terms)] = make_definitions(1, rng)[0]
+        results = {
+            "build": measure(build, args.repeat),
+            "learn": measure(
+                lambda: index.sample(range(terms), NUM_DISTRACTORS), args.repeat
+            ),
+            "update": measure(
+                lambda: index.update(ids, changed, args.dimensions), args.repeat
+            ),
+        }
+        print(
+            f"terms={terms:<6} "
+            + "  ".join(f"{name}={elapsed:9.2f}ms" for name, elapsed in results.items())
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--neighbours", type=int, default=10)
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
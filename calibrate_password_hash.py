@@ -0,0 +1,108 @@
+"""
+Chọn tham số cost cho việc băm mật khẩu theo thời gian verify mong muốn
+trên chính máy chạy server:
+
+    python calibrate_password_hash.py --target-ms 250
+    python calibrate_password_hash.py --schemes argon2 --target-ms 300 --argon2-memory-mib 64
+
+Với mỗi scheme, script tăng dần cost, đo trung vị thời gian verify và chọn cost
+cao nhất không vượt quá --target-ms, rồi in các biến môi trường cần đặt.
+Thông lượng mỗi core xấp xỉ 1000 / thời gian verify (ms) lần đăng nhập mỗi giây.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.infrastructure.config.password_hasher import (
+    SUPPORTED_SCHEMES,
+    build_password_context,
+)
+
+PASSWORD = "mat-khau-hieu-chinh"
+
+
+def measure_ms(scheme: str, costs: dict, repeat: int) -> float:
+    context = build_password_context([scheme], {scheme: costs})
+    hashed = context.hash(PASSWORD)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def candidates(scheme: str, args):
+    # (biến môi trường, tham số passlib) theo thứ tự cost tăng dần
+    if scheme == "bcrypt":
+        for rounds in range(8, 17):
+            yield {"BCRYPT_ROUNDS": rounds}, {"rounds": rounds}
+    elif scheme == "scrypt":
+        for rounds in range(12, 21):
+            yield {"SCRYPT_ROUNDS": rounds, "SCRYPT_BLOCK_SIZE": 8}, {
+                "rounds": rounds,
+                "block_size": 8,
+                "parallelism": 1,
+            }
+    elif scheme == "argon2":
+        memory_cost = args.argon2_memory_mib * 1024
+        for time_cost in range(1, 11):
+            yield {
+                "ARGON2_TIME_COST": time_cost,
+                "ARGON2_MEMORY_COST": memory_cost,
+                "ARGON2_PARALLELISM": args.argon2_parallelism,
+            }, {
+                "rounds": time_cost,
+                "memory_cost": memory_cost,
+                "parallelism": args.argon2_parallelism,
+            }
+
+
+def calibrate(scheme: str, args):
+    print(f"[{scheme}]")
+    chosen = None
+    for env, costs in candidates(scheme, args):
+        elapsed = measure_ms(scheme, costs, args.repeat)
+        label = " ".join(f"{key}={value}" for key, value in env.items())
+        print(f"  {label:<60} {elapsed:8.1f}ms  ~{1000 / elapsed:6.1f} login/s/core")
+        if elapsed > args.target_ms:
+            break
+        chosen = env
+    if chosen is None:
+        print("  Cost thấp nhất đã vượt --target-ms")
+        return None
+    return chosen
+
+
+def main(args):
+    results = {}
+    for scheme in args.schemes:
+        try:
+            results[scheme] = calibrate(scheme, args)
+        except RuntimeError as e:
+            print(f"  Bỏ qua {scheme}: {e}")
+
+    schemes = [scheme for scheme, env in results.items() if env]
+    if not schemes:
+        return
+    print("\nĐề xuất (đặt vào .env, scheme đầu dùng cho hash mới):")
+    print(f"PASSWORD_HASH_SCHEMES={','.join(schemes)}")
+    for scheme in schemes:
+        for key, value in results[scheme].items():
+            print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--schemes",
+        nargs="+",
+        choices=SUPPORTED_SCHEMES,
+        default=["bcrypt", "scrypt"],
+    )
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--argon2-memory-mib", type=int, default=64)
+    parser.add_argument("--argon2-parallelism", type=int, default=4)
+    main(parser.parse_args())
@@ -0,0 +1,25 @@
+-- Tìm kiếm học phần / bài kiểm tra không phân biệt dấu bằng pg_trgm + unaccent.
+-- Chạy một lần: psql "$DATABASE_URL" -f migrations/001_search_indexes.sql
+-- (CREATE INDEX CONCURRENTLY không chạy được trong transaction, không bọc BEGIN/COMMIT)
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- unaccent() chỉ là STABLE nên không dùng được trong index;
+-- cố định dictionary để có thể khai báo IMMUTABLE
+CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+    RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$;
+
+-- Biểu thức phải trùng với normalize() trong app/infrastructure/search/postgres_search_engine.py
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_courses_course_name_trgm
+    ON courses USING gin (lower(immutable_unaccent(course_name)) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_practice_tests_practice_test_name_trgm
+    ON practice_tests USING gin (lower(immutable_unaccent(practice_test_name)) gin_trgm_ops);
+
+ANALYZE courses;
+ANALYZE practice_tests;
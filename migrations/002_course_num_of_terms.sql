@@ -0,0 +1,19 @@
+-- Lưu sẵn số thuật ngữ của học phần thay vì GROUP BY course_details mỗi lần liệt kê.
+-- Chạy một lần: psql "$DATABASE_URL" -f migrations/002_course_num_of_terms.sql
+
+-- Postgres không tự tạo index cho khoá ngoại
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_course_details_course_id
+    ON course_details (course_id);
+
+ALTER TABLE courses ADD COLUMN IF NOT EXISTS num_of_terms integer NOT NULL DEFAULT 0;
+
+-- Backfill (sau đó job đối soát định kỳ giữ cho giá trị đúng)
+UPDATE courses AS c
+SET num_of_terms = d.num_of_terms
+FROM (
+    SELECT course_id, count(*) AS num_of_terms
+    FROM course_details
+    GROUP BY course_id
+) AS d
+WHERE d.course_id = c.course_id
+  AND c.num_of_terms <> d.num_of_terms;
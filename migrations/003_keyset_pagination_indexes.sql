@@ -0,0 +1,12 @@
+-- Index cho phân trang keyset của các danh sách theo người dùng.
+-- Id là UUIDv7 nên (user_id, id) vừa lọc vừa sắp xếp "mới nhất trước" không cần sort.
+-- Chạy một lần: psql "$DATABASE_URL" -f migrations/003_keyset_pagination_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_courses_user_id_course_id
+    ON courses (user_id, course_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_practice_tests_user_id_practice_test_id
+    ON practice_tests (user_id, practice_test_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_practice_test_results_user_id_result_id
+    ON practice_test_results (user_id, result_id);
@@ -0,0 +1,9 @@
+-- Index cho việc xoá refresh token hết hạn theo lô (expires_at)
+-- và thu hồi toàn bộ token của một người dùng (user_id).
+-- Chạy một lần: psql "$DATABASE_URL" -f migrations/004_refresh_token_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_refresh_tokens_expires_at
+    ON refresh_tokens (expires_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_refresh_tokens_user_id
+    ON refresh_tokens (user_id);
@@ -0,0 +1,12 @@
+-- Họ refresh token cho xoay vòng token và phát hiện token bị dùng lại.
+-- Token cũ mỗi token một họ riêng (family_id = jti).
+-- Chạy một lần: psql "$DATABASE_URL" -f migrations/005_refresh_token_families.sql
+
+ALTER TABLE refresh_tokens ADD COLUMN IF NOT EXISTS family_id uuid;
+
+UPDATE refresh_tokens SET family_id = jti WHERE family_id IS NULL;
+
+ALTER TABLE refresh_tokens ALTER COLUMN family_id SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_refresh_tokens_family_id
+    ON refresh_tokens (family_id);
@@ -0,0 +1,7 @@
+-- ETag của chi tiết học phần dựng từ updated_at; học phần tạo trước khi có cột
+-- có thể còn NULL.
+-- Chạy một lần: psql "$DATABASE_URL" -f migrations/006_course_updated_at.sql
+
+UPDATE courses
+SET updated_at = COALESCE(created_at, now())
+WHERE updated_at IS NULL;